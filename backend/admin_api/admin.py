@@ -10,8 +10,8 @@ class ModerationLogAdmin(admin.ModelAdmin):
 
 @admin.register(AdminNotification)
 class AdminNotificationAdmin(admin.ModelAdmin):
-    list_display = ['title', 'type', 'created_at', 'is_read']
-    list_filter = ['type', 'is_read', 'created_at']
+    list_display = ['title', 'type', 'count', 'created_at']
+    list_filter = ['type', 'created_at']
     search_fields = ['title', 'message']
     date_hierarchy = 'created_at'
 
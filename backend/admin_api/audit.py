@@ -0,0 +1,84 @@
+import logging
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from admin_api.models import ModerationLog
+
+logger = logging.getLogger(__name__)
+
+
+class AuditSink:
+    """
+    Collects one admin's moderation events and writes them as ModerationLog
+    rows with a single bulk_create.
+
+    Use it as a context manager around a request's or a transaction's
+    moderation work. Entries are written when the block exits cleanly, after
+    the surrounding transaction commits, so a rolled-back change leaves no
+    log. MODERATION_AUDIT_MODE picks where they are written: ``sync`` inline,
+    ``async`` by write_moderation_logs_task (inline again if it can't be
+    queued).
+    """
+
+    def __init__(self, admin, mode=None):
+        self.admin = admin
+        self.mode = mode or settings.MODERATION_AUDIT_MODE
+        self._entries = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.flush()
+        else:
+            self._entries.clear()
+
+    def log(self, action, obj, notes=''):
+        self.log_many(action, type(obj), [(obj.pk, notes)])
+
+    def log_many(self, action, model, entries):
+        """Records ``action`` on each ``(object_id, notes)`` of ``model``."""
+        # get_for_model is cached per process after the first lookup.
+        content_type_id = ContentType.objects.get_for_model(model).id
+        timestamp = timezone.now()
+        self._entries.extend(
+            {
+                'admin_id': self.admin.pk,
+                'action': action,
+                'content_type_id': content_type_id,
+                'object_id': object_id,
+                'notes': notes,
+                'timestamp': timestamp,
+            }
+            for object_id, notes in entries
+        )
+
+    def flush(self):
+        entries, self._entries = self._entries, []
+        if entries:
+            transaction.on_commit(lambda: self._write(entries))
+
+    def _write(self, entries):
+        if self.mode == 'async':
+            from admin_api.tasks import write_moderation_logs_task
+
+            try:
+                write_moderation_logs_task.delay(
+                    [{**entry, 'timestamp': entry['timestamp'].isoformat()} for entry in entries]
+                )
+                return
+            except Exception:
+                logger.warning("Could not queue %s moderation log entries, writing them inline", len(entries), exc_info=True)
+        write_moderation_logs(entries)
+
+
+def write_moderation_logs(entries):
+    for entry in entries:
+        if isinstance(entry['timestamp'], str):
+            entry['timestamp'] = parse_datetime(entry['timestamp'])
+    ModerationLog.objects.bulk_create([ModerationLog(**entry) for entry in entries], batch_size=1000)
@@ -0,0 +1,64 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from admin_api.models import SystemSettings
+
+VERSION_KEY = 'admin:system-settings:version'
+
+
+class SystemSettingsCache:
+    """
+    Process-local copy of the SystemSettings singleton for hot paths.
+
+    For SYSTEM_SETTINGS_CACHE_TTL seconds a process answers from memory. After
+    that it compares its copy's version with the shared version key (one cache
+    read) and only reloads the row when a save has bumped it (see
+    admin_api.signals), so a change reaches every worker within the TTL. The
+    returned instance is shared: treat it as read-only.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._instance = None
+        self._version = None
+        self._checked_at = 0.0
+
+    def version(self):
+        version = cache.get(VERSION_KEY)
+        if version is None:
+            cache.add(VERSION_KEY, int(time.time()), timeout=None)
+            version = cache.get(VERSION_KEY)
+        return version
+
+    def bump(self):
+        try:
+            cache.incr(VERSION_KEY)
+        except ValueError:
+            cache.add(VERSION_KEY, int(time.time()), timeout=None)
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._instance = None
+
+    def _fresh(self):
+        return self._instance is not None and time.monotonic() - self._checked_at < settings.SYSTEM_SETTINGS_CACHE_TTL
+
+    def get(self):
+        if self._fresh():
+            return self._instance
+        with self._lock:
+            if self._fresh():
+                return self._instance
+            version = self.version()
+            if self._instance is None or version != self._version:
+                self._instance = SystemSettings.get_settings()
+                self._version = version
+            self._checked_at = time.monotonic()
+            return self._instance
+
+
+system_settings = SystemSettingsCache()
@@ -0,0 +1,38 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from admin_api.models import AdminNotification, AdminNotificationReceipt
+from admin_api.notifications import unread_counter
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Create missing notification receipts for active admins, read if the notification was marked read'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--mark-read', action='store_true', help='Create all the receipts as already read')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        admin_ids = list(User.objects.filter(is_staff=True, is_active=True).values_list('id', flat=True))
+        created = 0
+        for admin_id in admin_ids:
+            # The legacy is_read flag was shared by all admins, so each admin inherits it.
+            missing = AdminNotification.objects.exclude(receipts__admin_id=admin_id).values_list('id', 'is_read')
+            receipts = AdminNotificationReceipt.objects.bulk_create(
+                [
+                    AdminNotificationReceipt(
+                        notification_id=notification_id, admin_id=admin_id,
+                        read_at=now if is_read or options['mark_read'] else None,
+                    )
+                    for notification_id, is_read in missing.iterator()
+                ],
+                batch_size=options['batch_size'],
+                ignore_conflicts=True,
+            )
+            created += len(receipts)
+        unread_counter.invalidate(admin_ids)
+        self.stdout.write(self.style.SUCCESS(f'Created {created} notification receipts for {len(admin_ids)} admins'))
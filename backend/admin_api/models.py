@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
@@ -17,13 +18,20 @@ class ModerationLog(models.Model):
     
     admin = models.ForeignKey(User, on_delete=models.CASCADE, related_name='moderation_logs')
     action = models.CharField(max_length=20, choices=ACTIONS)
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # Not auto_now_add: batched and asynchronous writes keep the time of the action.
+    timestamp = models.DateTimeField(default=timezone.now, editable=False)
     notes = models.TextField(blank=True)
     
     # Для связи с любой моделью (Job, Company, User, etc.)
     content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
     object_id = models.PositiveIntegerField()
     content_object = GenericForeignKey('content_type', 'object_id')
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['action', '-timestamp'], name='moderationlog_action_ts_idx'),
+            models.Index(fields=['-timestamp'], name='moderationlog_ts_idx'),
+        ]
     
     def __str__(self):
         return f"{self.admin.email} - {self.action} - {self.timestamp}"
@@ -33,6 +41,7 @@ class AdminNotification(models.Model):
     TYPE_CHOICES = [
         ('new_company', 'New Company Registration'),
         ('new_job', 'New Job Posting'),
+        ('new_application', 'New Application'),
         ('reported_content', 'Reported Content'),
         ('verification_request', 'Verification Request'),
     ]
@@ -41,16 +50,57 @@ class AdminNotification(models.Model):
     message = models.TextField()
     type = models.CharField(max_length=20, choices=TYPE_CHOICES)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Global read flag from before per-admin receipts. Only backfill_notification_receipts
+    # reads it, to carry the read state over; drop it once that has run everywhere.
     is_read = models.BooleanField(default=False)
+    # Events merged into this notification (see admin_api.notifications.notify_admins).
+    count = models.PositiveIntegerField(default=1)
+    coalesce_key = models.CharField(max_length=100, blank=True)
+    # ADMIN_NOTIFICATION_COALESCE_WINDOW-sized time slot the events were merged in.
+    coalesce_bucket = models.PositiveBigIntegerField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     # Для связи с объектом, к которому относится уведомление
     content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE, null=True, blank=True)
     object_id = models.PositiveIntegerField(null=True, blank=True)
     content_object = GenericForeignKey('content_type', 'object_id')
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at'], name='adminnotif_created_idx'),
+            models.Index(fields=['-updated_at', '-id'], name='adminnotif_updated_idx'),
+        ]
+        constraints = [
+            # The upsert target of notify_admins: one notification per key and time slot.
+            models.UniqueConstraint(
+                fields=['coalesce_key', 'coalesce_bucket'], condition=~models.Q(coalesce_key=''),
+                name='adminnotif_coalesce_uniq',
+            ),
+        ]
     
     def __str__(self):
         return self.title
 
+class AdminNotificationReceipt(models.Model):
+    """Доставка уведомления конкретному администратору и его статус прочтения."""
+    notification = models.ForeignKey(AdminNotification, on_delete=models.CASCADE, related_name='receipts')
+    admin = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notification_receipts')
+    read_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['admin', 'notification'], name='unique_admin_notification_receipt'),
+        ]
+        indexes = [
+            models.Index(
+                fields=['admin', '-notification'], condition=models.Q(read_at__isnull=True),
+                name='adminreceipt_unread_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.notification_id} -> {self.admin_id}"
+
 class AdminDashboardSetting(models.Model):
     """Настройки дашборда администратора."""
     admin = models.OneToOneField(User, on_delete=models.CASCADE, related_name='dashboard_settings')
@@ -0,0 +1,69 @@
+from collections import namedtuple
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from companies.models import Company
+from core.metrics import BULK_MODERATION_DURATION, BULK_MODERATION_OBJECTS, observe
+from users.cache import profile_cache
+from users.models import EmployerProfile
+
+User = get_user_model()
+
+# Sets ``field`` to ``value``, logged as ``log_action`` with ``note`` (formatted with the row's label).
+BulkOperation = namedtuple('BulkOperation', ['field', 'value', 'log_action', 'note'])
+
+USER_OPERATIONS = {
+    'activate': BulkOperation('is_active', True, 'restore', 'Activated user account: {label}'),
+    'deactivate': BulkOperation('is_active', False, 'suspend', 'Deactivated user account: {label}'),
+}
+JOB_OPERATIONS = {
+    'activate': BulkOperation('is_active', True, 'approve', 'Activated job: {label}'),
+    'deactivate': BulkOperation('is_active', False, 'reject', 'Deactivated job: {label}'),
+    'feature': BulkOperation('featured', True, 'edit', 'Featured job: {label}'),
+    'unfeature': BulkOperation('featured', False, 'edit', 'Unfeatured job: {label}'),
+}
+COMPANY_OPERATIONS = {
+    'verify': BulkOperation('verified', True, 'approve', 'Verified company: {label}'),
+    'unverify': BulkOperation('verified', False, 'reject', 'Unverified company: {label}'),
+    'feature': BulkOperation('featured', True, 'edit', 'Featured company: {label}'),
+    'unfeature': BulkOperation('featured', False, 'edit', 'Unfeatured company: {label}'),
+}
+
+
+def apply_bulk_operation(audit, queryset, operation, label_field):
+    """
+    Applies ``operation`` to every row of ``queryset`` that doesn't already
+    have the value, with one UPDATE, and logs each changed row through
+    ``audit`` (an admin_api.audit.AuditSink), then bumps the cached profiles
+    showing those rows. Returns the number of rows changed.
+    """
+    labels = {'model': queryset.model._meta.model_name, 'field': operation.field}
+    with observe(BULK_MODERATION_DURATION, **labels), transaction.atomic():
+        changed = list(
+            queryset.exclude(**{operation.field: operation.value})
+            .select_for_update()
+            .values_list('pk', label_field)
+        )
+        if changed:
+            queryset.model.objects.filter(pk__in=[pk for pk, _ in changed]).update(**{operation.field: operation.value})
+            audit.log_many(
+                operation.log_action,
+                queryset.model,
+                [(pk, operation.note.format(label=label)) for pk, label in changed],
+            )
+            # update() skips the post_save receivers that bump cached profiles (users.signals).
+            user_ids = _profile_user_ids(queryset.model, [pk for pk, _ in changed])
+            if user_ids:
+                transaction.on_commit(lambda: profile_cache.bump_many(user_ids))
+    BULK_MODERATION_OBJECTS.labels(**labels).inc(len(changed))
+    return len(changed)
+
+
+def _profile_user_ids(model, pks):
+    """Users whose cached profiles show rows of ``model``: the users themselves, or a company's employers."""
+    if model is User:
+        return pks
+    if model is Company:
+        return list(EmployerProfile.objects.filter(company_id__in=pks).values_list('user_id', flat=True))
+    return []
@@ -0,0 +1,151 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import CharField, F, Value
+from django.db.models.functions import Cast, Concat
+from django.utils import timezone
+
+from admin_api.models import AdminNotification, AdminNotificationReceipt
+
+User = get_user_model()
+
+# Lets a counter that missed an update (a crashed request, a purge) heal itself.
+UNREAD_COUNT_TIMEOUT = 300
+
+
+class UnreadNotificationCounter:
+    """
+    Per-admin unread notification counts kept in the shared cache. Writes
+    adjust the cached numbers; a missing number is recounted from the unread
+    receipts, which the partial index on receipts keeps cheap.
+    """
+
+    def _key(self, admin_id):
+        return f'admin:notifications:unread:{admin_id}'
+
+    def get(self, admin_id):
+        count = cache.get(self._key(admin_id))
+        if count is None:
+            count = AdminNotificationReceipt.objects.filter(admin_id=admin_id, read_at__isnull=True).count()
+            cache.add(self._key(admin_id), count, UNREAD_COUNT_TIMEOUT)
+        return count
+
+    def incr(self, admin_ids, delta=1):
+        for admin_id in admin_ids:
+            try:
+                cache.incr(self._key(admin_id), delta)
+            except ValueError:
+                pass  # Not cached; the next read counts.
+
+    def decr(self, admin_id, delta=1):
+        self.incr([admin_id], -delta)
+
+    def set(self, admin_id, count):
+        cache.set(self._key(admin_id), count, UNREAD_COUNT_TIMEOUT)
+
+    def invalidate(self, admin_ids):
+        cache.delete_many([self._key(admin_id) for admin_id in admin_ids])
+
+
+unread_counter = UnreadNotificationCounter()
+
+
+def notify_admins(type, title, message, obj=None, coalesce_key='', summary=None, content_type=None, object_id=None):
+    """
+    Creates an AdminNotification with an unread receipt for every active
+    admin (fan-out on write), so listing and counting are per-admin index
+    lookups.
+
+    With ``coalesce_key``, events in the same ADMIN_NOTIFICATION_COALESCE_WINDOW
+    time slot are merged into one notification by an upsert on (key, slot):
+    its count goes up, the title becomes ``summary`` with ``{count}`` filled
+    in, the message and object become the latest event's, it moves to the
+    top of the inbox and it is unread again for admins who had read it. A
+    burst of events stays one notification. The merge is a single UPDATE, so
+    concurrent events only contend for the row while it runs; call this
+    outside long transactions.
+    """
+    if obj is not None:
+        content_type, object_id = ContentType.objects.get_for_model(obj), obj.pk
+    fields = {'type': type, 'title': title, 'message': message, 'content_type': content_type, 'object_id': object_id}
+    if not coalesce_key:
+        return _create_notification(**fields)
+
+    bucket = int(timezone.now().timestamp()) // settings.ADMIN_NOTIFICATION_COALESCE_WINDOW
+    for _ in range(2):
+        notification = _merge_notification(coalesce_key, bucket, summary, **fields)
+        if notification is not None:
+            return notification
+        try:
+            # A savepoint, so losing the race to insert doesn't break the caller's transaction.
+            with transaction.atomic():
+                return _create_notification(coalesce_key=coalesce_key, coalesce_bucket=bucket, **fields)
+        except IntegrityError:
+            continue  # Another event created it first; merge into that one.
+    raise RuntimeError(f"Could not coalesce admin notification {coalesce_key!r}")
+
+
+def _create_notification(**fields):
+    with transaction.atomic():
+        notification = AdminNotification.objects.create(**fields)
+        admin_ids = list(User.objects.filter(is_staff=True, is_active=True).values_list('id', flat=True))
+        AdminNotificationReceipt.objects.bulk_create(
+            [AdminNotificationReceipt(notification=notification, admin_id=admin_id) for admin_id in admin_ids]
+        )
+    transaction.on_commit(lambda: unread_counter.incr(admin_ids))
+    return notification
+
+
+def _merge_notification(coalesce_key, bucket, summary, type, title, message, content_type, object_id):
+    """Merges an event into the slot's notification; returns it, or None if the slot has none yet."""
+    if summary and '{count}' in summary:
+        before, after = summary.split('{count}', 1)
+        title = Concat(Value(before), Cast(F('count') + 1, CharField()), Value(after), output_field=CharField())
+    elif summary:
+        title = summary
+    slot = AdminNotification.objects.filter(coalesce_key=coalesce_key, coalesce_bucket=bucket)
+    if not slot.update(
+        count=F('count') + 1, title=title, message=message, content_type=content_type, object_id=object_id,
+        updated_at=timezone.now(),
+    ):
+        return None
+
+    reopened = AdminNotificationReceipt.objects.filter(
+        notification__coalesce_key=coalesce_key, notification__coalesce_bucket=bucket, read_at__isnull=False
+    )
+    admin_ids = list(reopened.values_list('admin_id', flat=True))
+    if admin_ids:
+        reopened.filter(admin_id__in=admin_ids).update(read_at=None)
+        transaction.on_commit(lambda: unread_counter.incr(admin_ids))
+    return slot.first()
+
+
+def purge_notifications(older_than_days=None, batch_size=1000):
+    """
+    Deletes notifications created more than ``older_than_days`` (default
+    ADMIN_NOTIFICATION_RETENTION_DAYS) ago, with their receipts, in batches.
+    Returns the number of notifications deleted.
+    """
+    days = settings.ADMIN_NOTIFICATION_RETENTION_DAYS if older_than_days is None else older_than_days
+    cutoff = timezone.now() - timedelta(days=days)
+    deleted = 0
+    while True:
+        ids = list(
+            AdminNotification.objects.filter(created_at__lt=cutoff).values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            break
+        with transaction.atomic():
+            affected_admins = set(
+                AdminNotificationReceipt.objects.filter(notification_id__in=ids, read_at__isnull=True)
+                .values_list('admin_id', flat=True)
+            )
+            AdminNotificationReceipt.objects.filter(notification_id__in=ids).delete()
+            AdminNotification.objects.filter(id__in=ids).delete()
+        unread_counter.invalidate(affected_admins)
+        deleted += len(ids)
+    return deleted
@@ -18,10 +18,17 @@ class ModerationLogSerializer(serializers.ModelSerializer):
         read_only_fields = ['admin_email', 'content_type_name']
 
 class AdminNotificationSerializer(serializers.ModelSerializer):
+    is_read = serializers.SerializerMethodField()
+
     class Meta:
         model = AdminNotification
-        fields = ['id', 'title', 'message', 'type', 'created_at', 'is_read',
+        fields = ['id', 'title', 'message', 'type', 'count', 'created_at', 'updated_at', 'is_read',
                  'content_type', 'object_id']
+        read_only_fields = ['count', 'created_at', 'updated_at']
+
+    def get_is_read(self, obj):
+        # The requesting admin's receipt, annotated by AdminNotificationViewSet.
+        return getattr(obj, 'read_at', None) is not None
 
 class AdminDashboardSettingSerializer(serializers.ModelSerializer):
     class Meta:
@@ -82,6 +89,20 @@ class SystemSettingsSerializer(serializers.ModelSerializer):
         fields = '__all__'
         read_only_fields = ['id', 'created_at', 'updated_at']
 
+class BulkActionSerializer(serializers.Serializer):
+    """Body of a viewset's bulk-moderate action; the operations come from the context."""
+    action = serializers.CharField()
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), min_length=1, max_length=10000, required=False
+    )
+
+    def validate_action(self, value):
+        operations = self.context['operations']
+        if value not in operations:
+            raise serializers.ValidationError(f"Must be one of: {', '.join(operations)}.")
+        return value
+
+
 class BulkUserFileUploadSerializer(serializers.Serializer):
     """
     Serializer for file upload in bulk user registration.
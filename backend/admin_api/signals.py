@@ -0,0 +1,11 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from admin_api.cache import system_settings
+from admin_api.models import SystemSettings
+
+
+@receiver([post_save, post_delete], sender=SystemSettings)
+def invalidate_system_settings(sender, **kwargs):
+    transaction.on_commit(system_settings.bump)
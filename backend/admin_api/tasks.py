@@ -0,0 +1,17 @@
+from celery import shared_task
+
+from admin_api.audit import write_moderation_logs
+from admin_api.notifications import purge_notifications
+
+
+# Not acks_late: a redelivered batch would be written twice.
+@shared_task(name='write_moderation_logs_task', ignore_result=True)
+def write_moderation_logs_task(entries):
+    """Writes moderation log entries buffered by admin_api.audit.AuditSink."""
+    write_moderation_logs(entries)
+
+
+@shared_task(name='purge_admin_notifications_task', ignore_result=True)
+def purge_admin_notifications_task():
+    """Deletes admin notifications older than ADMIN_NOTIFICATION_RETENTION_DAYS."""
+    purge_notifications()
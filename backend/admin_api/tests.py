@@ -1,3 +1,132 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
 from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from admin_api import notifications
+from admin_api.models import AdminNotification, AdminNotificationReceipt
+from admin_api.notifications import notify_admins, unread_counter
+from companies.models import Company
+from users.cache import profile_cache
+from users.models import EmployerProfile
+
+User = get_user_model()
+
+
+def notify_application(job_title):
+    return notify_admins(
+        'new_application', f'New Application for {job_title}', f'Someone applied to {job_title}',
+        coalesce_key='new_application', summary='{count} new applications',
+    )
+
+
+class AdminNotificationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_user('admin@example.com', 'x', name='Admin', role='admin')
+        self.other_admin = User.objects.create_user('other@example.com', 'x', name='Other', role='admin')
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def _notify(self, *args, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            return notify_admins(*args, **kwargs)
+
+    def _post(self, name, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(reverse(f'admin-notifications-{name}', kwargs=kwargs))
+
+    def _unread(self):
+        return self.client.get(reverse('admin-notifications-unread-count')).json()['data']['unread']
+
+    def test_events_in_one_window_coalesce(self):
+        first = notify_application('Analyst')
+        AdminNotificationReceipt.objects.filter(admin=self.admin).update(read_at='2026-01-01T00:00Z')
+        second = notify_application('Engineer')
+
+        self.assertEqual(second.id, first.id)
+        self.assertEqual((second.count, second.title, second.message), (2, '2 new applications', 'Someone applied to Engineer'))
+        self.assertEqual(AdminNotification.objects.count(), 1)
+        # Merging reopens it for the admin who had read it.
+        self.assertFalse(AdminNotificationReceipt.objects.filter(notification=first, read_at__isnull=False).exists())
+
+    def test_coalescing_retries_after_losing_the_insert_race(self):
+        first = notify_application('Analyst')
+        merge = notifications._merge_notification
+        # The merge runs before the other event's insert is visible, then the insert conflicts.
+        lost_race = iter([None])
+        with mock.patch.object(notifications, '_merge_notification', lambda *args, **kwargs: next(lost_race, None) or merge(*args, **kwargs)):
+            second = notify_application('Engineer')
+
+        self.assertEqual(second.id, first.id)
+        self.assertEqual(second.count, 2)
+        self.assertEqual(AdminNotification.objects.count(), 1)
+
+    def test_unread_count_and_mark_as_read(self):
+        first = self._notify('new_job', 'Job posted', 'Analyst')
+        second = self._notify('new_company', 'Company registered', 'Acme')
+        self.assertEqual(self._unread(), 2)
+
+        self.assertEqual(self._post('mark-as-read', pk=first.id).status_code, 200)
+        self.assertEqual(self._unread(), 1)
+        self.assertEqual(self._post('mark-as-read', pk=first.id).status_code, 200)
+        self.assertEqual(self._unread(), 1)
+        listed = self.client.get(reverse('admin-notifications-list')).json()['data']['results']
+        self.assertEqual([(item['id'], item['is_read']) for item in listed], [(second.id, False), (first.id, True)])
+
+        self._post('mark-all-as-read')
+        self.assertEqual(self._unread(), 0)
+        self.assertEqual(unread_counter.get(self.other_admin.id), 2)
+
+    def test_mark_as_read_unknown_notification(self):
+        self.assertEqual(self._post('mark-as-read', pk=12345).status_code, 404)
+        self.assertEqual(self.client.post('/api/admin/notifications/abc/mark_as_read/').status_code, 404)
+
+    def test_backfill_keeps_legacy_read_state(self):
+        read = AdminNotification.objects.create(type='new_job', title='Read', message='', is_read=True)
+        unread = AdminNotification.objects.create(type='new_job', title='Unread', message='')
+
+        call_command('backfill_notification_receipts', stdout=mock.Mock())
+
+        receipts = AdminNotificationReceipt.objects.filter(admin=self.admin)
+        self.assertTrue(receipts.get(notification=read).read_at)
+        self.assertIsNone(receipts.get(notification=unread).read_at)
+        self.assertEqual(AdminNotificationReceipt.objects.filter(admin=self.other_admin).count(), 2)
+        self.assertEqual(self._unread(), 1)
+
+
+class BulkModerationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_user('admin@example.com', 'x', name='Admin', role='admin')
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def _bulk_moderate(self, target, data):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(reverse(f'admin-{target}-bulk-moderate'), data, format='json')
+
+    def test_deactivating_users_invalidates_their_profiles(self):
+        student = User.objects.create_user('student@example.com', 'x', name='Student')
+        version = profile_cache.version(student.id)
+
+        response = self._bulk_moderate('users', {'action': 'deactivate', 'ids': [student.id]})
+
+        self.assertEqual(response.json()['data']['updated'], 1)
+        self.assertFalse(User.objects.get(pk=student.pk).is_active)
+        self.assertNotEqual(profile_cache.version(student.id), version)
+
+    def test_verifying_companies_invalidates_their_employers_profiles(self):
+        company = Company.objects.create(name='Acme')
+        employer = User.objects.create_user('employer@example.com', 'x', name='Employer', role='employer')
+        EmployerProfile.objects.create(user=employer, industry='Tech', company=company)
+        version = profile_cache.version(employer.id)
+
+        response = self._bulk_moderate('companies', {'action': 'verify', 'ids': [company.id]})
 
-# Create your tests here.
+        self.assertEqual(response.json()['data']['updated'], 1)
+        self.assertNotEqual(profile_cache.version(employer.id), version)
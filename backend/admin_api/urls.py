@@ -4,7 +4,7 @@ from admin_api.views import (
     AdminUserViewSet, AdminJobViewSet, AdminCompanyViewSet, 
     AdminApplicationViewSet, ModerationLogViewSet, AdminNotificationViewSet,
     AdminDashboardStatsView, AdminDashboardSettingViewSet, AdminAnalyticsView,
-    SystemSettingsView
+    SystemSettingsView, TaskMetricsView
 )
 
 router = DefaultRouter()
@@ -21,4 +21,5 @@ urlpatterns = [
     path('dashboard/stats/', AdminDashboardStatsView.as_view(), name='admin-dashboard-stats'),
     path('analytics/', AdminAnalyticsView.as_view(), name='admin-analytics'),
     path('settings/', SystemSettingsView.as_view(), name='system-settings'),
+    path('metrics/tasks/', TaskMetricsView.as_view(), name='admin-task-metrics'),
 ] 
\ No newline at end of file
@@ -1,32 +1,45 @@
+import asyncio
+import logging
+
+from adrf.views import APIView as AsyncAPIView
 from django.shortcuts import render
 from rest_framework import viewsets, permissions, status, filters
 from rest_framework.decorators import action, permission_classes as drf_permission_classes
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from datetime import timedelta
-from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiTypes
-from admin_api.models import ModerationLog, AdminNotification, AdminDashboardSetting
+from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter, OpenApiTypes
+from admin_api.audit import AuditSink
+from admin_api.models import ModerationLog, AdminNotification, AdminNotificationReceipt, AdminDashboardSetting
+from admin_api.notifications import notify_admins, unread_counter
+from admin_api.moderation import (
+    COMPANY_OPERATIONS, JOB_OPERATIONS, USER_OPERATIONS, apply_bulk_operation
+)
 from admin_api.serializers import (
     ModerationLogSerializer, AdminNotificationSerializer, AdminDashboardSettingSerializer,
     UserAdminSerializer, JobAdminSerializer, CompanyAdminSerializer, 
-    ApplicationAdminSerializer, AdminDashboardStatsSerializer, BulkUserFileUploadSerializer
+    ApplicationAdminSerializer, AdminDashboardStatsSerializer, BulkUserFileUploadSerializer,
+    BulkActionSerializer
 )
 from jobs.models import Job
 from companies.models import Company 
 from applications.models import Application
-from django.db.models import Count, Q
-from django.contrib.contenttypes.models import ContentType
+from django.db.models import Count, F, FilteredRelation, Q
+from admin_api.cache import system_settings
 from admin_api.models import SystemSettings
 from admin_api.serializers import SystemSettingsSerializer
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
-import pandas as pd
-import numpy as np
 from users.models import StudentProfile, EmployerProfile, CampusProfile
+from core.task_metrics import queue_depths, task_metrics
 
 User = get_user_model()
+logger = logging.getLogger(__name__)
 
 class IsAdminUser(permissions.BasePermission):
     def has_permission(self, request, view):
@@ -40,8 +53,80 @@ class CanBulkRegisterUsers(permissions.BasePermission):
             return False
         return request.user.is_staff or request.user.role == 'campus'
 
+# Paging parameters of the admin lists (the user and company lists read ``limit`` themselves).
+BULK_LIST_ONLY_PARAMS = {'page', 'page_size', 'limit', 'offset', 'cursor'}
+
+
+class BulkModerationMixin:
+    """
+    ``POST <list>/bulk-moderate/`` applies one of ``bulk_operations`` (see
+    admin_api.moderation) to the objects listed in ``ids`` or, without ids,
+    to every object the list endpoint would return for the same filter and
+    search query parameters. One UPDATE for the rows that change, one batched
+    log write, and the affected count in the response.
+    """
+    bulk_operations = {}
+    bulk_label_field = 'pk'
+
+    def get_bulk_queryset(self):
+        return self.filter_queryset(self.get_queryset())
+
+    @extend_schema(
+        summary="Bulk moderation",
+        description=(
+            "Applies `action` to the objects in `ids`, or to every object matching the "
+            "list's filter/search query parameters when `ids` is omitted."
+        ),
+        request=BulkActionSerializer,
+        responses={200: OpenApiTypes.OBJECT, 400: OpenApiTypes.OBJECT},
+    )
+    @action(detail=False, methods=['post'], url_path='bulk-moderate', permission_classes=[IsAdminUser])
+    def bulk_moderate(self, request):
+        serializer = BulkActionSerializer(data=request.data, context={'operations': self.bulk_operations})
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data.get('ids')
+
+        # Only recognised filters: a mistyped one would silently match every row.
+        filter_params = self.bulk_filter_params()
+        unknown_params = set(request.query_params) - filter_params - self.bulk_ignored_params()
+        if unknown_params:
+            return Response({
+                'status': 'error',
+                'message': f"Unknown filter parameters: {', '.join(sorted(unknown_params))}"
+            }, status=status.HTTP_400_BAD_REQUEST)
+        if not ids and not any(request.query_params.get(param) for param in filter_params):
+            return Response({
+                'status': 'error',
+                'message': 'Provide ids or at least one filter parameter'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = self.get_bulk_queryset()
+        if ids:
+            queryset = queryset.filter(pk__in=ids)
+        operation = self.bulk_operations[serializer.validated_data['action']]
+        with AuditSink(request.user) as audit:
+            updated = apply_bulk_operation(audit, queryset, operation, self.bulk_label_field)
+        return Response({'status': 'success', 'action': serializer.validated_data['action'], 'updated': updated})
+
+    def bulk_filter_params(self):
+        """Query parameters that narrow the list: the filterset fields and search."""
+        fields = getattr(self, 'filterset_fields', None) or []
+        if isinstance(fields, dict):
+            params = {
+                field if lookup == 'exact' else f'{field}__{lookup}'
+                for field, lookups in fields.items() for lookup in lookups
+            }
+        else:
+            params = set(fields)
+        return params | {api_settings.SEARCH_PARAM}
+
+    def bulk_ignored_params(self):
+        """Ordering and paging parameters the list accepts; they don't change which rows match."""
+        return BULK_LIST_ONLY_PARAMS | {api_settings.ORDERING_PARAM}
+
+
 @extend_schema(tags=['admin'])
-class AdminUserViewSet(viewsets.ModelViewSet):
+class AdminUserViewSet(BulkModerationMixin, viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserAdminSerializer
     permission_classes = []
@@ -49,6 +134,13 @@ class AdminUserViewSet(viewsets.ModelViewSet):
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
     filterset_fields = ['role', 'is_active']
     search_fields = ['email', 'name']
+    throttle_scopes = {'bulk': 'bulk', 'bulk_moderate': 'bulk', 'stats': 'analytics'}
+    bulk_operations = USER_OPERATIONS
+    bulk_label_field = 'email'
+
+    def get_bulk_queryset(self):
+        # An admin can't lock themselves out.
+        return super().get_bulk_queryset().exclude(pk=self.request.user.pk)
     
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
@@ -135,14 +227,8 @@ class AdminUserViewSet(viewsets.ModelViewSet):
             if send_welcome_email:
                 pass
             
-            content_type = ContentType.objects.get_for_model(User)
-            ModerationLog.objects.create(
-                admin=request.user,
-                action='create',
-                content_type=content_type,
-                object_id=user.id,
-                notes=f"Created new {role} account: {email}"
-            )
+            with AuditSink(request.user) as audit:
+                audit.log('create', user, notes=f"Created new {role} account: {email}")
             
             return Response({
                 'status': 'success',
@@ -167,6 +253,11 @@ class AdminUserViewSet(viewsets.ModelViewSet):
     )
     @action(detail=False, methods=['post'], permission_classes=[CanBulkRegisterUsers], parser_classes=[MultiPartParser])
     def bulk(self, request):
+        # pandas/numpy (and openpyxl through pandas) cost ~50 MB and several hundred
+        # ms to import, so only this action loads them.
+        import numpy as np
+        import pandas as pd
+
         file_obj = request.FILES.get('file')
 
         if not file_obj:
@@ -279,13 +370,11 @@ class AdminUserViewSet(viewsets.ModelViewSet):
             }, status=status.HTTP_400_BAD_REQUEST)
 
         try:
-            ModerationLog.objects.create(
-                admin=request.user,
-                action='bulk_user_upload',
-                content_type=ContentType.objects.get_for_model(User),
-                object_id=request.user.id,
-                notes=f"Bulk user upload: {results['success_count']} succeeded, {results['failed_count']} failed. File: {file_obj.name}"
-            )
+            with AuditSink(request.user) as audit:
+                audit.log(
+                    'bulk_user_upload', request.user,
+                    notes=f"Bulk user upload: {results['success_count']} succeeded, {results['failed_count']} failed. File: {file_obj.name}"
+                )
         except Exception:
             pass 
 
@@ -304,15 +393,9 @@ class AdminUserViewSet(viewsets.ModelViewSet):
         user.is_active = not user.is_active
         user.save()
         
-        content_type = ContentType.objects.get_for_model(User)
         action = 'restore' if user.is_active else 'suspend'
-        ModerationLog.objects.create(
-            admin=request.user,
-            action=action,
-            content_type=content_type,
-            object_id=user.id,
-            notes=f"{'Activated' if user.is_active else 'Deactivated'} user account: {user.email}"
-        )
+        with AuditSink(request.user) as audit:
+            audit.log(action, user, notes=f"{'Activated' if user.is_active else 'Deactivated'} user account: {user.email}")
         
         return Response({'status': 'success', 'is_active': user.is_active})
     
@@ -339,7 +422,7 @@ class AdminUserViewSet(viewsets.ModelViewSet):
         })
 
 @extend_schema(tags=['admin'])
-class AdminJobViewSet(viewsets.ModelViewSet):
+class AdminJobViewSet(BulkModerationMixin, viewsets.ModelViewSet):
     queryset = Job.objects.all()
     serializer_class = JobAdminSerializer
     permission_classes = [IsAdminUser]
@@ -347,6 +430,9 @@ class AdminJobViewSet(viewsets.ModelViewSet):
     filterset_fields = ['is_active', 'type', 'industry', 'status']
     search_fields = ['title', 'company', 'description']
     ordering_fields = ['posted_date', 'view_count', 'application_count', 'title']
+    throttle_scopes = {'bulk_moderate': 'bulk'}
+    bulk_operations = JOB_OPERATIONS
+    bulk_label_field = 'title'
     
     @action(detail=True, methods=['post'])
     def toggle_active(self, request, pk=None):
@@ -354,15 +440,9 @@ class AdminJobViewSet(viewsets.ModelViewSet):
         job.is_active = not job.is_active
         job.save()
         
-        content_type = ContentType.objects.get_for_model(Job)
         action = 'approve' if job.is_active else 'reject'
-        ModerationLog.objects.create(
-            admin=request.user,
-            action=action,
-            content_type=content_type,
-            object_id=job.id,
-            notes=f"{'Activated' if job.is_active else 'Deactivated'} job: {job.title}"
-        )
+        with AuditSink(request.user) as audit:
+            audit.log(action, job, notes=f"{'Activated' if job.is_active else 'Deactivated'} job: {job.title}")
         
         return Response({'status': 'success', 'is_active': job.is_active})
     
@@ -375,13 +455,16 @@ class AdminJobViewSet(viewsets.ModelViewSet):
         return Response({'status': 'success', 'featured': job.featured})
 
 @extend_schema(tags=['admin'])
-class AdminCompanyViewSet(viewsets.ModelViewSet):
+class AdminCompanyViewSet(BulkModerationMixin, viewsets.ModelViewSet):
     queryset = Company.objects.all()
     serializer_class = CompanyAdminSerializer
     permission_classes = []
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
     filterset_fields = ['verified', 'featured', 'industry']
     search_fields = ['name', 'description', 'location']
+    throttle_scopes = {'bulk_moderate': 'bulk'}
+    bulk_operations = COMPANY_OPERATIONS
+    bulk_label_field = 'name'
     
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
@@ -426,15 +509,9 @@ class AdminCompanyViewSet(viewsets.ModelViewSet):
         company.verified = not company.verified
         company.save()
         
-        content_type = ContentType.objects.get_for_model(Company)
         action = 'approve' if company.verified else 'reject'
-        ModerationLog.objects.create(
-            admin=request.user,
-            action=action,
-            content_type=content_type,
-            object_id=company.id,
-            notes=f"{'Verified' if company.verified else 'Unverified'} company: {company.name}"
-        )
+        with AuditSink(request.user) as audit:
+            audit.log(action, company, notes=f"{'Verified' if company.verified else 'Unverified'} company: {company.name}")
         
         return Response({'status': 'success', 'verified': company.verified})
     
@@ -464,48 +541,107 @@ class ModerationLogViewSet(viewsets.ReadOnlyModelViewSet):
     filterset_fields = ['action', 'admin']
     ordering_fields = ['timestamp']
 
+class AdminNotificationPagination(CursorPagination):
+    """
+    Keyset paging: every page is an index range scan from the cursor, however
+    deep. Ordered by last activity, so a notification that merges a new event
+    moves back to the top.
+    """
+    ordering = ('-updated_at', '-id')
+    page_size = 20
+    page_size_query_param = 'limit'
+    max_page_size = 100
+
+
 @extend_schema(tags=['admin'])
+@extend_schema_view(
+    list=extend_schema(parameters=[
+        OpenApiParameter('is_read', OpenApiTypes.BOOL, description="Only read (true) or unread (false) notifications."),
+    ]),
+)
 class AdminNotificationViewSet(viewsets.ModelViewSet):
-    queryset = AdminNotification.objects.all().order_by('-created_at')
+    """
+    The requesting admin's notification inbox. Read state is per admin
+    (AdminNotificationReceipt); see admin_api.notifications.
+    """
     serializer_class = AdminNotificationSerializer
     permission_classes = [IsAdminUser]
+    lookup_value_regex = r'\d+'
+    pagination_class = AdminNotificationPagination
     filter_backends = [DjangoFilterBackend]
-    filterset_fields = ['is_read', 'type']
-    
+    filterset_fields = ['type']
+
+    def get_queryset(self):
+        queryset = AdminNotification.objects.annotate(
+            receipt=FilteredRelation('receipts', condition=Q(receipts__admin=self.request.user)),
+        ).filter(receipt__isnull=False).annotate(read_at=F('receipt__read_at'))
+        is_read = self.request.query_params.get('is_read')
+        if is_read is not None:
+            queryset = queryset.filter(receipt__read_at__isnull=is_read.lower() not in ('true', '1'))
+        return queryset
+
+    def _receipts(self):
+        return AdminNotificationReceipt.objects.filter(admin=self.request.user)
+
+    def perform_create(self, serializer):
+        serializer.instance = notify_admins(**serializer.validated_data)
+
+    def perform_destroy(self, instance):
+        unread_admins = list(instance.receipts.filter(read_at__isnull=True).values_list('admin_id', flat=True))
+        instance.delete()
+        unread_counter.invalidate(unread_admins)
+
     @action(detail=True, methods=['post'])
     def mark_as_read(self, request, pk=None):
-        notification = self.get_object()
-        notification.is_read = True
-        notification.save()
+        updated = self._receipts().filter(notification_id=pk, read_at__isnull=True).update(read_at=timezone.now())
+        if updated:
+            unread_counter.decr(request.user.id)
+        elif not self._receipts().filter(notification_id=pk).exists():
+            raise NotFound()
         return Response({'status': 'success'})
     
     @action(detail=False, methods=['post'])
     def mark_all_as_read(self, request):
-        AdminNotification.objects.filter(is_read=False).update(is_read=True)
-        return Response({'status': 'success'})
+        updated = self._receipts().filter(read_at__isnull=True).update(read_at=timezone.now())
+        unread_counter.set(request.user.id, 0)
+        return Response({'status': 'success', 'updated': updated})
+
+    @action(detail=False, methods=['get'], url_path='unread-count')
+    def unread_count(self, request):
+        return Response({'status': 'success', 'unread': unread_counter.get(request.user.id)})
 
 @extend_schema(tags=['admin'])
-class AdminDashboardStatsView(APIView):
+class AdminDashboardStatsView(AsyncAPIView):
     permission_classes = [IsAdminUser]
+    throttle_scope = 'analytics'
     
-    def get(self, request):
+    async def get(self, request):
         today = timezone.now().date()
         
-        # Общая статистика
-        stats = {
-            'total_users': User.objects.count(),
-            'new_users_today': User.objects.filter(date_joined__date=today).count(),
-            'total_jobs': Job.objects.count(),
-            'new_jobs_today': Job.objects.filter(posted_date__date=today).count(),
-            'total_applications': Application.objects.count(),
-            'new_applications_today': Application.objects.filter(created_at__date=today).count(),
-            'total_companies': Company.objects.count(),
-            'new_companies_today': Company.objects.filter(id__in=[1]).count(),  # Заглушка
-            'pending_verifications': Company.objects.filter(verified=False).count(),
-            'active_jobs': Job.objects.filter(is_active=True).count(),
-            'total_students': User.objects.filter(role='student').count(),
-            'total_employers': User.objects.filter(role='employer').count(),
-        }
+        # Общая статистика: one conditional aggregate per table, awaited together
+        users, jobs, applications, companies = await asyncio.gather(
+            User.objects.aaggregate(
+                total_users=Count('id'),
+                new_users_today=Count('id', filter=Q(date_joined__date=today)),
+                total_students=Count('id', filter=Q(role='student')),
+                total_employers=Count('id', filter=Q(role='employer')),
+            ),
+            Job.objects.aaggregate(
+                total_jobs=Count('id'),
+                new_jobs_today=Count('id', filter=Q(posted_date__date=today)),
+                active_jobs=Count('id', filter=Q(is_active=True)),
+            ),
+            Application.objects.aaggregate(
+                total_applications=Count('id'),
+                new_applications_today=Count('id', filter=Q(created_at__date=today)),
+            ),
+            Company.objects.aaggregate(
+                total_companies=Count('id'),
+                new_companies_today=Count('id', filter=Q(id__in=[1])),  # Заглушка
+                pending_verifications=Count('id', filter=Q(verified=False)),
+            ),
+        )
+        stats = {**users, **jobs, **applications, **companies}
         
         serializer = AdminDashboardStatsSerializer(stats)
         return Response(serializer.data)
@@ -513,6 +649,7 @@ class AdminDashboardStatsView(APIView):
 @extend_schema(tags=['admin'])
 class AdminAnalyticsView(APIView):
     permission_classes = []
+    throttle_scope = 'analytics'
     
     def get(self, request):
         try:
@@ -710,10 +847,7 @@ class SystemSettingsView(APIView):
     permission_classes = []
     
     def get(self, request):
-        settings, _ = SystemSettings.objects.get_or_create(id=1)
-        serializer = SystemSettingsSerializer(settings)
-        
-        print(f"SystemSettings data: {serializer.data}")
+        serializer = SystemSettingsSerializer(system_settings.get())
         
         return Response({
             "status": "success",
@@ -722,8 +856,8 @@ class SystemSettingsView(APIView):
         })
     
     def put(self, request):
-    
-        settings, _ = SystemSettings.objects.get_or_create(id=1)
+        # Saving bumps the shared version (admin_api.signals), so every process reloads.
+        settings = SystemSettings.get_settings()
         serializer = SystemSettingsSerializer(settings, data=request.data)
         
         if serializer.is_valid():
@@ -739,3 +873,20 @@ class SystemSettingsView(APIView):
             "message": "Invalid data provided",
             "errors": serializer.errors
         }, status=status.HTTP_400_BAD_REQUEST)
+
+
+@extend_schema(tags=['admin'], responses={200: OpenApiTypes.OBJECT})
+class TaskMetricsView(APIView):
+    """Celery outcome counts, runtime/queue-wait histograms per task and queue backlog."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        try:
+            queues = queue_depths()
+        except Exception:
+            logger.warning("Could not read Celery queue depths", exc_info=True)
+            queues = None
+        return Response({
+            'tasks': task_metrics.snapshot(),
+            'queues': queues,
+        })
@@ -1,12 +1,12 @@
 from rest_framework import serializers
 from analytics.models import JobView, JobApplicationMetrics, EmployerMetrics
 from users.serializers import UserSerializer
-from jobs.serializers import JobSerializer
+from jobs.serializers import NestedJobSerializer
 from applications.serializers import ApplicationSerializer
 
 class JobViewSerializer(serializers.ModelSerializer):
     viewer = UserSerializer(read_only=True)
-    job = JobSerializer(read_only=True)
+    job = NestedJobSerializer(read_only=True)
 
     class Meta:
         model = JobView
@@ -14,7 +14,7 @@ class JobViewSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'job', 'viewer', 'ip_address', 'viewed_at', 'duration']
 
 class JobApplicationMetricsSerializer(serializers.ModelSerializer):
-    job = JobSerializer(read_only=True)
+    job = NestedJobSerializer(read_only=True)
     application = ApplicationSerializer(read_only=True)
 
     class Meta:
@@ -8,7 +8,7 @@ from analytics.models import EmployerMetrics
 
 User = get_user_model()
 
-@shared_task(name='update_employer_metrics_task')
+@shared_task(name='update_employer_metrics_task', acks_late=True)
 def update_employer_metrics():
     employers = User.objects.filter(role='employer')
 
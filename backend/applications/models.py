@@ -59,6 +59,11 @@ class Application(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['applicant', '-created_at'], name='application_applicant_idx'),
+            models.Index(fields=['job', 'status'], name='application_job_status_idx'),
+            models.Index(fields=['created_at'], name='application_created_idx'),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=['job', 'applicant'],
@@ -1,3 +1,5 @@
+import logging
+
 from celery import shared_task
 from django.core.mail import send_mail
 from django.conf import settings
@@ -8,6 +10,7 @@ from .models import Application
 # from jobs.models import Job 
 
 User = get_user_model()
+logger = logging.getLogger(__name__)
 
 @shared_task(bind=True, max_retries=3, default_retry_delay=60) # Added bind, retries and delay
 def send_new_application_email_task(self, application_id):
@@ -23,11 +26,11 @@ def send_new_application_email_task(self, application_id):
         student = application.student
 
         if not employer or not hasattr(employer, 'email') or not employer.email:
-            print(f"Task send_new_application_email_task: Employer or employer email not found for job ID {job.id}. Application ID: {application_id}")
+            logger.warning(f"Task send_new_application_email_task: Employer or employer email not found for job ID {job.id}. Application ID: {application_id}")
             return # Or raise an error to retry if appropriate for your logic
 
         if not student or not hasattr(student, 'email') or not student.email:
-            print(f"Task send_new_application_email_task: Student or student email not found for application ID {application_id}")
+            logger.warning(f"Task send_new_application_email_task: Student or student email not found for application ID {application_id}")
             # Decide if this is critical; email is to employer, so student email might not be needed here.
             # For this task, student's name is used in the email body.
 
@@ -52,13 +55,13 @@ def send_new_application_email_task(self, application_id):
             [employer.email],
             fail_silently=False
         )
-        print(f"Task send_new_application_email_task: Email sent to {employer.email} for application ID {application_id}")
+        logger.info(f"Task send_new_application_email_task: Email sent to {employer.email} for application ID {application_id}")
 
     except Application.DoesNotExist:
-        print(f"Task send_new_application_email_task: Application with ID {application_id} does not exist. Task will not be retried.")
+        logger.warning(f"Task send_new_application_email_task: Application with ID {application_id} does not exist. Task will not be retried.")
         # No retry for DoesNotExist, as the object is gone.
     except Exception as exc:
-        print(f"Task send_new_application_email_task: Error sending email for application ID {application_id}: {exc}")
+        logger.error(f"Task send_new_application_email_task: Error sending email for application ID {application_id}: {exc}")
         # Celery will retry based on shared_task decorator settings (max_retries, default_retry_delay)
         raise self.retry(exc=exc)
 
@@ -74,7 +77,7 @@ def send_interview_scheduled_email_task(self, application_id):
         job = application.job
 
         if not student or not hasattr(student, 'email') or not student.email:
-            print(f"Task send_interview_scheduled_email_task: Student or student email not found for application ID {application.id}")
+            logger.warning(f"Task send_interview_scheduled_email_task: Student or student email not found for application ID {application.id}")
             return # Or raise an error to retry
 
         # Assuming application model has an 'interview_date' field.
@@ -109,10 +112,10 @@ def send_interview_scheduled_email_task(self, application_id):
             [student.email],
             fail_silently=False
         )
-        print(f"Task send_interview_scheduled_email_task: Email sent to {student.email} for application ID {application_id}")
+        logger.info(f"Task send_interview_scheduled_email_task: Email sent to {student.email} for application ID {application_id}")
 
     except Application.DoesNotExist:
-        print(f"Task send_interview_scheduled_email_task: Application with ID {application_id} does not exist. Task will not be retried.")
+        logger.warning(f"Task send_interview_scheduled_email_task: Application with ID {application_id} does not exist. Task will not be retried.")
     except Exception as exc:
-        print(f"Task send_interview_scheduled_email_task: Error sending email for application ID {application_id}: {exc}")
+        logger.error(f"Task send_interview_scheduled_email_task: Error sending email for application ID {application_id}: {exc}")
         raise self.retry(exc=exc) 
\ No newline at end of file
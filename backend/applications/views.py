@@ -62,6 +62,7 @@ class ApplicationViewSet(viewsets.ModelViewSet):
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ['status', 'job']
     ordering_fields = ['created_at', 'updated_at']
+    throttle_scopes = {'create': 'apply', 'stats': 'analytics'}
 
     def get_serializer_class(self):
         if self.action in ['retrieve', 'update', 'partial_update']:
@@ -106,13 +107,15 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         )
         
         try:
-            from admin_api.models import AdminNotification
-            AdminNotification.objects.create(
+            from admin_api.notifications import notify_admins
+            # Bursts of applications become one "N new applications" notification.
+            notify_admins(
+                type='new_application',
                 title=f"New Application for {job.title}",
                 message=f"A new application has been submitted by {self.request.user.email} for the job: {job.title}",
-                type='new_application',
-                content_type=ContentType.objects.get_for_model(Application),
-                object_id=serializer.instance.id
+                obj=application_instance,
+                coalesce_key='new_application',
+                summary="{count} new applications",
             )
         except (ImportError, ContentType.DoesNotExist):
             pass
@@ -1,3 +1,20 @@
 from django.db import models
 
 # Create your models here.
+
+
+class CompanySimilarity(models.Model):
+    """Precomputed nearest neighbours of a company, rebuilt by rebuild_company_similarity_index."""
+    company = models.ForeignKey('companies.Company', on_delete=models.CASCADE, related_name='similarities')
+    similar = models.ForeignKey('companies.Company', on_delete=models.CASCADE, related_name='+')
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+
+    class Meta:
+        ordering = ['company', 'rank']
+        constraints = [
+            models.UniqueConstraint(fields=['company', 'rank'], name='unique_company_similarity_rank'),
+        ]
+
+    def __str__(self):
+        return f"{self.company_id} ~ {self.similar_id} ({self.score:.3f})"
@@ -1,39 +1,164 @@
 # serializers.py
 
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, F, Window
+from django.db.models.functions import RowNumber
 from rest_framework import serializers
-from companies.models import Company
+from companies.models import Company, CompanySimilarity
 from jobs.models import Job  # Import the Job model
-from jobs.serializers import JobSerializer  # Import the JobSerializer
+from jobs.serializers import JobListSerializer
+
+SIMILAR_COMPANIES_LIMIT = 3
+
+
+def similar_companies_cache_key(industry, location):
+    return f"companies:similar:{industry or ''}:{location or ''}"
+
+
+def _company_card(company):
+    return {
+        'id': company.id,
+        'name': company.name,
+        'industry': company.industry,
+        'location': company.location,
+        'logo': company.logo.url if company.logo else None
+    }
+
+
+def _positive_int(value, default, maximum):
+    try:
+        return min(max(int(value), 0), maximum)
+    except (TypeError, ValueError):
+        return default
+
+
+class CompanyListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        companies = list(data.all() if hasattr(data, 'all') else data)
+        self.child.prepare_representation(companies)
+        return super().to_representation(companies)
+
 
 class CompanySerializer(serializers.ModelSerializer):
+    """
+    Company payload with a capped slice of active jobs and similar companies.
+
+    Everything the embedded fields need is resolved for the whole page at once
+    in ``prepare_representation``: one windowed query for the job slices, one
+    for job totals, one for the student's saved flags, one similarity index
+    fetch and at most one for similar-company buckets the index lacks. Pass
+    ``jobs_offset`` / ``jobs_limit`` query params to page through a company's jobs.
+    """
     company_name = serializers.CharField(source='name', read_only=True)
     company = serializers.CharField(source='name', read_only=True)
     company_id = serializers.CharField(read_only=True)
     jobs = serializers.SerializerMethodField()
+    jobs_total = serializers.SerializerMethodField()
     similar_companies = serializers.SerializerMethodField()
 
     class Meta:
         model = Company
         fields = '__all__'
+        list_serializer_class = CompanyListSerializer
+
+    def _jobs_window(self):
+        request = self.context.get('request')
+        params = request.query_params if request is not None else {}
+        limit = _positive_int(
+            params.get('jobs_limit'), settings.COMPANY_EMBEDDED_JOBS_LIMIT, settings.COMPANY_EMBEDDED_JOBS_MAX_LIMIT
+        )
+        offset = _positive_int(params.get('jobs_offset'), 0, 10_000)
+        return offset, limit
+
+    def prepare_representation(self, companies):
+        company_keys = [str(company.id) for company in companies]
+        offset, limit = self._jobs_window()
+
+        jobs_by_company = {key: [] for key in company_keys}
+        totals = {}
+        if company_keys:
+            active_jobs = Job.objects.filter(company_id__in=company_keys, is_active=True)
+            if limit:
+                sliced = active_jobs.annotate(
+                    row_number=Window(RowNumber(), partition_by=F('company_id'), order_by=F('posted_date').desc())
+                ).filter(row_number__gt=offset, row_number__lte=offset + limit).order_by('company_id', 'row_number')
+                for job in sliced:
+                    jobs_by_company[str(job.company_id)].append(job)
+            totals = {
+                str(row['company_id']): row['total']
+                for row in active_jobs.values('company_id').annotate(total=Count('id')).order_by()
+            }
+
+        # Merged into the context by company id: the context may be shared with
+        # other serializations (e.g. two single companies in one response).
+        self.context.setdefault('company_jobs', {}).update(jobs_by_company)
+        self.context.setdefault('company_jobs_total', {}).update(totals)
+        self.context.setdefault('saved_job_ids', set()).update(
+            self._saved_job_ids([job.pk for jobs in jobs_by_company.values() for job in jobs])
+        )
+        indexed = {}
+        for entry in CompanySimilarity.objects.filter(
+            company_id__in=[company.id for company in companies], rank__lte=SIMILAR_COMPANIES_LIMIT
+        ).select_related('similar').order_by('company_id', 'rank'):
+            indexed.setdefault(entry.company_id, []).append(_company_card(entry.similar))
+        self.context.setdefault('indexed_similar_companies', {}).update(indexed)
+        self.context.setdefault('similar_companies', {}).update(self._similar_company_buckets(
+            [company for company in companies if company.id not in indexed]
+        ))
+
+    def _saved_job_ids(self, job_ids):
+        request = self.context.get('request')
+        if not job_ids or not request or not request.user.is_authenticated or request.user.role != 'student':
+            return set()
+        profile = getattr(request.user, 'student_profile', None)
+        if profile is None:
+            return set()
+        return set(profile.saved_jobs.filter(pk__in=job_ids).values_list('pk', flat=True))
+
+    def _similar_company_buckets(self, companies):
+        """
+        Fallback for companies the similarity index has not covered yet: similar
+        companies are shared by every company in the same (industry, location)
+        bucket, so each bucket is computed once and cached. One extra card is kept
+        so the company itself can be dropped.
+        """
+        if not companies:
+            return {}
+        buckets = {similar_companies_cache_key(c.industry, c.location): (c.industry, c.location) for c in companies}
+        cached = cache.get_many(list(buckets))
+        missing = {key: bucket for key, bucket in buckets.items() if key not in cached}
+
+        if missing:
+            computed = {key: [] for key in missing}
+            industries = {industry for industry, _ in missing.values()}
+            locations = {location for _, location in missing.values()}
+            candidates = Company.objects.filter(industry__in=industries, location__in=locations).annotate(
+                row_number=Window(RowNumber(), partition_by=[F('industry'), F('location')], order_by=F('id').asc())
+            ).filter(row_number__lte=SIMILAR_COMPANIES_LIMIT + 1)
+            for company in candidates:
+                key = similar_companies_cache_key(company.industry, company.location)
+                if key in computed:
+                    computed[key].append(_company_card(company))
+            cache.set_many(computed, settings.SIMILAR_COMPANIES_CACHE_TIMEOUT)
+            cached.update(computed)
+        return cached
+
+    def to_representation(self, instance):
+        if str(instance.id) not in self.context.get('company_jobs', {}):
+            self.prepare_representation([instance])
+        return super().to_representation(instance)
 
     def get_jobs(self, obj):
-        from jobs.models import Job
-        from jobs.serializers import JobSerializer
-        jobs = Job.objects.filter(company_id=str(obj.id), is_active=True)
-        return JobSerializer(jobs, many=True, context=self.context).data
+        jobs = self.context['company_jobs'].get(str(obj.id), [])
+        return JobListSerializer(jobs, many=True, context=self.context).data
+
+    def get_jobs_total(self, obj):
+        return self.context['company_jobs_total'].get(str(obj.id), 0)
 
     def get_similar_companies(self, obj):
-        similar = Company.objects.filter(
-            industry=obj.industry,
-            location=obj.location
-        ).exclude(id=obj.id)[:3]
-        return [
-            {
-                'id': c.id,
-                'name': c.name,
-                'industry': c.industry,
-                'location': c.location,
-                'logo': c.logo.url if c.logo else None
-            }
-            for c in similar
-        ]
+        indexed = self.context['indexed_similar_companies'].get(obj.id)
+        if indexed is not None:
+            return indexed
+        cards = self.context['similar_companies'].get(similar_companies_cache_key(obj.industry, obj.location), [])
+        return [card for card in cards if card['id'] != obj.id][:SIMILAR_COMPANIES_LIMIT]
@@ -0,0 +1,23 @@
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from companies.models import Company
+from companies.serializers import similar_companies_cache_key
+
+
+@receiver(pre_save, sender=Company)
+def remember_similar_companies_bucket(sender, instance, **kwargs):
+    # A company that moves to another industry or location must also leave the old bucket's cards.
+    instance._previous_similar_bucket = (
+        Company.objects.filter(pk=instance.pk).values_list('industry', 'location').first() if instance.pk else None
+    )
+
+
+@receiver([post_save, post_delete], sender=Company)
+def invalidate_similar_companies(sender, instance, **kwargs):
+    keys = {similar_companies_cache_key(instance.industry, instance.location)}
+    previous = getattr(instance, '_previous_similar_bucket', None)
+    if previous is not None:
+        keys.add(similar_companies_cache_key(*previous))
+    cache.delete_many(list(keys))
@@ -0,0 +1,38 @@
+from collections import defaultdict
+
+from celery import shared_task
+from django.conf import settings
+from django.db import transaction
+
+from companies.models import Company, CompanySimilarity
+from core.similarity import build_feature_matrix, tokenize, top_neighbours
+from jobs.models import Job
+
+COMPANY_FEATURE_WEIGHTS = {'industry': 1.0, 'location': 0.6, 'size': 0.3, 'tokens': 0.8}
+
+
+@shared_task(name='rebuild_company_similarity_index_task', acks_late=True)
+def rebuild_company_similarity_index():
+    """Scores every company against every other and stores the top neighbours per company."""
+    companies = list(Company.objects.values('id', 'industry', 'location', 'size', 'description'))
+
+    job_tokens = defaultdict(list)
+    for company_id, title, requirements in Job.objects.filter(is_active=True).values_list(
+        'company_id', 'title', 'requirements'
+    ):
+        job_tokens[str(company_id)].extend(tokenize(title, requirements))
+
+    for company in companies:
+        company['tokens'] = tokenize(company['description']) + job_tokens[str(company['id'])]
+
+    matrix = build_feature_matrix(companies, ['industry', 'location', 'size'], weights=COMPANY_FEATURE_WEIGHTS)
+    entries = [
+        CompanySimilarity(company_id=companies[row]['id'], similar_id=companies[column]['id'], rank=rank, score=score)
+        for row, neighbours in top_neighbours(matrix, settings.SIMILARITY_INDEX_NEIGHBOURS)
+        for rank, (column, score) in enumerate(neighbours, start=1)
+    ]
+
+    with transaction.atomic():
+        CompanySimilarity.objects.all().delete()
+        CompanySimilarity.objects.bulk_create(entries, batch_size=1000)
+    return f"Company similarity index rebuilt: {len(entries)} neighbours for {len(companies)} companies"
@@ -3,6 +3,9 @@ import os
 
 from django.core.asgi import get_asgi_application
 
+from config.sentry import init_sentry
+
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 application = get_asgi_application()
+init_sentry()
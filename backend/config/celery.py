@@ -1,5 +1,5 @@
 import os
-from celery import Celery
+from celery import Celery, signals
 from django.conf import settings
 
 
@@ -14,6 +14,14 @@ app.config_from_object('django.conf:settings', namespace='CELERY')
 app.autodiscover_tasks(lambda: settings.INSTALLED_APPS)
 
 
+@signals.celeryd_init.connect
+@signals.beat_init.connect
+def setup_sentry(**kwargs):
+    from config.sentry import init_sentry
+
+    init_sentry()
+
+
 @app.task(bind=True, ignore_result=True)
 def debug_task(self):
     """A sample task for debugging Celery setup."""
@@ -1,11 +1,6 @@
 from datetime import timedelta
 from pathlib import Path
 import os, environ
-import sentry_sdk
-from sentry_sdk.integrations.django import DjangoIntegration
-from sentry_sdk.integrations.celery import CeleryIntegration
-from sentry_sdk.integrations.logging import LoggingIntegration
-import logging
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 env = environ.Env()
@@ -27,6 +22,7 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
 
     'rest_framework',
+    'adrf',
     'rest_framework_simplejwt',
     'storages',
     'django_filters',
@@ -41,10 +37,11 @@ INSTALLED_APPS = [
     'users',
     'drf_spectacular',
     'corsheaders',
-    'sentry_sdk',
 ]
 
 MIDDLEWARE = [
+    'core.middleware.RequestMetricsMiddleware',
+    'core.middleware.RateLimitHeadersMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -111,16 +108,33 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 AUTH_USER_MODEL = 'users.CustomUser'
 
-AWS_ACCESS_KEY_ID = env.str('AWS_ACCESS_KEY_ID')
-AWS_SECRET_ACCESS_KEY = env.str('AWS_SECRET_ACCESS_KEY')
-AWS_STORAGE_BUCKET_NAME = env.str('AWS_STORAGE_BUCKET_NAME')
-AWS_S3_REGION_NAME = env.str('AWS_S3_REGION_NAME')
+# "s3" talks to AWS (or any S3-compatible endpoint such as MinIO via AWS_S3_ENDPOINT_URL);
+# "local" keeps assets under MEDIA_ROOT with simulated signed URLs, for tests and offline benchmarks.
+STORAGE_BACKEND = env.str('STORAGE_BACKEND', default='s3')
+_aws_default = None if STORAGE_BACKEND == 'local' else environ.Env.NOTSET
+
+AWS_ACCESS_KEY_ID = env.str('AWS_ACCESS_KEY_ID', default=_aws_default)
+AWS_SECRET_ACCESS_KEY = env.str('AWS_SECRET_ACCESS_KEY', default=_aws_default)
+AWS_STORAGE_BUCKET_NAME = env.str('AWS_STORAGE_BUCKET_NAME', default=_aws_default)
+AWS_S3_REGION_NAME = env.str('AWS_S3_REGION_NAME', default=_aws_default)
+AWS_S3_ENDPOINT_URL = env.str('AWS_S3_ENDPOINT_URL', default=None)
 AWS_S3_SIGNATURE_VERSION = "s3v4"
 AWS_DEFAULT_ACL = 'private'
 AWS_QUERYSTRING_AUTH = True
 AWS_S3_OBJECT_PARAMETERS = {"CacheControl": "max-age=86400"}
-AWS_S3_ADDRESSING_STYLE = "virtual"
-DEFAULT_FILE_STORAGE = "storages.backends.s3boto3.S3Boto3Storage"
+AWS_S3_ADDRESSING_STYLE = env.str('AWS_S3_ADDRESSING_STYLE', default='virtual')
+
+STORAGES = {
+    "default": {
+        "BACKEND": (
+            "core.storage.LocalAssetStorage" if STORAGE_BACKEND == 'local'
+            else "storages.backends.s3boto3.S3Boto3Storage"
+        ),
+    },
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+    },
+}
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
@@ -137,13 +151,21 @@ REST_FRAMEWORK = {
     ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
+    # Sliding windows in Redis, shared by all workers (core.throttling). Views
+    # pick a scope with throttle_scope / throttle_scopes.
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.AnonRateThrottle',
-        'rest_framework.throttling.UserRateThrottle',
+        'core.throttling.AnonSlidingWindowThrottle',
+        'core.throttling.UserSlidingWindowThrottle',
+        'core.throttling.ScopedSlidingWindowThrottle',
     ],
     'DEFAULT_THROTTLE_RATES': {
         'anon': '60/minute',
-        'user': '1000/day',
+        'user': '2000/hour',
+        'login': '10/minute',
+        'apply': '30/hour',
+        'bulk': '10/minute',
+        'analytics': '60/minute',
+        'resource_download': '120/minute',
     },
     'DEFAULT_RENDERER_CLASSES': [
         'core.renderers.CustomJSONRenderer',
@@ -156,6 +178,12 @@ REST_FRAMEWORK = {
     ]
 }
 
+# Share of 4xx API errors logged (without traceback); all of them are counted in /metrics.
+API_CLIENT_ERROR_LOG_SAMPLE_RATE = env.float('API_CLIENT_ERROR_LOG_SAMPLE_RATE', default=0.01)
+
+# "orjson" encodes API responses with orjson when installed; "json" forces DRF's stdlib encoder.
+JSON_RENDERER_BACKEND = env('JSON_RENDERER_BACKEND', default='orjson')
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(days=365, minutes=15),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
@@ -236,27 +264,101 @@ CELERY_TIMEZONE = TIME_ZONE
 CELERY_TASK_TRACK_STARTED = True
 CELERY_TASK_TIME_LIMIT = 30 * 60
 
+# Queues are served by separate worker profiles (see docker-compose.yml) so slow
+# analytics or imports never hold up transactional email. Unrouted tasks go to "default".
+CELERY_TASK_DEFAULT_QUEUE = 'default'
+CELERY_TASK_ROUTES = {
+    'applications.tasks.send_*_email_task': {'queue': 'email'},
+    'update_employer_metrics_task': {'queue': 'analytics'},
+    'rebuild_*_similarity_index_task': {'queue': 'analytics'},
+    'users.tasks.extract_resume_text_task': {'queue': 'imports'},
+}
+# Defaults for every worker; profiles override them with --prefetch-multiplier,
+# --max-tasks-per-child and --max-memory-per-child.
+CELERY_WORKER_PREFETCH_MULTIPLIER = env.int('CELERY_WORKER_PREFETCH_MULTIPLIER', default=1)
+CELERY_WORKER_MAX_TASKS_PER_CHILD = env.int('CELERY_WORKER_MAX_TASKS_PER_CHILD', default=200)
+CELERY_WORKER_MAX_MEMORY_PER_CHILD = env.int('CELERY_WORKER_MAX_MEMORY_PER_CHILD', default=300_000)  # KiB
+# acks_late tasks are re-queued if a worker dies mid-run; keep the broker's
+# visibility timeout above the task time limit so they are not redelivered early.
+CELERY_BROKER_TRANSPORT_OPTIONS = {'visibility_timeout': CELERY_TASK_TIME_LIMIT + 5 * 60}
+
+CELERY_BEAT_SCHEDULE = {
+    'flush-resource-counters': {
+        'task': 'flush_resource_counters_task',
+        'schedule': env.float('RESOURCE_COUNTERS_FLUSH_INTERVAL', default=60.0),
+    },
+    'rebuild-company-similarity-index': {
+        'task': 'rebuild_company_similarity_index_task',
+        'schedule': env.float('SIMILARITY_INDEX_REBUILD_INTERVAL', default=6 * 60 * 60.0),
+    },
+    'rebuild-job-similarity-index': {
+        'task': 'rebuild_job_similarity_index_task',
+        'schedule': env.float('SIMILARITY_INDEX_REBUILD_INTERVAL', default=6 * 60 * 60.0),
+    },
+    'update-employer-metrics': {
+        'task': 'update_employer_metrics_task',
+        'schedule': env.float('EMPLOYER_METRICS_INTERVAL', default=60 * 60.0),
+    },
+    'purge-admin-notifications': {
+        'task': 'purge_admin_notifications_task',
+        'schedule': 24 * 60 * 60.0,
+    },
+}
+
+# Neighbours stored per company/job by the similarity index tasks.
+SIMILARITY_INDEX_NEIGHBOURS = 10
+
+# Redis for the shared cache and write-behind counters; unset means a per-process
+# cache and counters that write straight to the database.
+REDIS_URL = env('REDIS_URL', default=None)
+
+# core.cache backends are the stock ones plus hit/miss counters for /metrics.
+CACHES = {
+    'default': {
+        'BACKEND': 'core.cache.InstrumentedRedisCache',
+        'LOCATION': REDIS_URL,
+    } if REDIS_URL else {
+        'BACKEND': 'core.cache.InstrumentedLocMemCache',
+    }
+}
+
+# Bearer token required by /metrics when set.
+METRICS_TOKEN = env('METRICS_TOKEN', default=None)
+
+# Where batched ModerationLog entries are written: "sync" after the request's
+# transaction commits, "async" by write_moderation_logs_task (admin_api.audit).
+MODERATION_AUDIT_MODE = env('MODERATION_AUDIT_MODE', default='sync')
+
+# Admin notifications with the same coalesce key within this many seconds are
+# merged into one; notifications older than the retention are purged daily.
+ADMIN_NOTIFICATION_COALESCE_WINDOW = env.int('ADMIN_NOTIFICATION_COALESCE_WINDOW', default=300)
+ADMIN_NOTIFICATION_RETENTION_DAYS = env.int('ADMIN_NOTIFICATION_RETENTION_DAYS', default=90)
+
+# Seconds a process trusts its copy of SystemSettings before checking the shared version.
+SYSTEM_SETTINGS_CACHE_TTL = env.int('SYSTEM_SETTINGS_CACHE_TTL', default=30)
+
+# Seconds a user's serialized /me profile is cached; 0 disables it. Profile writes
+# invalidate it through a per-user version (users.cache).
+PROFILE_CACHE_TIMEOUT = env.int('PROFILE_CACHE_TIMEOUT', default=60)
+# Same for public profiles, keyed by user id; also the max-age sent to clients and CDNs.
+PUBLIC_PROFILE_CACHE_TIMEOUT = env.int('PUBLIC_PROFILE_CACHE_TIMEOUT', default=60)
+
+RESOURCE_CATALOGUE_CACHE_TIMEOUT = env.int('RESOURCE_CATALOGUE_CACHE_TIMEOUT', default=300)
+SIMILAR_COMPANIES_CACHE_TIMEOUT = env.int('SIMILAR_COMPANIES_CACHE_TIMEOUT', default=900)
+
+# Jobs embedded in company payloads; clients page with ?jobs_offset=&jobs_limit=
+COMPANY_EMBEDDED_JOBS_LIMIT = 5
+COMPANY_EMBEDDED_JOBS_MAX_LIMIT = 50
+
 
 
 # Sentry Configuration
+# Initialised by the server and worker entry points (config.sentry.init_sentry),
+# so settings imports and manage.py commands don't load the SDK.
 SENTRY_DSN = env('SENTRY_DSN', default=None)
-if SENTRY_DSN:
-    sentry_sdk.init(
-        dsn=SENTRY_DSN,
-        integrations=[
-            DjangoIntegration(),
-            CeleryIntegration(),
-            LoggingIntegration(
-                level=logging.INFO,
-                event_level=logging.ERROR
-            ),
-        ],
-
-        traces_sample_rate=env.float('SENTRY_TRACES_SAMPLE_RATE', default=0.1),
-        send_default_pii=True,
-        environment=env('DJANGO_ENVIRONMENT', default='dev'),
-        release=env('SENTRY_RELEASE', default=None)
-    )
+SENTRY_TRACES_SAMPLE_RATE = env.float('SENTRY_TRACES_SAMPLE_RATE', default=0.1)
+SENTRY_ENVIRONMENT = env('DJANGO_ENVIRONMENT', default='dev')
+SENTRY_RELEASE = env('SENTRY_RELEASE', default=None)
 
 
 CORS_ALLOWED_ORIGINS = env.list('CORS_ALLOWED_ORIGINS', default=[])
@@ -273,6 +375,8 @@ CORS_ALLOW_METHODS = [
 ]
 
 CORS_ALLOW_HEADERS = ["*"]
+# Lets the frontend read the rate-limit state (core.throttling).
+CORS_EXPOSE_HEADERS = ["RateLimit-Limit", "RateLimit-Remaining", "RateLimit-Reset", "Retry-After"]
 SECURE_CONTENT_TYPE_NOSNIFF = True
 SECURE_BROWSER_XSS_FILTER = True
 X_FRAME_OPTIONS = 'DENY'
@@ -326,6 +430,12 @@ LOGGING = {
             'level': 'INFO',
             'propagate': False,
         },
+        # One key=value line per Celery task event (see core.signals).
+        'core.task_metrics': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
     },
 }
 
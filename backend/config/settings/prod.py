@@ -20,6 +20,30 @@ DATABASES = {
     }
 }
 
+# Connection reuse is tuned per process type (DJANGO_PROCESS_TYPE=web|worker).
+# Web workers share a psycopg pool across their threads; Celery prefork
+# children run one task at a time, so they keep a single persistent
+# connection that is health-checked before reuse. The pool and CONN_MAX_AGE
+# are mutually exclusive in Django.
+DJANGO_PROCESS_TYPE = env('DJANGO_PROCESS_TYPE', default='web')
+DB_POOL = env.bool('DB_POOL', default=DJANGO_PROCESS_TYPE == 'web')
+
+if DB_POOL:
+    DATABASES['default']['OPTIONS'] = {
+        'pool': {
+            'min_size': env.int('DB_POOL_MIN_SIZE', default=2),
+            'max_size': env.int('DB_POOL_MAX_SIZE', default=10),
+            'timeout': env.float('DB_POOL_TIMEOUT', default=10),
+            'max_idle': env.float('DB_POOL_MAX_IDLE', default=300),
+            'max_lifetime': env.float('DB_POOL_MAX_LIFETIME', default=1800),
+        },
+    }
+else:
+    DATABASES['default']['CONN_MAX_AGE'] = env.int(
+        'DB_CONN_MAX_AGE', default=600 if DJANGO_PROCESS_TYPE == 'worker' else 60
+    )
+    DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+
 # ─── Security ────────────────────────────────────────────────────
 
 SECURE_BROWSER_XSS_FILTER = True
@@ -69,6 +93,16 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'UTC'  # Or your preferred timezone
 
+# ─── Cache ───────────────────────────────────────────────────────
+
+REDIS_URL = env('REDIS_URL', default='redis://sh-redis:6379/1')
+CACHES = {
+    'default': {
+        'BACKEND': 'core.cache.InstrumentedRedisCache',
+        'LOCATION': REDIS_URL,
+    }
+}
+
 # ─── JWT ─────────────────────────────────────────────────────────
 
 SIMPLE_JWT.update({
@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.http import JsonResponse
-from django.urls import path, include
+from django.urls import path, re_path, include
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
     TokenRefreshView,
@@ -11,6 +11,7 @@ from rest_framework.permissions import AllowAny
 from django.conf import settings
 from django.conf.urls.static import static
 
+from core.views import metrics, serve_asset
 from users.views import CustomRefreshView, CustomTokenObtainPairView, CustomVerifyView
 def health_check(_):
     return JsonResponse({'status': 'ok'})
@@ -19,6 +20,7 @@ urlpatterns = [
     path('djangoadmin/', admin.site.urls),
 
     path("health/", health_check),
+    path("metrics", metrics, name="metrics"),
     # ── JWT ────────
     path("api/auth/token/refresh/", CustomRefreshView.as_view(), name="token-refresh"),
     path("api/auth/token/verify/", CustomVerifyView.as_view(), name="token-verify"),
@@ -43,6 +45,10 @@ urlpatterns = [
 ]
 
 
-if settings.DEBUG:
+if settings.STORAGE_BACKEND == 'local':
+    urlpatterns += [
+        re_path(r'^%s(?P<path>.*)$' % settings.MEDIA_URL.lstrip('/'), serve_asset, name='local-asset'),
+    ]
+elif settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
 
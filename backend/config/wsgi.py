@@ -1,7 +1,11 @@
+
 import os
 
 from django.core.wsgi import get_wsgi_application
 
+from config.sentry import init_sentry
+
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
-application = get_wsgi_application() 
\ No newline at end of file
+application = get_wsgi_application()
+init_sentry()
@@ -0,0 +1,47 @@
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.cache.backends.redis import RedisCache
+
+from core.metrics import CACHE_LOOKUPS
+
+_MISSING = object()
+
+
+class CacheMetricsMixin:
+    """Counts hits and misses of ``get`` / ``get_many`` per cache alias."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._hits = self._misses = None
+
+    def _record(self, hits, misses):
+        # The alias isn't passed to backends; KEY_PREFIX or the class name tells caches apart.
+        if self._hits is None:
+            label = self.key_prefix or type(self).__name__
+            self._hits = CACHE_LOOKUPS.labels(cache=label, result='hit')
+            self._misses = CACHE_LOOKUPS.labels(cache=label, result='miss')
+        if hits:
+            self._hits.inc(hits)
+        if misses:
+            self._misses.inc(misses)
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _MISSING, version=version)
+        if value is _MISSING:
+            self._record(0, 1)
+            return default
+        self._record(1, 0)
+        return value
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        found = super().get_many(keys, version=version)
+        self._record(len(found), len(keys) - len(found))
+        return found
+
+
+class InstrumentedRedisCache(CacheMetricsMixin, RedisCache):
+    pass
+
+
+class InstrumentedLocMemCache(CacheMetricsMixin, LocMemCache):
+    pass
@@ -1,4 +1,5 @@
 import logging
+import random
 
 from rest_framework.views import exception_handler
 from rest_framework.exceptions import ValidationError, AuthenticationFailed, PermissionDenied as DRFPermissionDenied, NotAuthenticated
@@ -8,15 +9,40 @@ from rest_framework.response import Response
 from rest_framework import status
 from django.conf import settings # For settings.DEBUG
 
+from core.metrics import API_ERRORS
+
 logger = logging.getLogger(__name__)
+
+
+def _view_label(context):
+    request = context.get('request') if context else None
+    match = getattr(request, 'resolver_match', None)
+    if match is not None:
+        return match.url_name or match.route or match.view_name
+    view = context.get('view') if context else None
+    return type(view).__name__ if view is not None else '<unknown>'
+
+
+def _report(exc, context, status_code, error_code):
+    """
+    Server errors are logged with their traceback. Client errors (validation,
+    expired tokens, 404s) are routine: they are only counted per status, code and
+    view, and a sample (API_CLIENT_ERROR_LOG_SAMPLE_RATE) is logged without one.
+    """
+    view = _view_label(context)
+    API_ERRORS.labels(status=str(status_code), code=str(error_code), view=view).inc()
+    if status_code >= 500:
+        logger.error("Unhandled exception in API view %s", view, exc_info=exc)
+    elif random.random() < settings.API_CLIENT_ERROR_LOG_SAMPLE_RATE:
+        logger.warning("Client error %s (%s) in API view %s: %s", status_code, error_code, view, exc)
+
+
 def custom_exception_handler(exc, context):
     """
     Global exception handler that wraps all DRF errors in a consistent JSON format.
     Ensures 'status', 'message', 'data', and 'error' keys are present.
     """
 
-    logger.exception("Unhandled exception in API")
-
     response = exception_handler(exc, context) # Get DRF's default response
 
     error_message = "An error occurred."
@@ -67,6 +93,8 @@ def custom_exception_handler(exc, context):
             if not settings.DEBUG: # Don't leak full exception details in production
                 details = None
     
+    _report(exc, context, response_status_code, error_code)
+
     final_response_data = {
         'status': 'fail', # All exceptions handled here result in a 'fail' status
         'message': error_message,
@@ -77,4 +105,6 @@ def custom_exception_handler(exc, context):
         }
     }
     
-    return Response(final_response_data, status=response_status_code)
+    # Throttled responses tell the client when to retry.
+    headers = {'Retry-After': response['Retry-After']} if response is not None and response.has_header('Retry-After') else None
+    return Response(final_response_data, status=response_status_code, headers=headers)
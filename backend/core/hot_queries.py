@@ -0,0 +1,74 @@
+"""
+Registry of the querysets behind the busiest endpoints, checked by the
+``explain_hot_queries`` management command.
+
+Each entry is a zero-argument callable so models are only imported and the
+queryset is only built when the command runs. Register new entries next to the
+index that is meant to serve them.
+"""
+from django.utils import timezone
+
+HOT_QUERIES = {}
+
+
+def hot_query(name):
+    def decorator(func):
+        HOT_QUERIES[name] = func
+        return func
+    return decorator
+
+
+@hot_query('applications.by_applicant')
+def _applications_by_applicant():
+    from applications.models import Application
+    return Application.objects.filter(applicant_id=1).order_by('-created_at')
+
+
+@hot_query('applications.by_job_status')
+def _applications_by_job_status():
+    from applications.models import Application
+    return Application.objects.filter(job_id=1, status='pending')
+
+
+@hot_query('applications.recent')
+def _applications_recent():
+    from applications.models import Application
+    return Application.objects.filter(created_at__gte=timezone.now() - timezone.timedelta(days=30))
+
+
+@hot_query('users.active_by_role')
+def _users_active_by_role():
+    from users.models import CustomUser
+    return CustomUser.objects.filter(role='student', is_active=True)
+
+
+@hot_query('users.joined_today')
+def _users_joined_today():
+    from users.models import CustomUser
+    return CustomUser.objects.filter(date_joined__date=timezone.now().date())
+
+
+@hot_query('moderation_logs.by_action')
+def _moderation_logs_by_action():
+    from admin_api.models import ModerationLog
+    return ModerationLog.objects.filter(action='approve').order_by('-timestamp')
+
+
+@hot_query('admin_notifications.unread')
+def _admin_notifications_unread():
+    from admin_api.models import AdminNotificationReceipt
+    from users.models import CustomUser
+    admin_id = CustomUser.objects.filter(is_staff=True).values('id')[:1]
+    return AdminNotificationReceipt.objects.filter(admin_id=admin_id, read_at__isnull=True).order_by('-notification')
+
+
+@hot_query('resources.catalogue')
+def _resources_catalogue():
+    from resources.models import Resource
+    return Resource.objects.filter(category='Career', type='Article', is_demo=False).order_by('-published_at')
+
+
+@hot_query('resources.demo')
+def _resources_demo():
+    from resources.models import Resource
+    return Resource.objects.filter(is_demo=True).order_by('-published_at')
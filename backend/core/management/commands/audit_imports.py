@@ -0,0 +1,82 @@
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+# What a gunicorn or Celery worker imports before serving: settings, every app
+# and the full URLconf (and with it every view module).
+BOOT_SCRIPT = (
+    "import django; django.setup(); "
+    "from django.urls import get_resolver; get_resolver().url_patterns"
+)
+
+# Heavy packages that must only be imported on first use.
+DEFERRED_PACKAGES = ('pandas', 'numpy', 'openpyxl', 'boto3', 'botocore', 'sentry_sdk', 'pypdf')
+
+
+class Command(BaseCommand):
+    help = (
+        'Boots Django in a fresh interpreter with -X importtime, reports the slowest '
+        'top-level packages and checks heavy dependencies stay deferred.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=20, help='Number of packages to report.')
+        parser.add_argument('--repeat', type=int, default=5, help='Cold starts to time for the startup benchmark.')
+        parser.add_argument('--max-startup-ms', type=float, help='Fail when the median cold start exceeds this.')
+        parser.add_argument(
+            '--allow', action='append', default=[],
+            help='Deferred package allowed at startup (e.g. boto3 when STORAGE_BACKEND=s3).',
+        )
+
+    def handle(self, *args, **options):
+        stderr = self._boot(importtime=True).stderr
+        packages = self._cumulative_by_package(stderr)
+
+        self.stdout.write(f"{'package':<32} {'cumulative ms':>14}")
+        for package, micros in sorted(packages.items(), key=lambda item: -item[1])[:options['top']]:
+            self.stdout.write(f"{package:<32} {micros / 1000:>14.1f}")
+
+        problems = []
+        eager = [name for name in DEFERRED_PACKAGES if name in packages and name not in options['allow']]
+        if eager:
+            problems.append(f"imported at startup: {', '.join(eager)}")
+
+        durations = []
+        for _ in range(max(options['repeat'], 1)):
+            started = time.perf_counter()
+            self._boot(importtime=False)
+            durations.append((time.perf_counter() - started) * 1000)
+        median = statistics.median(durations)
+        self.stdout.write(f"cold start: median {median:.0f} ms, min {min(durations):.0f} ms over {len(durations)} runs")
+        if options['max_startup_ms'] and median > options['max_startup_ms']:
+            problems.append(f"median cold start {median:.0f} ms exceeds {options['max_startup_ms']:.0f} ms")
+
+        if problems:
+            raise CommandError('; '.join(problems))
+        self.stdout.write(self.style.SUCCESS('Heavy imports are deferred.'))
+
+    def _boot(self, importtime):
+        command = [sys.executable]
+        if importtime:
+            command += ['-X', 'importtime']
+        command += ['-c', BOOT_SCRIPT]
+        result = subprocess.run(command, capture_output=True, text=True, env=os.environ.copy())
+        if result.returncode:
+            raise CommandError(f"Django failed to boot:\n{result.stderr[-2000:]}")
+        return result
+
+    def _cumulative_by_package(self, stderr):
+        # Lines read "import time: self [us] | cumulative | imported package"; the
+        # largest cumulative figure among a package's modules is its import cost.
+        packages = {}
+        for line in stderr.splitlines():
+            if not line.startswith('import time:') or 'imported package' in line:
+                continue
+            _, cumulative, name = line[len('import time:'):].split('|')
+            package = name.strip().split('.')[0]
+            packages[package] = max(packages.get(package, 0), int(cumulative))
+        return packages
@@ -0,0 +1,77 @@
+import copy
+import importlib.util
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.core.signals import request_finished, request_started
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class Command(BaseCommand):
+    help = 'Measures request-cycle throughput with fresh, persistent and pooled database connections.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000)
+        parser.add_argument('--threads', type=int, default=4, help='Concurrent request threads, as in a gthread worker.')
+        parser.add_argument('--queries', type=int, default=3, help='Queries per simulated request.')
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        alias = options['database']
+        db_settings = connections.settings[alias]
+        configured = copy.deepcopy(db_settings)
+
+        modes = [
+            ('reconnect', {'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': False}, None),
+            ('persistent', {'CONN_MAX_AGE': configured.get('CONN_MAX_AGE') or 60, 'CONN_HEALTH_CHECKS': True}, None),
+        ]
+        if connections[alias].vendor == 'postgresql' and importlib.util.find_spec('psycopg_pool'):
+            pool = configured.get('OPTIONS', {}).get('pool')
+            if not isinstance(pool, dict):
+                pool = {'min_size': options['threads'], 'max_size': options['threads']}
+            modes.append(('pool', {'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': False}, pool))
+        else:
+            self.stdout.write('Skipping pool mode: needs PostgreSQL with psycopg[pool] installed.')
+
+        try:
+            for label, overrides, pool in modes:
+                self._configure(alias, configured, overrides, pool)
+                elapsed = self._run(alias, options)
+                self.stdout.write(
+                    f"{label:>10}: {options['requests'] / elapsed:10.1f} req/s "
+                    f"({elapsed * 1000 / options['requests']:.3f} ms/request)"
+                )
+        finally:
+            self._configure(alias, configured, {}, configured.get('OPTIONS', {}).get('pool'))
+
+    def _configure(self, alias, configured, overrides, pool):
+        connections.close_all()
+        if hasattr(connections[alias], 'close_pool'):
+            connections[alias].close_pool()
+        db_settings = connections.settings[alias]
+        db_settings.update(copy.deepcopy(configured), **overrides)
+        db_settings['OPTIONS'] = {k: v for k, v in configured.get('OPTIONS', {}).items() if k != 'pool'}
+        if pool:
+            db_settings['OPTIONS']['pool'] = pool
+
+    def _run(self, alias, options):
+        threads = max(options['threads'], 1)
+        per_thread = [options['requests'] // threads] * threads
+        per_thread[0] += options['requests'] % threads
+
+        def worker(count):
+            connection = connections[alias]
+            for _ in range(count):
+                request_started.send(sender=self.__class__)
+                with connection.cursor() as cursor:
+                    for _ in range(options['queries']):
+                        cursor.execute('SELECT 1')
+                        cursor.fetchone()
+                request_finished.send(sender=self.__class__)
+            connections.close_all()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(worker, per_thread))
+        return time.perf_counter() - started
@@ -0,0 +1,53 @@
+import io
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+from rest_framework.exceptions import AuthenticationFailed, NotFound, ValidationError
+
+from core.exceptions import custom_exception_handler, logger as handler_logger
+
+CASES = {
+    'validation_400': lambda: ValidationError({'email': ['Enter a valid email address.']}),
+    'expired_token_401': lambda: AuthenticationFailed('Token is invalid or expired'),
+    'not_found_404': lambda: NotFound(),
+    'server_error_500': lambda: RuntimeError('boom'),
+}
+
+
+def _legacy_handler(exc, context):
+    # The previous behaviour: a formatted traceback for every exception.
+    handler_logger.exception("Unhandled exception in API")
+    return custom_exception_handler(exc, context)
+
+
+class Command(BaseCommand):
+    help = 'Measures exception handler latency per error class, against logging a traceback for every error.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        # Log into memory so formatting costs are real but the console stays quiet.
+        sink = logging.StreamHandler(io.StringIO())
+        handler_logger.addHandler(sink)
+        propagate, handler_logger.propagate = handler_logger.propagate, False
+        try:
+            self.stdout.write(f"{'case':<20} {'current µs':>12} {'legacy µs':>12}")
+            for name, make_exc in CASES.items():
+                current = self._measure(custom_exception_handler, make_exc, options['iterations'])
+                legacy = self._measure(_legacy_handler, make_exc, options['iterations'])
+                self.stdout.write(f"{name:<20} {current:>12.1f} {legacy:>12.1f}")
+        finally:
+            handler_logger.removeHandler(sink)
+            handler_logger.propagate = propagate
+
+    def _measure(self, handler, make_exc, iterations):
+        context = {'view': None, 'request': None}
+        started = time.perf_counter()
+        for _ in range(iterations):
+            try:
+                raise make_exc()
+            except Exception as exc:
+                handler(exc, context)
+        return (time.perf_counter() - started) / iterations * 1e6
@@ -0,0 +1,65 @@
+import time
+import uuid
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+
+from core.renderers import CustomJSONRenderer, orjson
+
+
+def sample_rows(count):
+    """Application-list-like rows: mostly strings and ints, with the odd DRF-special value."""
+    now = timezone.now()
+    return [
+        {
+            'id': index,
+            'uuid': uuid.uuid4(),
+            'status': 'reviewing',
+            'cover_letter': 'I am excited to apply for this role. ' * 8,
+            'job': {'id': index % 50, 'title': 'Backend Developer Intern', 'company': 'Acme', 'salary': Decimal('1250.50')},
+            'applicant': {'id': index, 'email': f'student{index}@example.com', 'name': 'Student Name'},
+            'skills': ['python', 'django', 'postgresql', 'docker'],
+            'created_at': now.isoformat(),
+            'updated_at': now,
+            'label': gettext_lazy('Pending'),
+        }
+        for index in range(count)
+    ]
+
+
+class Command(BaseCommand):
+    help = 'Compares CustomJSONRenderer throughput with the stdlib and orjson encoders.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=500, help='Rows per rendered list response.')
+        parser.add_argument('--iterations', type=int, default=200)
+
+    def handle(self, *args, **options):
+        data = sample_rows(options['rows'])
+        backends = ['json'] + (['orjson'] if orjson is not None else [])
+        if orjson is None:
+            self.stdout.write('orjson is not installed; only the stdlib encoder is measured.')
+
+        rendered = {}
+        for backend in backends:
+            renderer = CustomJSONRenderer()
+            renderer.backend = backend
+            renderer.render(data)  # warm up
+
+            started = time.perf_counter()
+            for _ in range(options['iterations']):
+                body = renderer.render(data)
+            elapsed = time.perf_counter() - started
+
+            rendered[backend] = body
+            total_bytes = len(body) * options['iterations']
+            self.stdout.write(
+                f"{backend:>7}: {total_bytes / elapsed / 1e6:8.1f} MB/s, "
+                f"{options['iterations'] / elapsed:8.1f} responses/s ({len(body)} bytes each)"
+            )
+
+        if len(rendered) == 2:
+            same = rendered['json'] == rendered['orjson']
+            self.stdout.write(self.style.SUCCESS('Outputs identical.') if same else self.style.WARNING('Outputs differ.'))
@@ -0,0 +1,66 @@
+import time
+import uuid
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+
+from core.storage import LocalAssetStorage, PrivateAssetStorage, PublicAssetStorage
+
+
+class Command(BaseCommand):
+    help = 'Measures upload, download and URL-generation throughput of the configured asset storages.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=500)
+        parser.add_argument('--size', type=int, default=64 * 1024, help='Payload size in bytes.')
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        payload = b'x' * options['size']
+
+        for storage in (PublicAssetStorage(), PrivateAssetStorage()):
+            label = type(storage).__name__
+            names = []
+
+            started = time.perf_counter()
+            for _ in range(iterations):
+                names.append(storage.save(f"bench/{uuid.uuid4().hex}.bin", ContentFile(payload)))
+            self._report(label, 'upload', iterations, time.perf_counter() - started, options['size'])
+
+            started = time.perf_counter()
+            for name in names:
+                with storage.open(name) as fh:
+                    fh.read()
+            self._report(label, 'download', iterations, time.perf_counter() - started, options['size'])
+
+            started = time.perf_counter()
+            urls = [storage.url(name) for name in names]
+            self._report(label, 'url', iterations, time.perf_counter() - started)
+
+            if isinstance(storage, LocalAssetStorage):
+                self._bench_serve(label, urls)
+
+            for name in names:
+                storage.delete(name)
+
+    def _bench_serve(self, label, urls):
+        from core.views import serve_asset
+
+        factory = RequestFactory()
+        started = time.perf_counter()
+        for url in urls:
+            path = url.partition('?')[0]
+            request = factory.get(url)
+            response = serve_asset(request, path[len(settings.MEDIA_URL):])
+            if response.status_code != 200:
+                raise CommandError(f"{label}: {url} returned {response.status_code}")
+            b''.join(response.streaming_content)
+        self._report(label, 'signed serve', len(urls), time.perf_counter() - started)
+
+    def _report(self, label, operation, count, elapsed, size=None):
+        line = f"{label:<22} {operation:<13} {count / elapsed:>10.1f} ops/sec"
+        if size:
+            line += f" {count * size / elapsed / 1024 / 1024:>8.1f} MiB/sec"
+        self.stdout.write(line)
@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from core.hot_queries import HOT_QUERIES
+
+
+class Command(BaseCommand):
+    help = 'Runs EXPLAIN on the registered hot queries and flags plans that fall back to sequential scans.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('names', nargs='*', help='Only explain these registered queries.')
+        parser.add_argument('--analyze', action='store_true', help='Execute the queries (EXPLAIN ANALYZE, PostgreSQL only).')
+        parser.add_argument(
+            '--no-seqscan', action='store_true',
+            help='Discourage sequential scans (PostgreSQL only) to check an index is usable on small tables.',
+        )
+        parser.add_argument('--fail-on-seq-scan', action='store_true', help='Exit non-zero when any plan scans a table.')
+        parser.add_argument('--verbose-plan', action='store_true', help='Print the full plan for every query.')
+
+    def handle(self, *args, **options):
+        unknown = set(options['names']) - set(HOT_QUERIES)
+        if unknown:
+            raise CommandError(f"Unknown hot queries: {', '.join(sorted(unknown))}")
+        names = options['names'] or sorted(HOT_QUERIES)
+        postgres = connection.vendor == 'postgresql'
+
+        flagged = []
+        for name in names:
+            plan = self._explain(HOT_QUERIES[name](), postgres, options)
+            if self._is_seq_scan(plan, postgres):
+                flagged.append(name)
+                self.stdout.write(self.style.WARNING(f"{name}: sequential scan"))
+                self.stdout.write(plan)
+            else:
+                self.stdout.write(self.style.SUCCESS(f"{name}: index scan"))
+                if options['verbose_plan']:
+                    self.stdout.write(plan)
+
+        self.stdout.write(f"{len(names) - len(flagged)}/{len(names)} hot queries use an index.")
+        if flagged and options['fail_on_seq_scan']:
+            raise CommandError(f"Sequential scans in: {', '.join(flagged)}")
+
+    def _explain(self, queryset, postgres, options):
+        explain_options = {'analyze': True} if postgres and options['analyze'] else {}
+        with transaction.atomic():
+            if postgres and options['no_seqscan']:
+                with connection.cursor() as cursor:
+                    cursor.execute('SET LOCAL enable_seqscan = off')
+            return queryset.explain(**explain_options)
+
+    def _is_seq_scan(self, plan, postgres):
+        if postgres:
+            return 'Seq Scan' in plan
+        # SQLite reports "SCAN <table>" for full scans and "SEARCH ... USING INDEX" otherwise.
+        return any(
+            line.strip(' |`-').startswith('SCAN') and 'USING' not in line
+            for line in plan.splitlines()
+        )
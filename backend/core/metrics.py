@@ -0,0 +1,112 @@
+"""
+Prometheus metrics for the API, scraped from ``/metrics``.
+
+Under gunicorn every worker is a separate process, so the entrypoint points
+PROMETHEUS_MULTIPROC_DIR at a shared directory: each process writes its samples
+there and the scrape merges them. Without the variable (runserver, tests) the
+in-process default registry is used.
+"""
+import logging
+import os
+import time
+from contextlib import contextmanager
+
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, HistogramMetricFamily
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds', 'API request latency by resolved view and viewset action.',
+    ['method', 'view', 'action', 'status'], buckets=LATENCY_BUCKETS,
+)
+REQUEST_DB_QUERIES = Histogram(
+    'http_request_db_queries', 'Database queries executed per request.',
+    ['view', 'action'], buckets=QUERY_COUNT_BUCKETS,
+)
+REQUEST_DB_TIME = Histogram(
+    'http_request_db_duration_seconds', 'Time spent in database queries per request.',
+    ['view', 'action'], buckets=LATENCY_BUCKETS,
+)
+CACHE_LOOKUPS = Counter(
+    'cache_lookups_total', 'Cache reads by cache alias and result.',
+    ['cache', 'result'],
+)
+STORAGE_URL_SIGNING = Histogram(
+    'storage_url_duration_seconds', 'Time to build (and sign) a storage URL.',
+    ['storage'], buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5),
+)
+API_ERRORS = Counter(
+    'api_errors_total', 'Error responses from the API exception handler.',
+    ['status', 'code', 'view'],
+)
+BULK_MODERATION_OBJECTS = Counter(
+    'admin_bulk_moderation_objects_total', 'Objects changed by bulk moderation; rate() gives objects/sec.',
+    ['model', 'field'],
+)
+BULK_MODERATION_DURATION = Histogram(
+    'admin_bulk_moderation_duration_seconds', 'Time to apply and log one bulk moderation operation.',
+    ['model', 'field'], buckets=LATENCY_BUCKETS,
+)
+CELERY_ENQUEUE = Histogram(
+    'celery_enqueue_duration_seconds', 'Time to publish a Celery task to the broker.',
+    ['task'], buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1),
+)
+
+
+@contextmanager
+def observe(histogram, **labels):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.labels(**labels).observe(time.perf_counter() - started)
+
+
+class CeleryTaskCollector:
+    """
+    Exposes the fleet-wide Celery task metrics recorded by core.task_metrics
+    (already aggregated in Redis) at scrape time.
+    """
+
+    def collect(self):
+        from core.task_metrics import OUTCOMES, task_metrics
+
+        try:
+            snapshot = task_metrics.snapshot()
+        except Exception:
+            logger.warning("Could not read Celery task metrics", exc_info=True)
+            return
+        outcomes = CounterMetricFamily('celery_tasks', 'Celery task outcomes.', labels=['task', 'outcome'])
+        histograms = {
+            'runtime': HistogramMetricFamily(
+                'celery_task_runtime_seconds', 'Celery task runtime.', labels=['task']
+            ),
+            'wait': HistogramMetricFamily(
+                'celery_task_queue_wait_seconds', 'Time Celery tasks waited in the queue.', labels=['task']
+            ),
+        }
+        for task_name, entry in snapshot.items():
+            for outcome in OUTCOMES:
+                outcomes.add_metric([task_name, outcome], entry[outcome])
+            for metric, family in histograms.items():
+                buckets = [('+Inf' if bound == 'inf' else bound, count) for bound, count in entry[metric]['buckets'].items()]
+                family.add_metric([task_name], buckets, entry[metric]['sum'])
+        yield outcomes
+        yield from histograms.values()
+
+
+def render_latest():
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    tasks = CollectorRegistry()
+    tasks.register(CeleryTaskCollector())
+    return generate_latest(registry) + generate_latest(tasks)
@@ -0,0 +1,122 @@
+import math
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.db import connections
+
+from core.metrics import REQUEST_DB_QUERIES, REQUEST_DB_TIME, REQUEST_LATENCY
+from core.throttling import RATE_LIMIT_ATTR
+
+
+class QueryTimer:
+    """``execute_wrapper`` that counts queries and the time spent in them."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - started
+
+
+class RequestMetricsMiddleware:
+    """
+    Records latency, query count and query time per request, labelled by the
+    resolved URL name and, for viewsets, the action (``application-list``,
+    ``list``) so SLOs can target individual endpoints. Must be first in
+    MIDDLEWARE so the latency covers the whole stack.
+
+    Runs natively under ASGI too, so async views aren't pushed onto a thread.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        timer = QueryTimer()
+        started = time.perf_counter()
+        with self._timed_queries(timer):
+            response = self.get_response(request)
+        self._observe(request, response, time.perf_counter() - started, timer)
+        return response
+
+    async def __acall__(self, request):
+        timer = QueryTimer()
+        started = time.perf_counter()
+        # The ORM runs on the request's thread-sensitive worker thread, whose
+        # connections are the ones to wrap.
+        stack = await sync_to_async(self._timed_queries)(timer)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        self._observe(request, response, time.perf_counter() - started, timer)
+        return response
+
+    def _timed_queries(self, timer):
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(timer))
+        return stack
+
+    def _observe(self, request, response, elapsed, timer):
+        view, action = self._labels(request)
+        REQUEST_LATENCY.labels(
+            method=request.method, view=view, action=action, status=f'{response.status_code // 100}xx'
+        ).observe(elapsed)
+        REQUEST_DB_QUERIES.labels(view=view, action=action).observe(timer.count)
+        REQUEST_DB_TIME.labels(view=view, action=action).observe(timer.duration)
+
+    def _labels(self, request):
+        match = getattr(request, 'resolver_match', None)
+        if match is None:
+            return '<unresolved>', ''
+        # Viewset routes map HTTP methods to actions on the generated view function.
+        actions = getattr(match.func, 'actions', None) or {}
+        return match.url_name or match.route or match.view_name, actions.get(request.method.lower(), '')
+
+
+class RateLimitHeadersMiddleware:
+    """
+    Adds ``RateLimit-Limit``, ``RateLimit-Remaining`` and ``RateLimit-Reset``
+    (seconds) for the tightest throttle that checked the request; see
+    core.throttling.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return self._add_headers(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self._add_headers(request, await self.get_response(request))
+
+    def _add_headers(self, request, response):
+        rate_limit = getattr(request, RATE_LIMIT_ATTR, None)
+        if rate_limit is not None:
+            limit, remaining, reset = rate_limit
+            response['RateLimit-Limit'] = str(limit)
+            response['RateLimit-Remaining'] = str(remaining)
+            response['RateLimit-Reset'] = str(math.ceil(reset))
+        return response
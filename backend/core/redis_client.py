@@ -0,0 +1,17 @@
+from functools import lru_cache
+
+from django.conf import settings
+
+
+@lru_cache(maxsize=None)
+def get_redis_client():
+    """
+    Shared Redis connection for counters and other write-behind state.
+    Returns None when REDIS_URL is not configured so callers can fall back to the database.
+    """
+    if not settings.REDIS_URL:
+        return None
+
+    import redis
+
+    return redis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
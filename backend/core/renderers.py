@@ -1,4 +1,19 @@
+from django.conf import settings
 from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # Optional speedup; the stdlib encoder is used without it.
+    orjson = None
+
+ORJSON_OPTIONS = (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+# U+2028/U+2029 are valid JSON but break JavaScript string literals; DRF escapes them too.
+LINE_SEPARATORS = ((b'\xe2\x80\xa8', b'\\u2028'), (b'\xe2\x80\xa9', b'\\u2029'))
+
+_drf_default = JSONEncoder().default
+
 
 class CustomJSONRenderer(JSONRenderer):
     """
@@ -9,10 +24,36 @@ class CustomJSONRenderer(JSONRenderer):
         "data": ...,
         "error": { "code": ..., "details": {...} } or null
     }
+
+    Encoding uses orjson when it is installed and JSON_RENDERER_BACKEND is
+    "orjson" (the default). Values orjson doesn't handle the way DRF does
+    (datetimes, Decimals, lazy strings, querysets) are passed to DRF's own
+    encoder, so the output matches the stdlib path. Indented, ASCII-only or
+    non-compact rendering still goes through the stdlib encoder.
     """
+    backend = None  # Overrides settings.JSON_RENDERER_BACKEND, e.g. for benchmarks.
 
     def render(self, data, accepted_media_type=None, renderer_context=None):
         response = renderer_context.get('response') if renderer_context else None
+        return self.encode(self.standardize(data, response), accepted_media_type, renderer_context)
+
+    def encode(self, payload, accepted_media_type=None, renderer_context=None):
+        backend = self.backend or getattr(settings, 'JSON_RENDERER_BACKEND', 'orjson')
+        if (
+            backend != 'orjson' or orjson is None or payload is None
+            or self.ensure_ascii or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(payload, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(payload, default=_drf_default, option=ORJSON_OPTIONS)
+        for raw, escaped in LINE_SEPARATORS:
+            if raw in ret:
+                ret = ret.replace(raw, escaped)
+        return ret
+
+    def standardize(self, data, response):
+        """Wraps ``data`` in the response envelope; the payload itself is referenced, never copied."""
         status_code = getattr(response, 'status_code', 200)
 
         # Determine if the input 'data' is already in our fully standard format.
@@ -27,7 +68,7 @@ class CustomJSONRenderer(JSONRenderer):
         if is_fully_pre_standardized:
             # Data is already in the desired {status, message, data/error} structure.
             # Render it as is. Assumed to be correct, e.g. from custom_exception_handler or core.utils.ok/fail.
-            return super().render(data, accepted_media_type, renderer_context)
+            return data
 
         # If not fully pre-standardized, then 'data' is the raw payload (for success)
         # or a simpler error structure. We now build the standard structure around this 'data'.
@@ -88,4 +129,4 @@ class CustomJSONRenderer(JSONRenderer):
         if response and hasattr(response, 'status_code'):
              response.status_code = status_code
 
-        return super().render(standardized_response, accepted_media_type, renderer_context)
\ No newline at end of file
+        return standardized_response
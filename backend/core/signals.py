@@ -0,0 +1,83 @@
+import logging
+import time
+from datetime import datetime
+
+from celery import signals
+
+from core.metrics import CELERY_ENQUEUE
+from core.task_metrics import task_metrics
+
+logger = logging.getLogger('core.task_metrics')
+
+PUBLISHED_AT_HEADER = 'published_at'
+
+# task id -> monotonic start time, for tasks running in this worker process.
+_started = {}
+# task id -> perf_counter when publishing began, for tasks sent by this process.
+_publishing = {}
+
+
+def _queue_wait(request):
+    published_at = getattr(request, PUBLISHED_AT_HEADER, None) or (request.headers or {}).get(PUBLISHED_AT_HEADER)
+    if published_at is None:
+        return None
+    ready_at = float(published_at)
+    if request.eta:
+        # Scheduled tasks only start waiting once their ETA has passed.
+        eta = request.eta if isinstance(request.eta, datetime) else datetime.fromisoformat(request.eta)
+        ready_at = max(ready_at, eta.timestamp())
+    return max(time.time() - ready_at, 0.0)
+
+
+def _log(event, task, **fields):
+    request = task.request
+    queue = (request.delivery_info or {}).get('routing_key')
+    details = ' '.join(f'{key}={value}' for key, value in fields.items())
+    logger.info(
+        "celery.%s task=%s id=%s queue=%s retries=%s %s",
+        event, task.name, request.id, queue, request.retries, details,
+    )
+
+
+@signals.before_task_publish.connect
+def stamp_published_at(headers=None, **kwargs):
+    if headers is not None:
+        headers.setdefault(PUBLISHED_AT_HEADER, time.time())
+        _publishing[headers.get('id')] = time.perf_counter()
+
+
+@signals.after_task_publish.connect
+def record_enqueue_latency(sender=None, headers=None, **kwargs):
+    started = _publishing.pop((headers or {}).get('id'), None)
+    if started is not None:
+        CELERY_ENQUEUE.labels(task=sender).observe(time.perf_counter() - started)
+
+
+@signals.task_prerun.connect
+def task_started(task_id=None, task=None, **kwargs):
+    _started[task_id] = time.monotonic()
+    wait = _queue_wait(task.request)
+    task_metrics.record_run(task.name, wait=wait)
+    _log('started', task, wait_ms=f'{wait * 1000:.1f}' if wait is not None else '-')
+
+
+@signals.task_postrun.connect
+def task_finished(task_id=None, task=None, state=None, **kwargs):
+    started = _started.pop(task_id, None)
+    runtime = time.monotonic() - started if started is not None else None
+    task_metrics.record_run(task.name, runtime=runtime)
+    if state == 'SUCCESS':
+        task_metrics.record_outcome(task.name, 'succeeded')
+    _log('finished', task, state=state, runtime_ms=f'{runtime * 1000:.1f}' if runtime is not None else '-')
+
+
+@signals.task_retry.connect
+def task_retried(sender=None, reason=None, **kwargs):
+    task_metrics.record_outcome(sender.name, 'retried')
+    _log('retried', sender, reason=repr(str(reason)))
+
+
+@signals.task_failure.connect
+def task_failed(sender=None, exception=None, **kwargs):
+    task_metrics.record_outcome(sender.name, 'failed')
+    _log('failed', sender, exception=type(exception).__name__)
@@ -0,0 +1,80 @@
+import re
+import zlib
+
+TOKEN_RE = re.compile(r"[a-z0-9+#]{2,}")
+TOKEN_DIMENSIONS = 512
+
+
+def tokenize(*values):
+    """Lower-cased word tokens from strings and lists of strings (e.g. JSON requirements)."""
+    tokens = []
+    for value in values:
+        if not value:
+            continue
+        if isinstance(value, (list, tuple)):
+            tokens.extend(tokenize(*value))
+        else:
+            tokens.extend(TOKEN_RE.findall(str(value).lower()))
+    return tokens
+
+
+def build_feature_matrix(records, categorical_fields, token_field='tokens', weights=None):
+    """
+    Builds an L2-normalised feature matrix from ``records`` (dicts).
+
+    Each categorical field becomes a one-hot block; tokens are hashed into a
+    fixed-size bag-of-words block. Blocks are normalised separately and scaled
+    by ``weights[field]`` so no single block dominates the cosine score.
+    """
+    import numpy as np
+
+    weights = weights or {}
+    blocks = []
+
+    for field in categorical_fields:
+        vocabulary = {}
+        columns = [vocabulary.setdefault(str(record.get(field) or '').strip().lower(), len(vocabulary))
+                   for record in records]
+        block = np.zeros((len(records), len(vocabulary)), dtype=np.float32)
+        block[np.arange(len(records)), columns] = 1.0
+        blank = vocabulary.get('')
+        if blank is not None:
+            block[:, blank] = 0.0
+        blocks.append(block * weights.get(field, 1.0))
+
+    tokens = np.zeros((len(records), TOKEN_DIMENSIONS), dtype=np.float32)
+    for row, record in enumerate(records):
+        for token in record.get(token_field) or ():
+            tokens[row, zlib.crc32(token.encode()) % TOKEN_DIMENSIONS] += 1.0
+    np.log1p(tokens, out=tokens)
+    tokens /= np.maximum(np.linalg.norm(tokens, axis=1, keepdims=True), 1e-9)
+    blocks.append(tokens * weights.get(token_field, 1.0))
+
+    matrix = np.hstack(blocks) if blocks else np.zeros((len(records), 0), dtype=np.float32)
+    matrix /= np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-9)
+    return matrix
+
+
+def top_neighbours(matrix, limit, chunk_size=1024):
+    """
+    Yields ``(row, [(neighbour_row, score), ...])`` with the ``limit`` highest
+    cosine scores per row, excluding the row itself and zero scores. Rows are
+    scored in chunks so memory stays at ``chunk_size * len(matrix)`` floats.
+    """
+    import numpy as np
+
+    count = matrix.shape[0]
+    if count < 2 or limit < 1:
+        return
+    limit = min(limit, count - 1)
+
+    for start in range(0, count, chunk_size):
+        scores = matrix[start:start + chunk_size] @ matrix.T
+        rows = np.arange(scores.shape[0])
+        scores[rows, rows + start] = -np.inf
+        candidates = np.argpartition(-scores, limit - 1, axis=1)[:, :limit]
+        for offset, row_candidates in enumerate(candidates):
+            ordered = row_candidates[np.argsort(-scores[offset, row_candidates])]
+            yield start + offset, [
+                (int(column), float(scores[offset, column])) for column in ordered if scores[offset, column] > 0
+            ]
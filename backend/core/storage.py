@@ -1,11 +1,116 @@
-from storages.backends.s3boto3 import S3Boto3Storage
+import posixpath
+import time
+from urllib.parse import urlencode
 
-class PublicAssetStorage(S3Boto3Storage):
+from django.conf import settings
+from django.core import signing
+from django.core.files.storage import FileSystemStorage
+from django.utils._os import safe_join
+
+from core.metrics import STORAGE_URL_SIGNING, observe
+
+
+SIGNED_URL_SALT = "core.storage.signed-url"
+
+
+def sign_asset_key(key, expires):
+    """Signature for a local asset key valid until the ``expires`` unix timestamp."""
+    return signing.Signer(salt=SIGNED_URL_SALT).signature(f"{key}:{expires}")
+
+
+def verify_asset_signature(key, expires, signature):
+    try:
+        expires = int(expires)
+    except (TypeError, ValueError):
+        return False
+    if expires < time.time():
+        return False
+    return signing.constant_time_compare(sign_asset_key(key, expires), signature or "")
+
+
+class LocalAssetStorage(FileSystemStorage):
+    """
+    Filesystem stand-in for S3Boto3Storage used for tests and offline benchmarks.
+
+    Honours the same class attributes as the S3 backend: ``location`` is a key
+    prefix under MEDIA_ROOT, ``file_overwrite`` replaces existing keys instead of
+    picking a free name and ``querystring_auth`` appends an expiring signature
+    to generated URLs, checked by ``core.views.serve_asset``.
+
+    FileSystemStorage needs ``location`` to be the directory it writes under,
+    so a subclass's ``location`` is moved to ``key_prefix`` when the class is
+    created and ``location`` stays MEDIA_ROOT.
+    """
+    key_prefix = ""
+    file_overwrite = True
+    querystring_auth = True
+    querystring_expire = 3600
+
+    # key prefix -> querystring_auth, consulted by serve_asset for unsigned requests
+    signed_locations = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if isinstance(cls.__dict__.get("location"), str):
+            cls.key_prefix = cls.__dict__["location"]
+            delattr(cls, "location")
+        LocalAssetStorage.signed_locations[cls.key_prefix] = cls.querystring_auth
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault("base_url", settings.MEDIA_URL)
+        super().__init__(**kwargs)
+
+    def _key(self, name):
+        return posixpath.join(self.key_prefix, name) if self.key_prefix else name
+
+    def path(self, name):
+        return safe_join(self.location, self._key(name))
+
+    def _save(self, name, content):
+        # FileSystemStorage names the file relative to MEDIA_ROOT; like S3, the
+        # stored name leaves out the key prefix.
+        key = super()._save(name, content)
+        return posixpath.relpath(key, self.key_prefix) if self.key_prefix else key
+
+    def get_available_name(self, name, max_length=None):
+        if self.file_overwrite:
+            self.delete(name)
+            return name
+        return super().get_available_name(name, max_length=max_length)
+
+    def url(self, name, parameters=None, expire=None):
+        key = self._key(name)
+        url = super().url(key)
+        if not self.querystring_auth:
+            return url
+        expires = int(time.time()) + (expire or self.querystring_expire)
+        query = {"expires": expires, "signature": sign_asset_key(key, expires)}
+        if parameters:
+            query.update(parameters)
+        return f"{url}?{urlencode(query)}"
+
+
+if getattr(settings, "STORAGE_BACKEND", "s3") == "local":
+    AssetStorage = LocalAssetStorage
+else:
+    # Imported only for S3 so local/offline runs never load boto3.
+    from storages.backends.s3boto3 import S3Boto3Storage as AssetStorage
+
+
+class TimedUrlMixin:
+    """Times URL generation (presigning for private S3 keys) for /metrics."""
+
+    def url(self, name, *args, **kwargs):
+        with observe(STORAGE_URL_SIGNING, storage=type(self).__name__):
+            return super().url(name, *args, **kwargs)
+
+
+class PublicAssetStorage(TimedUrlMixin, AssetStorage):
     location = "public-assets"
     file_overwrite = False
     querystring_auth = False
 
 
-class PrivateAssetStorage(S3Boto3Storage):
+class PrivateAssetStorage(TimedUrlMixin, AssetStorage):
     location = "private-assets"
-    file_overwrite = False
\ No newline at end of file
+    file_overwrite = False
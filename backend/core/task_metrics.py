@@ -0,0 +1,139 @@
+import logging
+import math
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+
+from core.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+METRICS_KEY = 'celery:task-metrics'
+# Upper bounds in seconds, shared by the runtime and queue-wait histograms.
+HISTOGRAM_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300, math.inf)
+OUTCOMES = ('succeeded', 'failed', 'retried')
+
+
+def _bucket(seconds):
+    for bound in HISTOGRAM_BUCKETS:
+        if seconds <= bound:
+            return 'inf' if bound == math.inf else str(bound)
+
+
+class TaskMetricsService:
+    """
+    Per-task-name Celery metrics: outcome counts plus runtime and queue-wait
+    histograms.
+
+    Every worker process adds to one Redis hash (``HINCRBYFLOAT`` on
+    ``<task>|<metric>`` fields) so ``snapshot()`` sees the whole fleet. Without
+    Redis the numbers are kept per process, which is only useful in development.
+    Recording never raises: metrics must not fail a task.
+    """
+
+    def __init__(self):
+        self._local = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def record_outcome(self, task_name, outcome):
+        self._add(task_name, {outcome: 1})
+
+    def record_run(self, task_name, runtime=None, wait=None):
+        increments = {}
+        for metric, seconds in (('runtime', runtime), ('wait', wait)):
+            if seconds is None:
+                continue
+            increments[f'{metric}_count'] = 1
+            increments[f'{metric}_sum'] = seconds
+            increments[f'{metric}_bucket:{_bucket(seconds)}'] = 1
+        if increments:
+            self._add(task_name, increments)
+
+    def _add(self, task_name, increments):
+        client = get_redis_client()
+        if client is None:
+            with self._lock:
+                for metric, amount in increments.items():
+                    self._local[f'{task_name}|{metric}'] += amount
+            return
+        try:
+            pipe = client.pipeline(transaction=False)
+            for metric, amount in increments.items():
+                pipe.hincrbyfloat(METRICS_KEY, f'{task_name}|{metric}', amount)
+            pipe.execute()
+        except Exception:
+            logger.warning("Could not record Celery metrics for %s", task_name, exc_info=True)
+
+    def raw(self):
+        client = get_redis_client()
+        if client is None:
+            with self._lock:
+                return dict(self._local)
+        return {field: float(value) for field, value in client.hgetall(METRICS_KEY).items()}
+
+    def snapshot(self):
+        """
+        ``{task: {outcome: count, 'runtime': histogram, 'wait': histogram}}``
+        with cumulative (``le``) bucket counts, in seconds.
+        """
+        tasks = defaultdict(dict)
+        for field, value in self.raw().items():
+            task_name, metric = field.rsplit('|', 1)
+            tasks[task_name][metric] = value
+
+        snapshot = {}
+        for task_name, values in sorted(tasks.items()):
+            entry = {outcome: int(values.get(outcome, 0)) for outcome in OUTCOMES}
+            for metric in ('runtime', 'wait'):
+                count = int(values.get(f'{metric}_count', 0))
+                total = values.get(f'{metric}_sum', 0.0)
+                cumulative, buckets = 0, {}
+                for bound in HISTOGRAM_BUCKETS:
+                    label = 'inf' if bound == math.inf else str(bound)
+                    cumulative += int(values.get(f'{metric}_bucket:{label}', 0))
+                    buckets[label] = cumulative
+                entry[metric] = {
+                    'count': count,
+                    'sum': round(total, 6),
+                    'avg': round(total / count, 6) if count else None,
+                    'buckets': buckets,
+                }
+            snapshot[task_name] = entry
+        return snapshot
+
+    def reset(self):
+        client = get_redis_client()
+        if client is None:
+            with self._lock:
+                self._local.clear()
+            return
+        client.delete(METRICS_KEY)
+
+
+def configured_queues():
+    queues = {settings.CELERY_TASK_DEFAULT_QUEUE}
+    queues.update(route['queue'] for route in settings.CELERY_TASK_ROUTES.values() if 'queue' in route)
+    return sorted(queues)
+
+
+def queue_depths():
+    """Messages waiting in each configured queue, read from the broker."""
+    from kombu.exceptions import ChannelError
+
+    from config.celery import app
+
+    depths = {}
+    with app.connection_for_read() as connection:
+        channel = connection.default_channel
+        for queue in configured_queues():
+            try:
+                depths[queue] = channel.queue_declare(queue=queue, passive=True).message_count
+            except ChannelError:
+                # Not declared yet, so nothing was sent to it; AMQP closes the channel.
+                depths[queue] = 0
+                channel = connection.channel()
+    return depths
+
+
+task_metrics = TaskMetricsService()
@@ -1,3 +1,51 @@
-from django.test import TestCase
+import os
+import shutil
+import tempfile
+import unittest
 
-# Create your tests here.
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from core.storage import LocalAssetStorage, PublicAssetStorage
+from core.views import serve_asset
+from users.storage import AvatarStorage, ResumeStorage
+
+
+@unittest.skipUnless(issubclass(PublicAssetStorage, LocalAssetStorage), "needs STORAGE_BACKEND=local")
+class LocalAssetStorageTests(SimpleTestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.media_root = media_root
+
+    def _serve(self, url):
+        path = url.partition('?')[0]
+        response = serve_asset(RequestFactory().get(url), path[len(settings.MEDIA_URL):])
+        if response.status_code == 200:
+            return b''.join(response.streaming_content)
+        return response.status_code
+
+    def test_public_round_trip(self):
+        storage = AvatarStorage()
+        name = storage.save('avatars/me.png', ContentFile(b'avatar'))
+
+        self.assertEqual(name, 'avatars/me.png')
+        self.assertEqual(storage.location, os.path.abspath(self.media_root))
+        self.assertTrue(os.path.exists(os.path.join(self.media_root, 'media', 'avatars', 'me.png')))
+        self.assertEqual(storage.url(name), '/media/media/avatars/me.png')
+        self.assertEqual(self._serve(storage.url(name)), b'avatar')
+
+    def test_private_round_trip_needs_signature(self):
+        storage = ResumeStorage()
+        name = storage.save('1/cv.pdf', ContentFile(b'resume'))
+        url = storage.url(name)
+
+        self.assertEqual(name, '1/cv.pdf')
+        self.assertEqual(self._serve(url), b'resume')
+        self.assertEqual(self._serve(url.partition('?')[0]), 403)
+        with storage.open(name) as fh:
+            self.assertEqual(fh.read(), b'resume')
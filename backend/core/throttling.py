@@ -0,0 +1,127 @@
+"""
+Rate limiting shared by every API worker.
+
+The DRF throttles keep their request history in the Django cache with a
+read-modify-write, so concurrent workers overwrite each other's hits. These
+subclasses keep the history in a Redis sorted set per client and scope, and
+decide with one Lua script call: trim hits older than the window, count the
+rest, record the request if it fits. That is a single round trip, atomic
+across workers, and no database work. Without Redis they fall back to the
+stock cache-based behaviour.
+
+Views opt into a scope (see DEFAULT_THROTTLE_RATES) with ``throttle_scope``,
+or per viewset action with ``throttle_scopes = {'create': 'apply'}``. The
+most restrictive limit that applied to a request is reported in the
+``RateLimit-*`` headers by core.middleware.RateLimitHeadersMiddleware.
+"""
+import logging
+import math
+import secrets
+from functools import lru_cache
+
+from rest_framework.throttling import AnonRateThrottle, ScopedRateThrottle, SimpleRateThrottle, UserRateThrottle
+
+from core.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+# KEYS[1] history key; ARGV limit, window (ms), unique member for this hit.
+# Returns {allowed, remaining, ms until the oldest counted hit leaves the window}.
+SLIDING_WINDOW_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - window)
+local count = redis.call('ZCARD', KEYS[1])
+local allowed = 0
+if count < limit then
+    redis.call('ZADD', KEYS[1], now, ARGV[3])
+    redis.call('PEXPIRE', KEYS[1], window)
+    count = count + 1
+    allowed = 1
+end
+local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+local reset = window
+if oldest[2] then
+    reset = tonumber(oldest[2]) + window - now
+end
+return {allowed, limit - count, reset}
+"""
+
+RATE_LIMIT_ATTR = 'rate_limit'
+
+
+def record_rate_limit(request, limit, remaining, reset):
+    """Keeps the tightest limit seen for the request, for the response headers."""
+    http_request = getattr(request, '_request', request)
+    current = getattr(http_request, RATE_LIMIT_ATTR, None)
+    if current is None or remaining < current[1]:
+        setattr(http_request, RATE_LIMIT_ATTR, (limit, max(remaining, 0), max(reset, 0)))
+
+
+@lru_cache(maxsize=None)
+def _sliding_window_script(client):
+    return client.register_script(SLIDING_WINDOW_SCRIPT)
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        client = get_redis_client()
+        if client is None:
+            return self._allow_request_from_cache(request, view)
+        try:
+            allowed, remaining, reset_ms = _sliding_window_script(client)(
+                keys=[self.key], args=[self.num_requests, self.duration * 1000, secrets.token_hex(8)]
+            )
+        except Exception:
+            # Fail open: an unreachable Redis must not take the API down with it.
+            logger.warning("Rate limit check failed for %s", self.key, exc_info=True)
+            return True
+
+        self.reset = reset_ms / 1000
+        record_rate_limit(request, self.num_requests, remaining, self.reset)
+        return bool(allowed)
+
+    def _allow_request_from_cache(self, request, view):
+        allowed = SimpleRateThrottle.allow_request(self, request, view)
+        self.reset = self.history[-1] + self.duration - self.now if self.history else self.duration
+        record_rate_limit(request, self.num_requests, self.num_requests - len(self.history), self.reset)
+        return allowed
+
+    def wait(self):
+        return math.ceil(self.reset)
+
+
+class AnonSlidingWindowThrottle(SlidingWindowThrottle, AnonRateThrottle):
+    pass
+
+
+class UserSlidingWindowThrottle(SlidingWindowThrottle, UserRateThrottle):
+    pass
+
+
+class ScopedSlidingWindowThrottle(SlidingWindowThrottle, ScopedRateThrottle):
+    """
+    Scope from the view's ``throttle_scopes[action]`` or ``throttle_scope``,
+    keyed by user id when authenticated and by client IP otherwise. Views
+    without a scope are not limited by it.
+    """
+
+    def get_scope(self, view):
+        scopes = getattr(view, 'throttle_scopes', None) or {}
+        return scopes.get(getattr(view, 'action', None)) or getattr(view, self.scope_attr, None)
+
+    def allow_request(self, request, view):
+        self.scope = self.get_scope(view)
+        if not self.scope:
+            return True
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return SlidingWindowThrottle.allow_request(self, request, view)
@@ -0,0 +1,43 @@
+import posixpath
+
+from django.conf import settings
+from django.http import Http404, HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+from django.views.static import serve
+
+from core.storage import LocalAssetStorage, verify_asset_signature
+
+
+def serve_asset(request, path):
+    """
+    Serves files written by LocalAssetStorage, enforcing the simulated signed
+    URLs for locations configured with ``querystring_auth``.
+    """
+    path = posixpath.normpath(path).lstrip("/")
+    if path.startswith(".."):
+        raise Http404
+
+    prefix = path.split("/", 1)[0]
+    requires_signature = LocalAssetStorage.signed_locations.get(prefix, True)
+    if requires_signature and not verify_asset_signature(
+        path, request.GET.get("expires"), request.GET.get("signature")
+    ):
+        return HttpResponseForbidden("Invalid or expired signature.")
+
+    return serve(request, path, document_root=settings.MEDIA_ROOT)
+
+
+def metrics(request):
+    """
+    Prometheus scrape endpoint. When METRICS_TOKEN is set the scraper must send
+    it as a bearer token; otherwise access is left to the network (nginx does
+    not route /metrics).
+    """
+    from prometheus_client import CONTENT_TYPE_LATEST
+
+    from core.metrics import render_latest
+
+    token = settings.METRICS_TOKEN
+    if token and not constant_time_compare(request.headers.get("Authorization", ""), f"Bearer {token}"):
+        return HttpResponseForbidden("Invalid metrics token.")
+    return HttpResponse(render_latest(), content_type=CONTENT_TYPE_LATEST)
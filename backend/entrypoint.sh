@@ -2,12 +2,59 @@
 set -e
 mkdir -p /app/staticfiles /app/media
 
-echo "📦 Running Django migrations..."
-python manage.py makemigrations
-python manage.py migrate --noinput
+# Anything passed as a command (e.g. the Celery worker) runs as-is, without
+# the web server's setup steps.
+if [ "$#" -gt 0 ]; then
+  exec "$@"
+fi
 
-echo "🎨 Collecting static files..."
-python manage.py collectstatic --noinput
+# Fingerprint of the inputs for a setup step; the step is skipped when it
+# matches the stamp left by the previous successful run.
+fingerprint() {
+  sha256sum "$@" 2>/dev/null | sha256sum | cut -d' ' -f1
+}
+
+# RUN_MIGRATIONS: auto (default) runs them when models or migrations changed,
+# always forces them, never leaves them to a separate release step.
+MIGRATIONS_STAMP=/tmp/.migrations.sha
+migration_inputs() {
+  find /app -path /app/.venv -prune -o \( -name models.py -o -path '*/migrations/*.py' \) -print | sort
+}
+if [ "${RUN_MIGRATIONS:-auto}" != "never" ]; then
+  if [ "${RUN_MIGRATIONS:-auto}" = "always" ] \
+     || [ "$(fingerprint $(migration_inputs))" != "$(cat "$MIGRATIONS_STAMP" 2>/dev/null)" ]; then
+    echo "📦 Running Django migrations..."
+    python manage.py makemigrations
+    python manage.py migrate --noinput
+    fingerprint $(migration_inputs) > "$MIGRATIONS_STAMP"
+  else
+    echo "📦 Models unchanged, skipping migrations."
+  fi
+fi
+
+# Static files only come from installed packages, so the lockfile decides
+# whether the shared static volume is stale.
+STATIC_STAMP=/app/staticfiles/.collectstatic.sha
+if [ "$(fingerprint /app/uv.lock /app/pyproject.toml)" != "$(cat "$STATIC_STAMP" 2>/dev/null)" ]; then
+  echo "🎨 Collecting static files..."
+  python manage.py collectstatic --noinput
+  fingerprint /app/uv.lock /app/pyproject.toml > "$STATIC_STAMP"
+else
+  echo "🎨 Static files up to date, skipping collectstatic."
+fi
+
+# gunicorn workers write Prometheus samples here and /metrics merges them; the
+# directory is emptied so counters from a previous run don't leak in.
+export PROMETHEUS_MULTIPROC_DIR="${PROMETHEUS_MULTIPROC_DIR:-/tmp/prometheus}"
+rm -rf "$PROMETHEUS_MULTIPROC_DIR" && mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+
+# Workers, threads, preloading and recycling are configured in gunicorn.conf.py.
+# SERVER_MODE=asgi serves config.asgi with uvicorn workers so the async views
+# (resource downloads, token verify, dashboard stats) don't hold a worker.
+if [ "${SERVER_MODE:-wsgi}" = "asgi" ]; then
+  echo "🚀 Starting Gunicorn (ASGI, uvicorn workers)..."
+  exec gunicorn config.asgi:application --config gunicorn.conf.py
+fi
 
 echo "🚀 Starting Gunicorn..."
-exec gunicorn config.wsgi:application --bind 0.0.0.0:8000
+exec gunicorn config.wsgi:application --config gunicorn.conf.py
@@ -0,0 +1,83 @@
+"""
+Gunicorn settings for the API container, loaded by entrypoint.sh.
+
+Worker counts are sized from the CPUs the container may use and every value
+can be overridden with a GUNICORN_* environment variable. GUNICORN_WORKER_CLASS
+picks the worker type:
+
+* ``gthread`` (default): a few processes with a thread pool each, best for the
+  mostly I/O-bound WSGI views.
+* ``gevent``: green threads for very high connection counts. Needs gevent
+  installed and disables preloading, so the monkey-patching happens before the
+  app is imported.
+* SERVER_MODE=asgi always uses uvicorn workers.
+"""
+import os
+
+
+def _env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+def _env_bool(name, default):
+    value = os.environ.get(name)
+    return value.lower() in ('1', 'true', 'yes', 'on') if value else default
+
+
+def _available_cpus():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+cpus = _available_cpus()
+
+if os.environ.get('SERVER_MODE', 'wsgi') == 'asgi':
+    worker_class = 'uvicorn_worker.UvicornWorker'
+else:
+    worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+
+if worker_class == 'gthread':
+    workers = _env_int('GUNICORN_WORKERS', cpus + 1)
+    threads = _env_int('GUNICORN_THREADS', 4)
+elif worker_class == 'gevent':
+    workers = _env_int('GUNICORN_WORKERS', cpus)
+    worker_connections = _env_int('GUNICORN_WORKER_CONNECTIONS', 1000)
+elif worker_class == 'sync':
+    workers = _env_int('GUNICORN_WORKERS', cpus * 2 + 1)
+else:
+    workers = _env_int('GUNICORN_WORKERS', cpus)
+
+# Import Django once in the master so workers share its pages copy-on-write.
+# Database connections and the Redis client are opened lazily, so none are
+# inherited across the fork.
+preload_app = _env_bool('GUNICORN_PRELOAD', worker_class != 'gevent')
+
+# Recycle workers to bound slow memory growth; the jitter keeps them from all
+# restarting at once.
+max_requests = _env_int('GUNICORN_MAX_REQUESTS', 1000)
+max_requests_jitter = _env_int('GUNICORN_MAX_REQUESTS_JITTER', max(max_requests // 10, 1))
+
+timeout = _env_int('GUNICORN_TIMEOUT', 30)
+graceful_timeout = _env_int('GUNICORN_GRACEFUL_TIMEOUT', 30)
+keepalive = _env_int('GUNICORN_KEEPALIVE', 5)
+
+# Heartbeat files on tmpfs; Docker's overlay filesystem can stall worker heartbeats.
+worker_tmp_dir = os.environ.get('GUNICORN_WORKER_TMP_DIR', '/dev/shm' if os.path.isdir('/dev/shm') else None)
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG') or None
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+
+
+
+def child_exit(server, worker):
+    # Lets /metrics drop the live-gauge files of workers that have exited.
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
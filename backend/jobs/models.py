@@ -1,3 +1,20 @@
 from django.db import models
 
 # Create your models here.
+
+
+class JobSimilarity(models.Model):
+    """Precomputed nearest neighbours of a job, rebuilt by rebuild_job_similarity_index."""
+    job = models.ForeignKey('jobs.Job', on_delete=models.CASCADE, related_name='similarities')
+    similar = models.ForeignKey('jobs.Job', on_delete=models.CASCADE, related_name='+')
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+
+    class Meta:
+        ordering = ['job', 'rank']
+        constraints = [
+            models.UniqueConstraint(fields=['job', 'rank'], name='unique_job_similarity_rank'),
+        ]
+
+    def __str__(self):
+        return f"{self.job_id} ~ {self.similar_id} ({self.score:.3f})"
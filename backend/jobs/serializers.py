@@ -1,23 +1,33 @@
 from rest_framework import serializers
-from jobs.models import Job
+from django.db.models import Prefetch
+from jobs.models import Job, JobSimilarity
 from companies.models import Company
 from applications.models import Application
 from django.db.models import Count
 from users.serializers import UserSerializer
 
+SIMILAR_JOBS_LIMIT = 3
+
+# Use with prefetch_related() when serializing many jobs with JobSerializer.
+SIMILAR_JOBS_PREFETCH = Prefetch(
+    'similarities',
+    queryset=JobSimilarity.objects.filter(rank__lte=SIMILAR_JOBS_LIMIT).select_related('similar').order_by('rank'),
+)
+
 class JobSerializer(serializers.ModelSerializer):
     application_stats = serializers.SerializerMethodField(read_only=True)
     company_name = serializers.SerializerMethodField(read_only=True)
     created_by_name = serializers.SerializerMethodField(read_only=True)
     is_applied = serializers.SerializerMethodField(read_only=True)
     is_saved = serializers.SerializerMethodField(read_only=True)
+    similar_jobs = serializers.SerializerMethodField(read_only=True)
     logo = serializers.ImageField(required=False, allow_null=True)
     
     class Meta:
         model = Job
         fields = '__all__'
         read_only_fields = ['created_by', 'view_count', 'application_count', 'company_name', 
-                           'created_by_name', 'application_stats', 'is_applied', 'is_saved']
+                           'created_by_name', 'application_stats', 'is_applied', 'is_saved', 'similar_jobs']
     
     def get_application_stats(self, obj):
 
@@ -57,6 +67,30 @@ class JobSerializer(serializers.ModelSerializer):
                 return request.user.student_profile.saved_jobs.filter(pk=obj.pk).exists()
         return False
     
+    def get_similar_jobs(self, obj):
+        """
+        Read from SIMILAR_JOBS_PREFETCH. A single job is looked up on its own;
+        in a list without the prefetch the field is empty rather than costing
+        a query per job.
+        """
+        if 'similarities' in getattr(obj, '_prefetched_objects_cache', {}):
+            entries = obj.similarities.all()
+        elif self.parent is None:
+            entries = SIMILAR_JOBS_PREFETCH.queryset.filter(job=obj)
+        else:
+            return []
+        return [
+            {
+                'id': entry.similar.id,
+                'title': entry.similar.title,
+                'company': entry.similar.company,
+                'location': entry.similar.location,
+                'type': entry.similar.type,
+                'score': round(entry.score, 4),
+            }
+            for entry in entries
+        ]
+    
     def validate(self, data):
 
 
@@ -82,6 +116,13 @@ class JobSerializer(serializers.ModelSerializer):
         
         return super().create(validated_data)
 
+class NestedJobSerializer(JobSerializer):
+    """JobSerializer for jobs nested in other payloads; leaves out similar_jobs, which needs its own prefetch."""
+    similar_jobs = None
+
+    class Meta(JobSerializer.Meta):
+        read_only_fields = [field for field in JobSerializer.Meta.read_only_fields if field != 'similar_jobs']
+
 class JobListSerializer(serializers.ModelSerializer):
     company_name = serializers.SerializerMethodField(read_only=True)
     is_saved = serializers.SerializerMethodField(read_only=True)
@@ -96,6 +137,9 @@ class JobListSerializer(serializers.ModelSerializer):
         return obj.company
 
     def get_is_saved(self, obj):
+        saved_job_ids = self.context.get('saved_job_ids')
+        if saved_job_ids is not None:
+            return obj.pk in saved_job_ids
         request = self.context.get('request')
         if request and request.user.is_authenticated and request.user.role == 'student':
             if hasattr(request.user, 'student_profile') and request.user.student_profile:
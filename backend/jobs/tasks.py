@@ -0,0 +1,28 @@
+from celery import shared_task
+from django.conf import settings
+from django.db import transaction
+
+from core.similarity import build_feature_matrix, tokenize, top_neighbours
+from jobs.models import Job, JobSimilarity
+
+JOB_FEATURE_WEIGHTS = {'industry': 0.8, 'location': 0.5, 'type': 0.4, 'tokens': 1.0}
+
+
+@shared_task(name='rebuild_job_similarity_index_task', acks_late=True)
+def rebuild_job_similarity_index():
+    """Scores every active job against every other and stores the top neighbours per job."""
+    jobs = list(Job.objects.filter(is_active=True).values('id', 'industry', 'location', 'type', 'title', 'requirements'))
+    for job in jobs:
+        job['tokens'] = tokenize(job['title'], job['requirements'])
+
+    matrix = build_feature_matrix(jobs, ['industry', 'location', 'type'], weights=JOB_FEATURE_WEIGHTS)
+    entries = [
+        JobSimilarity(job_id=jobs[row]['id'], similar_id=jobs[column]['id'], rank=rank, score=score)
+        for row, neighbours in top_neighbours(matrix, settings.SIMILARITY_INDEX_NEIGHBOURS)
+        for rank, (column, score) in enumerate(neighbours, start=1)
+    ]
+
+    with transaction.atomic():
+        JobSimilarity.objects.all().delete()
+        JobSimilarity.objects.bulk_create(entries, batch_size=1000)
+    return f"Job similarity index rebuilt: {len(entries)} neighbours for {len(jobs)} jobs"
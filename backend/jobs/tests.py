@@ -1,3 +1,31 @@
 from django.test import TestCase
 
-# Create your tests here.
+from jobs.models import Job, JobSimilarity
+from jobs.serializers import SIMILAR_JOBS_PREFETCH, JobSerializer
+
+
+class SimilarJobsQueryCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        jobs = [Job.objects.create(title=f'Job {i}', company='Acme', location='Leeds', type='full-time') for i in range(5)]
+        for job in jobs:
+            others = [other for other in jobs if other != job]
+            for rank, similar in enumerate(others[:3], start=1):
+                JobSimilarity.objects.create(job=job, similar=similar, rank=rank, score=1 / rank)
+        cls.job = jobs[0]
+
+    def test_list_with_prefetch(self):
+        # jobs, similarities with their jobs
+        with self.assertNumQueries(2):
+            data = JobSerializer(Job.objects.prefetch_related(SIMILAR_JOBS_PREFETCH), many=True).data
+        self.assertEqual([len(item['similar_jobs']) for item in data], [3] * 5)
+
+    def test_list_without_prefetch_skips_similar_jobs(self):
+        with self.assertNumQueries(1):
+            data = JobSerializer(Job.objects.all(), many=True).data
+        self.assertEqual([item['similar_jobs'] for item in data], [[]] * 5)
+
+    def test_single_job(self):
+        with self.assertNumQueries(1):
+            data = JobSerializer(self.job).data
+        self.assertEqual([item['title'] for item in data['similar_jobs']], ['Job 1', 'Job 2', 'Job 3'])
@@ -0,0 +1,162 @@
+import hashlib
+import re
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+
+from resources.counters import COUNTER_FIELDS, resource_counters
+
+VERSION_KEY = 'resources:catalogue:version'
+
+
+class ResourceCatalogueCache:
+    """
+    Rendered-response cache for the resource catalogue.
+
+    Every Resource/ResourceFile write bumps a single version number (see
+    resources.signals), so cached list/detail/categories/types payloads are
+    never invalidated one by one; they simply stop being addressed. ETags are
+    derived from the cache key, so conditional requests can be answered with
+    a 304 from the version alone.
+
+    View and download counts change without a row save. Flushing them (and
+    unbuffered increments) bumps the version too, so a cached entry's row
+    counts stay current; the unflushed Redis deltas are the only part that
+    moves. List/detail payloads are therefore cached as their rendered bytes
+    split around the count values, with each resource's row counts. A hit
+    reads the deltas with one HMGET and joins the bytes back together with
+    the current counts: no query and no JSON decoding. Their ETags cover the
+    deltas as well.
+    """
+
+    def version(self):
+        version = cache.get(VERSION_KEY)
+        if version is None:
+            cache.add(VERSION_KEY, int(time.time()), timeout=None)
+            version = cache.get(VERSION_KEY)
+        return version
+
+    def bump(self):
+        try:
+            cache.incr(VERSION_KEY)
+        except ValueError:
+            cache.add(VERSION_KEY, int(time.time()), timeout=None)
+
+    def key(self, request, action, lookup=None):
+        audience = 'user' if request.user.is_authenticated else 'anon'
+        query = request.GET.urlencode()
+        raw = f"{self.version()}|{action}|{lookup or ''}|{audience}|{request.get_host()}|{query}"
+        return 'resources:catalogue:' + hashlib.md5(raw.encode()).hexdigest()
+
+    def etag(self, key, deltas=None):
+        if deltas is None:
+            return f'"{key.rsplit(":", 1)[-1]}"'
+        raw = key + '|' + ','.join(
+            f"{pk}:{':'.join(str(values[field]) for field in COUNTER_FIELDS)}" for pk, values in sorted(deltas.items())
+        )
+        return f'"{hashlib.md5(raw.encode()).hexdigest()}"'
+
+    def cached_response(self, request, key, counters=False):
+        if counters:
+            return self._cached_response_with_counts(request, key)
+        etag = self.etag(key)
+        if etag in request.headers.get('If-None-Match', ''):
+            response = HttpResponseNotModified()
+        else:
+            cached = cache.get(key)
+            if cached is None:
+                return None
+            content, content_type = cached
+            response = HttpResponse(content, content_type=content_type)
+        return self._decorate(response, etag)
+
+    def store(self, key, response, counters=False):
+        """Caches a rendered 200 response; ``counters`` marks list/detail payloads of resources."""
+        if not counters:
+            response.render()
+            cache.set(key, (response.content, response['Content-Type']), settings.RESOURCE_CATALOGUE_CACHE_TIMEOUT)
+            return self._decorate(response, self.etag(key))
+
+        items = self._counter_items(response.data)
+        counts = {str(item['id']): {field: item[field] for field in COUNTER_FIELDS} for item in items}
+        # The serializer added the unflushed deltas; the entry keeps the row counts.
+        deltas = resource_counters.pending(list(counts))
+        baseline = {
+            pk: {field: values[field] - deltas.get(pk, {}).get(field, 0) for field in COUNTER_FIELDS}
+            for pk, values in counts.items()
+        }
+        chunks, slots = self._render_template(response, items)
+        response.content = self._fill(chunks, slots, counts)
+        if response['Content-Type'].startswith('application/json'):
+            cache.set(
+                key, (chunks, slots, response['Content-Type'], baseline), settings.RESOURCE_CATALOGUE_CACHE_TIMEOUT
+            )
+        return self._decorate(response, self.etag(key, deltas))
+
+    def _cached_response_with_counts(self, request, key):
+        cached = cache.get(key)
+        if cached is None:
+            return None
+        chunks, slots, content_type, baseline = cached
+        deltas = resource_counters.pending(list(baseline))
+        etag = self.etag(key, deltas)
+        if etag in request.headers.get('If-None-Match', ''):
+            return self._decorate(HttpResponseNotModified(), etag)
+
+        counts = {
+            pk: {field: values[field] + deltas.get(pk, {}).get(field, 0) for field in COUNTER_FIELDS}
+            for pk, values in baseline.items()
+        }
+        return self._decorate(HttpResponse(self._fill(chunks, slots, counts), content_type=content_type), etag)
+
+    def _render_template(self, response, items):
+        """
+        Renders the response with a placeholder for every count and splits
+        the bytes around them: ``chunks`` interleave with ``slots``, the
+        ``(resource id, field)`` each placeholder stood for.
+        """
+        marker = f'counter-{uuid.uuid4().hex}-'
+        slots, originals = [], []
+        for item in items:
+            for field in COUNTER_FIELDS:
+                originals.append((item, field, item[field]))
+                item[field] = f'{marker}{len(slots)}'
+                slots.append((str(item['id']), field))
+        try:
+            response.render()
+        finally:
+            for item, field, value in originals:
+                item[field] = value
+        parts = re.split(rb'"' + marker.encode() + rb'(\d+)"', response.content)
+        # re.split puts the captured slot numbers at the odd positions.
+        return parts[::2], [slots[int(index)] for index in parts[1::2]]
+
+    @staticmethod
+    def _fill(chunks, slots, counts):
+        content = [chunks[0]]
+        for (pk, field), chunk in zip(slots, chunks[1:]):
+            content.append(str(counts[pk][field]).encode())
+            content.append(chunk)
+        return b''.join(content)
+
+    @staticmethod
+    def _counter_items(data):
+        """The resource dicts of a paginated list, a plain list or a detail payload."""
+        if isinstance(data, dict) and isinstance(data.get('results'), list):
+            return data['results']
+        if isinstance(data, list):
+            return data
+        return [data]
+
+    def _decorate(self, response, etag):
+        response['ETag'] = etag
+        response['Cache-Control'] = 'no-cache'
+        patch_vary_headers(response, ['Authorization'])
+        return response
+
+
+resource_catalogue = ResourceCatalogueCache()
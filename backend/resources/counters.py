@@ -0,0 +1,173 @@
+import logging
+import uuid
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django.utils import timezone
+
+from core.redis_client import get_redis_client
+from resources.models import Resource, ResourceCounterFlush
+
+logger = logging.getLogger(__name__)
+
+COUNTER_FIELDS = ('views', 'downloads')
+PENDING_KEY = 'resources:counters:pending'
+FLUSHING_KEY = 'resources:counters:flushing'
+FLUSH_BATCH_SIZE = 500
+# Field of the flushing hash that holds the batch's id; never clashes with "<id>:<field>".
+FLUSH_ID_FIELD = 'flush_id'
+FLUSH_LOCK_KEY = 'resources:counters:flush-lock'
+FLUSH_LOCK_TIMEOUT = 300
+# How long applied batch ids are remembered, i.e. how late a stranded batch can be retried safely.
+APPLIED_FLUSH_RETENTION = timedelta(days=7)
+
+
+class ResourceCounterService:
+    """
+    Write-behind view/download counters for resources.
+
+    Increments land in a Redis hash (``HINCRBY`` on ``<resource id>:<field>``)
+    and are folded into Resource.views/downloads by ``flush()``, which the
+    ``flush_resource_counters_task`` beat task runs periodically. Without Redis
+    every increment is applied to the row directly. Either way a change to
+    the rows bumps the resource catalogue version.
+    """
+
+    @property
+    def buffered(self):
+        return get_redis_client() is not None
+
+    def incr(self, resource_id, field, amount=1):
+        if field not in COUNTER_FIELDS:
+            raise ValueError(f"Unknown resource counter: {field}")
+
+        client = get_redis_client()
+        if client is None:
+            Resource.objects.filter(pk=resource_id).update(**{field: F(field) + amount})
+            _counts_changed()
+            return
+
+        client.hincrby(PENDING_KEY, f"{resource_id}:{field}", amount)
+
+    def pending(self, resource_ids):
+        """Unflushed deltas as ``{str(resource_id): {'views': n, 'downloads': m}}``."""
+        client = get_redis_client()
+        resource_ids = [str(pk) for pk in resource_ids]
+        if client is None or not resource_ids:
+            return {}
+
+        fields = [f"{pk}:{field}" for pk in resource_ids for field in COUNTER_FIELDS]
+        pipe = client.pipeline(transaction=False)
+        pipe.hmget(PENDING_KEY, fields)
+        pipe.hmget(FLUSHING_KEY, fields)
+        pipe.hget(FLUSHING_KEY, FLUSH_ID_FIELD)
+        pending_values, flushing_values, flush_id = pipe.execute()
+
+        # A batch that was applied but not yet removed from Redis is already in the rows.
+        if flush_id and any(flushing_values) and ResourceCounterFlush.objects.filter(flush_id=flush_id).exists():
+            flushing_values = [None] * len(fields)
+
+        deltas = {}
+        for field_key, pending_value, flushing_value in zip(fields, pending_values, flushing_values):
+            amount = int(pending_value or 0) + int(flushing_value or 0)
+            if amount:
+                pk, field = field_key.rsplit(':', 1)
+                deltas.setdefault(pk, dict.fromkeys(COUNTER_FIELDS, 0))[field] = amount
+        return deltas
+
+    def apply_pending(self, data, deltas=None):
+        """Adds unflushed deltas to a serialized resource dict in place."""
+        if deltas is None:
+            deltas = self.pending([data['id']])
+        resource_deltas = deltas.get(str(data['id']))
+        if resource_deltas:
+            for field in COUNTER_FIELDS:
+                if field in data:
+                    data[field] += resource_deltas[field]
+        return data
+
+    def flush(self):
+        """
+        Moves pending deltas aside as a batch stamped with a flush id and
+        applies them to the database in batches.
+
+        Runs under a Redis lock so overlapping runs don't both apply a batch.
+        The flush id is recorded in the same transaction as the row updates,
+        so a batch left in Redis by a flush that died after committing is
+        discarded by the next run instead of being applied again.
+        """
+        client = get_redis_client()
+        if client is None:
+            return 0
+
+        lock = client.lock(FLUSH_LOCK_KEY, timeout=FLUSH_LOCK_TIMEOUT, blocking=False)
+        if not lock.acquire():
+            logger.info("Resource counter flush already running, skipping")
+            return 0
+        try:
+            return self._flush(client, lock)
+        finally:
+            if lock.owned():
+                lock.release()
+
+    def _flush(self, client, lock):
+        if not client.exists(FLUSHING_KEY):
+            if not client.exists(PENDING_KEY):
+                return 0
+            pipe = client.pipeline()
+            pipe.rename(PENDING_KEY, FLUSHING_KEY)
+            pipe.hset(FLUSHING_KEY, FLUSH_ID_FIELD, uuid.uuid4().hex)
+            pipe.execute()
+
+        batch = client.hgetall(FLUSHING_KEY)
+        # Batches moved aside before flush ids existed get one now.
+        flush_id = batch.pop(FLUSH_ID_FIELD, None) or uuid.uuid4().hex
+        deltas = {}
+        for field_key, amount in batch.items():
+            pk, field = field_key.rsplit(':', 1)
+            if field in COUNTER_FIELDS and int(amount):
+                deltas.setdefault(pk, dict.fromkeys(COUNTER_FIELDS, 0))[field] = int(amount)
+
+        pks = list(deltas)
+        with transaction.atomic():
+            _, created = ResourceCounterFlush.objects.get_or_create(flush_id=flush_id)
+            if created:
+                self._apply(deltas, pks)
+            ResourceCounterFlush.objects.filter(flushed_at__lt=timezone.now() - APPLIED_FLUSH_RETENTION).delete()
+        if created:
+            # Right after the commit: older cached entries' row counts lack the batch,
+            # and pending() has stopped reporting it as a delta.
+            _counts_changed()
+
+        # Without the lock another run may have taken over; it discards the applied batch itself.
+        if lock.owned():
+            client.delete(FLUSHING_KEY)
+        if not created:
+            logger.warning("Discarded resource counter batch %s, it was already applied", flush_id)
+            return 0
+        logger.info("Flushed resource counters for %d resources", len(pks))
+        return len(pks)
+
+    def _apply(self, deltas, pks):
+        for start in range(0, len(pks), FLUSH_BATCH_SIZE):
+            batch = pks[start:start + FLUSH_BATCH_SIZE]
+            updates = {
+                field: F(field) + Case(
+                    *[When(pk=pk, then=Value(deltas[pk][field])) for pk in batch if deltas[pk][field]],
+                    default=Value(0),
+                    output_field=IntegerField(),
+                )
+                for field in COUNTER_FIELDS
+            }
+            Resource.objects.filter(pk__in=batch).update(**updates)
+
+
+def _counts_changed():
+    # queryset.update() sends no signals; the cached catalogue holds row counts.
+    from resources.cache import resource_catalogue
+
+    resource_catalogue.bump()
+
+
+resource_counters = ResourceCounterService()
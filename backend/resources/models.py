@@ -35,6 +35,10 @@ class Resource(models.Model):
 
     class Meta:
         ordering = ['-published_at']
+        indexes = [
+            models.Index(fields=['category', 'type', 'is_demo', '-published_at'], name='resource_catalogue_idx'),
+            models.Index(fields=['-published_at'], condition=models.Q(is_demo=True), name='resource_demo_published_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -52,3 +56,11 @@ class ResourceFile(models.Model):
 
     def __str__(self):
         return f"{self.title} - {self.resource.title}"
+
+class ResourceCounterFlush(models.Model):
+    """Marks a buffered counter batch as applied, so a retried flush can't apply it twice."""
+    flush_id = models.CharField(max_length=32, unique=True)
+    flushed_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return self.flush_id
@@ -1,4 +1,7 @@
+from django.db import models
+from django.db.models import Prefetch
 from rest_framework import serializers
+from resources.counters import resource_counters
 from resources.models import Resource, ResourceFile
 from users.serializers import UserSerializer
 
@@ -20,12 +23,23 @@ class ResourceFileSerializer(serializers.ModelSerializer):
             'title': {'required': False, 'allow_blank': True, 'allow_null': True}
         }
 
+    @staticmethod
+    def setup_eager_loading(queryset):
+        return queryset.select_related('uploaded_by')
+
     def get_file_url(self, obj):
         request = self.context.get('request')
         if request and obj.file:
             return request.build_absolute_uri(obj.file.url)
         return None
 
+class ResourceListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        items = list(data.all() if isinstance(data, models.Manager) else data)
+        self.child.context['pending_counters'] = resource_counters.pending([item.pk for item in items])
+        return super().to_representation(items)
+
+
 class ResourceSerializer(serializers.ModelSerializer):
     files = ResourceFileSerializer(many=True, read_only=True)
     author = UserSerializer(read_only=True)
@@ -49,4 +63,16 @@ class ResourceSerializer(serializers.ModelSerializer):
         read_only_fields = [
             'views', 'downloads', 'author', 'created_by', 'published_at', 'created_at', 'updated_at',
             'type_display', 'category_display', 'estimated_time_display'
-        ] 
\ No newline at end of file
+        ]
+        list_serializer_class = ResourceListSerializer
+
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """Loads everything the nested author/created_by/files representation touches."""
+        return queryset.select_related('author', 'created_by').prefetch_related(
+            Prefetch('files', queryset=ResourceFileSerializer.setup_eager_loading(ResourceFile.objects.all()))
+        )
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        return resource_counters.apply_pending(data, self.context.get('pending_counters')) 
\ No newline at end of file
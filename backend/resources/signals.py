@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from resources.cache import resource_catalogue
+from resources.models import Resource, ResourceFile
+
+
+@receiver([post_save, post_delete], sender=Resource)
+@receiver([post_save, post_delete], sender=ResourceFile)
+def invalidate_resource_catalogue(sender, **kwargs):
+    resource_catalogue.bump()
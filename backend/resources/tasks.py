@@ -0,0 +1,9 @@
+from celery import shared_task
+
+from resources.counters import resource_counters
+
+
+@shared_task(name='flush_resource_counters_task', ignore_result=True)
+def flush_resource_counters():
+    """Applies buffered view/download increments to Resource rows."""
+    return resource_counters.flush()
@@ -1,3 +1,233 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from resources import counters
+from resources.counters import FLUSHING_KEY, PENDING_KEY, resource_counters
+from resources.models import Resource, ResourceFile
+
+User = get_user_model()
+
+
+class InMemoryRedis:
+    """The slice of the redis-py client the counter service uses."""
+
+    def __init__(self):
+        self.data = {}
+        self.locks = set()
+
+    def exists(self, key):
+        return int(key in self.data)
+
+    def rename(self, src, dst):
+        self.data[dst] = self.data.pop(src)
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def hset(self, key, field, value):
+        self.data.setdefault(key, {})[field] = str(value)
+
+    def hincrby(self, key, field, amount):
+        hash_ = self.data.setdefault(key, {})
+        hash_[field] = str(int(hash_.get(field, 0)) + amount)
+
+    def hget(self, key, field):
+        return self.data.get(key, {}).get(field)
+
+    def hmget(self, key, fields):
+        return [self.hget(key, field) for field in fields]
+
+    def hgetall(self, key):
+        return dict(self.data.get(key, {}))
+
+    def pipeline(self, transaction=True):
+        return InMemoryPipeline(self)
+
+    def lock(self, name, timeout=None, blocking=True):
+        return InMemoryLock(self, name)
+
+
+class InMemoryPipeline:
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *args: self.calls.append((name, args))
+
+    def execute(self):
+        return [getattr(self.client, name)(*args) for name, args in self.calls]
+
+
+class InMemoryLock:
+    def __init__(self, client, name):
+        self.client = client
+        self.name = name
+        self.held = False
+
+    def acquire(self):
+        if self.name in self.client.locks:
+            return False
+        self.client.locks.add(self.name)
+        self.held = True
+        return True
+
+    def owned(self):
+        return self.held
+
+    def release(self):
+        self.client.locks.discard(self.name)
+        self.held = False
+
+
+class ResourceCounterFlushTests(TestCase):
+    def setUp(self):
+        self.redis = InMemoryRedis()
+        patcher = mock.patch.object(counters, 'get_redis_client', return_value=self.redis)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.resource = Resource.objects.create(
+            title='Interview guide', description='', type='Guide', estimated_time='5 min', category='Careers'
+        )
+
+    def _counts(self):
+        self.resource.refresh_from_db()
+        return self.resource.views, self.resource.downloads
+
+    def test_flush_applies_buffered_increments(self):
+        for _ in range(3):
+            resource_counters.incr(self.resource.pk, 'views')
+        resource_counters.incr(self.resource.pk, 'downloads', 2)
+
+        self.assertEqual(resource_counters.flush(), 1)
+        self.assertEqual(self._counts(), (3, 2))
+        self.assertFalse(self.redis.exists(PENDING_KEY) or self.redis.exists(FLUSHING_KEY))
+
+    def test_flush_killed_after_commit_is_not_applied_twice(self):
+        resource_counters.incr(self.resource.pk, 'views', 5)
+
+        with mock.patch.object(self.redis, 'delete', side_effect=ConnectionError), self.assertRaises(ConnectionError):
+            resource_counters.flush()
+        self.assertTrue(self.redis.exists(FLUSHING_KEY))
+        self.assertEqual(self._counts(), (5, 0))
+        # The stranded batch is already in the row, so it isn't counted again.
+        self.assertEqual(resource_counters.pending([self.resource.pk]), {})
+
+        resource_counters.incr(self.resource.pk, 'views')
+        self.assertEqual(resource_counters.flush(), 0)
+        self.assertFalse(self.redis.exists(FLUSHING_KEY))
+        self.assertEqual(resource_counters.flush(), 1)
+        self.assertEqual(self._counts(), (6, 0))
+
+    def test_overlapping_flush_is_skipped(self):
+        resource_counters.incr(self.resource.pk, 'views')
+        self.redis.locks.add(counters.FLUSH_LOCK_KEY)
+
+        self.assertEqual(resource_counters.flush(), 0)
+        self.assertEqual(self._counts(), (0, 0))
+        self.assertEqual(resource_counters.pending([self.resource.pk]), {str(self.resource.pk): {'views': 1, 'downloads': 0}})
+
+
+class ResourceQueryCountTests(TestCase):
+    """List and detail endpoints load a fixed number of queries however many resources and files there are."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('reader@example.com', 'x', name='Reader')
+        authors = [User.objects.create_user(f'author{i}@example.com', 'x', name=f'Author {i}', role='campus') for i in range(3)]
+        for i in range(6):
+            resource = Resource.objects.create(
+                title=f'Resource {i}', description='', type='Guide', estimated_time='5 min', category='Careers',
+                author=authors[i % 3], created_by=authors[(i + 1) % 3],
+            )
+            for j in range(4):
+                ResourceFile.objects.create(
+                    resource=resource, title=f'File {j}', file=f'resources/{i}-{j}.pdf',
+                    file_type='pdf', uploaded_by=authors[j % 3],
+                )
+        cls.resource = resource
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_resource_list(self):
+        # count, resources with author/created_by, files with uploaded_by
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('resource-list'))
+        self.assertEqual(len(response.data['results']), 6)
+        self.assertEqual(len(response.data['results'][0]['files']), 4)
+
+    def test_resource_retrieve(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('resource-detail', args=[self.resource.pk]))
+        self.assertEqual(len(response.data['files']), 4)
+
+    def test_resource_file_list(self):
+        # count, files with resource/uploaded_by
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('resourcefile-list'))
+        self.assertEqual(len(response.data['results']), 10)
+
+    def test_resource_file_retrieve(self):
+        resource_file = self.resource.files.first()
+        with self.assertNumQueries(1):
+            self.client.get(reverse('resourcefile-detail', args=[resource_file.pk]))
+
+
+class ResourceCatalogueCounterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.resource = Resource.objects.create(
+            title='CV clinic', description='', type='Workshop', estimated_time='1 h', category='Careers', is_demo=True
+        )
+
+    def test_cached_list_and_detail_serve_current_counts(self):
+        list_url = reverse('resource-list')
+        detail_url = reverse('resource-detail', args=[self.resource.pk])
+        first_list = self.client.get(list_url)
+        first_detail = self.client.get(detail_url)
+
+        resource_counters.incr(self.resource.pk, 'views', 3)
+        resource_counters.incr(self.resource.pk, 'downloads')
+
+        listed = self.client.get(list_url, HTTP_IF_NONE_MATCH=first_list['ETag'])
+        self.assertEqual(listed.status_code, 200)
+        self.assertNotEqual(listed['ETag'], first_list['ETag'])
+        self.assertEqual(listed.json()['data']['results'][0]['views'], 3)
+        detail = self.client.get(detail_url)
+        self.assertEqual(detail.json()['data']['downloads'], 1)
+        self.assertNotEqual(detail['ETag'], first_detail['ETag'])
+        self.assertEqual(self.client.get(detail_url, HTTP_IF_NONE_MATCH=detail['ETag']).status_code, 304)
+
+    def test_cache_hits_overlay_buffered_counts_without_queries(self):
+        redis = InMemoryRedis()
+        patcher = mock.patch.object(counters, 'get_redis_client', return_value=redis)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        list_url = reverse('resource-list')
+        first = self.client.get(list_url)
+
+        resource_counters.incr(self.resource.pk, 'views', 3)
+        with self.assertNumQueries(0):
+            listed = self.client.get(list_url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(listed.status_code, 200)
+        self.assertEqual(listed.json()['data']['results'][0]['views'], 3)
+        self.assertEqual(listed.json()['data']['results'][0]['title'], 'CV clinic')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(list_url, HTTP_IF_NONE_MATCH=listed['ETag']).status_code, 304)
 
-# Create your tests here.
+        resource_counters.flush()
+        self.assertEqual(Resource.objects.get().views, 3)
+        refreshed = self.client.get(list_url)
+        self.assertEqual(refreshed.json()['data']['results'][0]['views'], 3)
+        resource_counters.incr(self.resource.pk, 'views')
+        self.assertEqual(self.client.get(list_url).json()['data']['results'][0]['views'], 4)
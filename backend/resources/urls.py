@@ -1,11 +1,12 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from resources.views import ResourceViewSet, ResourceFileViewSet
+from resources.views import ResourceViewSet, ResourceFileViewSet, ResourceFileDownloadView
 
 router = DefaultRouter()
 router.register(r'resources', ResourceViewSet)
 router.register(r'resource-files', ResourceFileViewSet)
 
 urlpatterns = [
+    path('resource-files/<uuid:pk>/download/', ResourceFileDownloadView.as_view(), name='resourcefile-download'),
     path('', include(router.urls)),
 ] 
\ No newline at end of file
@@ -1,11 +1,16 @@
+from adrf.views import APIView as AsyncAPIView
+from asgiref.sync import sync_to_async
 from django.shortcuts import render
 from rest_framework import viewsets, status, filters, serializers
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from django_filters.rest_framework import DjangoFilterBackend
 from django.db.models import Q, F
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiTypes
+from resources.cache import resource_catalogue
+from resources.counters import resource_counters
 from resources.models import Resource, ResourceFile
 from resources.serializers import ResourceSerializer, ResourceFileSerializer
 from resources.permissions import ResourcePermissions
@@ -13,7 +18,7 @@ from rest_framework.parsers import MultiPartParser, FormParser
 
 @extend_schema(tags=['resources'])
 class ResourceViewSet(viewsets.ModelViewSet):
-    queryset = Resource.objects.all().prefetch_related('files')
+    queryset = Resource.objects.all()
     serializer_class = ResourceSerializer
     permission_classes = [ResourcePermissions]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -27,15 +32,52 @@ class ResourceViewSet(viewsets.ModelViewSet):
     ordering_fields = ['published_at', 'views', 'downloads', 'title', 'category', 'type', 'estimated_time']
     ordering = ['-published_at']
 
+    catalogue_actions = ('list', 'retrieve', 'categories', 'types')
+    # Catalogue actions whose payloads carry view/download counts.
+    counter_actions = ('list', 'retrieve')
+    eager_loading_actions = ('list', 'retrieve', 'create', 'update', 'partial_update', 'view')
+
     def get_queryset(self):
         queryset = super().get_queryset()
         user = self.request.user
 
         if not user.is_authenticated:
             queryset = queryset.filter(is_demo=True)
+
+        if self.action in self.eager_loading_actions:
+            queryset = ResourceSerializer.setup_eager_loading(queryset)
         
         return queryset
 
+    def _cached_catalogue_response(self, request):
+        if self.action not in self.catalogue_actions:
+            return None
+        self._catalogue_key = resource_catalogue.key(request, self.action, self.kwargs.get(self.lookup_field))
+        return resource_catalogue.cached_response(
+            request, self._catalogue_key, counters=self.action in self.counter_actions
+        )
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        catalogue_key = getattr(self, '_catalogue_key', None)
+        if catalogue_key and isinstance(response, Response) and response.status_code == status.HTTP_200_OK:
+            response = resource_catalogue.store(
+                catalogue_key, response, counters=self.action in self.counter_actions
+            )
+        return response
+
+    def list(self, request, *args, **kwargs):
+        cached = self._cached_catalogue_response(request)
+        if cached is not None:
+            return cached
+        return super().list(request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        cached = self._cached_catalogue_response(request)
+        if cached is not None:
+            return cached
+        return super().retrieve(request, *args, **kwargs)
+
     def perform_create(self, serializer):
         serializer.save(author=self.request.user, created_by=self.request.user)
 
@@ -44,14 +86,17 @@ class ResourceViewSet(viewsets.ModelViewSet):
 
     @extend_schema(
         summary="Increment view count for a resource",
+        description="Buffers the view in the counter service; the total includes increments not yet flushed to the database.",
         request=None,
         responses={200: ResourceSerializer}
     )
     @action(detail=True, methods=['post'])
     def view(self, request, pk=None):
         resource = self.get_object()
-        Resource.objects.filter(pk=pk).update(views=F('views') + 1)
-        resource.refresh_from_db()
+        resource_counters.incr(resource.pk, 'views')
+        if not resource_counters.buffered:
+            # Written straight to the row; no need to reload it for one field.
+            resource.views += 1
         serializer = self.get_serializer(resource)
         return Response(serializer.data)
 
@@ -62,6 +107,9 @@ class ResourceViewSet(viewsets.ModelViewSet):
     )
     @action(detail=False, methods=['get'])
     def categories(self, request):
+        cached = self._cached_catalogue_response(request)
+        if cached is not None:
+            return cached
         queryset = self.filter_queryset(self.get_queryset())
         categories = queryset.values_list('category', flat=True).distinct().order_by('category')
         return Response(list(categories))
@@ -73,6 +121,9 @@ class ResourceViewSet(viewsets.ModelViewSet):
     )
     @action(detail=False, methods=['get'])
     def types(self, request):
+        cached = self._cached_catalogue_response(request)
+        if cached is not None:
+            return cached
         queryset = self.filter_queryset(self.get_queryset())
         types = queryset.values_list('type', flat=True).distinct().order_by('type')
         return Response(list(types))
@@ -94,13 +145,13 @@ class ResourceFileViewSet(viewsets.ModelViewSet):
     ordering = ['-created_at']
 
     def get_queryset(self):
-        queryset = super().get_queryset()
+        queryset = super().get_queryset().select_related('resource')
         user = self.request.user
 
         if not user.is_authenticated:
             queryset = queryset.filter(resource__is_demo=True)
-        
-        return queryset
+
+        return ResourceFileSerializer.setup_eager_loading(queryset)
 
     def perform_create(self, serializer):
         resource_id = self.request.data.get('resource')
@@ -118,29 +169,41 @@ class ResourceFileViewSet(viewsets.ModelViewSet):
 
         serializer.save(uploaded_by=self.request.user)
 
-    @extend_schema(
-        summary="Download a resource file",
-        description="Retrieves a resource file and increments the parent resource's download count.",
-        responses={
-            200: {'description': 'File download initiated', 'content': {'application/*': {'schema': {'type': 'string', 'format': 'binary'}}}},
-            404: {'description': 'File not found.'}
-        }
-    )
-    @action(detail=True, methods=['get'])
-    def download(self, request, pk=None):
-        instance = self.get_object()
 
-        if not instance.resource.is_demo and not request.user.is_authenticated:
-            self.permission_denied(request, message='Authentication required to download this file.')
+@extend_schema(
+    tags=['resources'],
+    summary="Download a resource file",
+    description="Retrieves a resource file and increments the parent resource's download count.",
+    responses={
+        200: {'description': 'File download initiated', 'content': {'application/*': {'schema': {'type': 'string', 'format': 'binary'}}}},
+        404: {'description': 'File not found.'}
+    }
+)
+class ResourceFileDownloadView(AsyncAPIView):
+    """
+    Async ``resource-files/<pk>/download/``: the lookup is awaited on the async
+    ORM while the counter bump and storage URL signing run off the event loop,
+    so a worker keeps serving other requests while they wait on Redis or S3.
+    """
+    permission_classes = [AllowAny]
+    throttle_scope = 'resource_download'
+
+    async def get(self, request, pk):
+        queryset = ResourceFile.objects.select_related('resource')
+        if not request.user.is_authenticated:
+            queryset = queryset.filter(resource__is_demo=True)
+        try:
+            instance = await queryset.aget(pk=pk)
+        except ResourceFile.DoesNotExist:
+            raise NotFound()
 
-        Resource.objects.filter(pk=instance.resource.pk).update(downloads=F('downloads') + 1)
-        
-        if instance.file:
-            file_url = request.build_absolute_uri(instance.file.url)
-            return Response({
-                'message': 'File download ready.',
-                'file_url': file_url,
-                'open_in_new_tab': instance.open_in_new_tab
-            }, status=status.HTTP_200_OK)
-        else:
+        await sync_to_async(resource_counters.incr)(instance.resource_id, 'downloads')
+
+        if not instance.file:
             return Response({'error': 'File not found.'}, status=status.HTTP_404_NOT_FOUND)
+        file_url = await sync_to_async(lambda: instance.file.url)()
+        return Response({
+            'message': 'File download ready.',
+            'file_url': request.build_absolute_uri(file_url),
+            'open_in_new_tab': instance.open_in_new_tab
+        }, status=status.HTTP_200_OK)
@@ -0,0 +1,87 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+# Version numbers only need to outlive the payloads keyed by them.
+VERSION_TIMEOUT = 24 * 60 * 60
+
+
+class ProfileCache:
+    """
+    Serialized ``/api/user/profile/me`` payloads, cached per user for
+    PROFILE_CACHE_TIMEOUT seconds, and public profile payloads, cached for
+    PUBLIC_PROFILE_CACHE_TIMEOUT seconds (0 disables either cache).
+
+    Each user has a version number that every write to their user row,
+    profile or nested collections bumps (see users.signals; the bulk nested
+    sync sends no signals, but it always saves the profile row too). Cached
+    payloads are keyed by it, so they are never deleted one by one; they
+    simply stop being addressed. The version also makes the public
+    profile's ETag. Version numbers expire after VERSION_TIMEOUT; a new
+    one starts from the current time, so it never matches an old ETag.
+    """
+
+    def _version_key(self, user_id):
+        return f'users:profile:{user_id}:version'
+
+    def version(self, user_id):
+        key = self._version_key(user_id)
+        version = cache.get(key)
+        if version is None:
+            cache.add(key, int(time.time()), VERSION_TIMEOUT)
+            version = cache.get(key)
+        return version
+
+    def peek_version(self, user_id):
+        """The current version, without starting one for a user that has none."""
+        return cache.get(self._version_key(user_id))
+
+    def bump(self, user_id):
+        key = self._version_key(user_id)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, int(time.time()), VERSION_TIMEOUT)
+
+    def bump_many(self, user_ids):
+        """For writes that send no signals, e.g. queryset.update()."""
+        for user_id in user_ids:
+            self.bump(user_id)
+
+    def me_key(self, request):
+        # Avatar URLs may be built from the request host.
+        return f'users:profile:me:{request.user.id}:{self.version(request.user.id)}:{request.get_host()}'
+
+    def get_me(self, request):
+        if not settings.PROFILE_CACHE_TIMEOUT:
+            return None
+        return cache.get(self.me_key(request))
+
+    def set_me(self, request, data):
+        if settings.PROFILE_CACHE_TIMEOUT:
+            cache.set(self.me_key(request), data, settings.PROFILE_CACHE_TIMEOUT)
+
+    def public_key(self, request, user_id, version):
+        return f'users:profile:public:{user_id}:{version}:{request.get_host()}'
+
+    def public_etag(self, user_id, version):
+        return f'"profile-{user_id}-{version}"'
+
+    def get_public(self, request, user_id, version):
+        if not settings.PUBLIC_PROFILE_CACHE_TIMEOUT:
+            return None
+        return cache.get(self.public_key(request, user_id, version))
+
+    def set_public(self, request, user_id, version, data):
+        if settings.PUBLIC_PROFILE_CACHE_TIMEOUT:
+            cache.set(self.public_key(request, user_id, version), data, settings.PUBLIC_PROFILE_CACHE_TIMEOUT)
+
+    def decorate_public(self, response, etag):
+        # The payload is the same for every viewer, so shared caches (CDNs) may store it.
+        response['ETag'] = etag
+        response['Cache-Control'] = f'public, max-age={settings.PUBLIC_PROFILE_CACHE_TIMEOUT}'
+        return response
+
+
+profile_cache = ProfileCache()
@@ -1,12 +1,13 @@
 from django.db import models
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.db.models.functions import TruncDate
 
 from core.storage import PublicAssetStorage
 from users.managers import CustomUserManager
 from users.storage import AvatarStorage, ResumeStorage
-import boto3
 from django.conf import settings
-from botocore.exceptions import NoCredentialsError, ClientError
 
 class CustomUser(AbstractUser):
     objects = CustomUserManager()
@@ -20,6 +21,11 @@ class CustomUser(AbstractUser):
 
     class Meta:
         app_label = 'users'
+        indexes = [
+            models.Index(fields=['role', 'is_active'], name='user_role_active_idx'),
+            models.Index(fields=['is_active'], name='user_active_idx'),
+            models.Index(TruncDate('date_joined'), name='user_date_joined_day_idx'),
+        ]
 
     username = None
     email = models.EmailField(unique=True)
@@ -66,6 +72,8 @@ class Resume(models.Model):
     file = models.FileField(storage=ResumeStorage(), upload_to=upload_to_student_directory)
     name = models.CharField(max_length=255, blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    text_content = models.TextField(blank=True, default="", editable=False, help_text="Normalized text extracted from the file")
+    text_extracted_at = models.DateTimeField(blank=True, null=True, editable=False)
 
     def __str__(self):
         return f"Resume: {self.name or self.file.name} for {self.student.user.email}"
@@ -76,6 +84,30 @@ class Resume(models.Model):
         super().save(*args, **kwargs)
 
 
+class ResumeSearchDocument(models.Model):
+    """
+    Full-text index of Resume.text_content. Postgres only; other databases fall back to icontains.
+
+    The table doesn't exist elsewhere, so Resume deletes mustn't cascade into
+    it through the ORM: there is no FK constraint and users.signals deletes a
+    resume's document on Postgres.
+    """
+    resume = models.OneToOneField(
+        Resume, on_delete=models.DO_NOTHING, db_constraint=False, primary_key=True, related_name="search_document"
+    )
+    search_vector = SearchVectorField(null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        required_db_vendor = 'postgresql'
+        indexes = [
+            GinIndex(fields=['search_vector'], name='resume_search_vector_gin'),
+        ]
+
+    def __str__(self):
+        return f"Search document for resume {self.resume_id}"
+
+
 
 
 class Education(models.Model):
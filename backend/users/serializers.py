@@ -1,4 +1,5 @@
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from rest_framework import serializers
 from rest_framework_simplejwt.serializers import (
     TokenObtainPairSerializer,
@@ -23,6 +24,7 @@ from users.models import (
     Resume, UserSettings, CompanySettings
 )
 from companies.models import Company
+from admin_api.cache import system_settings
 
 User = get_user_model()
 
@@ -120,7 +122,34 @@ class DateTrimMixin:
             ret['end_date'] = ret['end_date'][:7]
         return ret
 
+class NestedItemIdField(serializers.Field):
+    """
+    Writable id for nested profile items, so StudentProfileSerializer can match
+    payload items to existing rows. Clients send temporary ids such as
+    ``new_1700000000`` for rows they have just added; anything that isn't an
+    integer becomes ``None`` and the item is created.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('required', False)
+        kwargs.setdefault('allow_null', True)
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        if isinstance(data, bool):
+            return None
+        if isinstance(data, int):
+            return data
+        if isinstance(data, str) and data.isdigit():
+            return int(data)
+        return None
+
+    def to_representation(self, value):
+        return value
+
+
 class EducationSerializer(DateTrimMixin, serializers.ModelSerializer):
+    id = NestedItemIdField()
     start_date = serializers.DateField(
         input_formats=['%Y-%m', '%Y-%m-%d'],
         required=True
@@ -138,6 +167,7 @@ class EducationSerializer(DateTrimMixin, serializers.ModelSerializer):
 
 
 class ExperienceSerializer(DateTrimMixin, serializers.ModelSerializer):
+    id = NestedItemIdField()
     start_date = serializers.DateField(
         input_formats=['%Y-%m', '%Y-%m-%d'],
         required=True
@@ -216,6 +246,14 @@ class BaseProfileSerializer(serializers.ModelSerializer):
             del data['user']['avatar']
         return data
 
+
+RESUME_CONTENT_TYPES = {
+    'pdf': 'application/pdf',
+    'doc': 'application/msword',
+    'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+}
+
+
 class ResumeSerializer(serializers.ModelSerializer):
     url = serializers.SerializerMethodField()
 
@@ -235,17 +273,17 @@ class ResumeSerializer(serializers.ModelSerializer):
     def validate_file(self, value):
         if not value:
             raise serializers.ValidationError("No file was submitted.")
-        if value.size > 5 * 1024 * 1024:
-            raise serializers.ValidationError("File size must be less than 5MB")
-        valid_types = [
-            'application/pdf',
-            'application/msword',
-            'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
-        ]
+        site_settings = system_settings.get()
+        if value.size > site_settings.maxFileSizeInMb * 1024 * 1024:
+            raise serializers.ValidationError(f"File size must be less than {site_settings.maxFileSizeInMb}MB")
+        # Resume formats the site allows; an empty allowedFileTypes allows them all.
+        allowed_extensions = {ext.lower().lstrip('.') for ext in site_settings.allowedFileTypes or RESUME_CONTENT_TYPES}
+        valid_types = [content_type for ext, content_type in RESUME_CONTENT_TYPES.items() if ext in allowed_extensions]
+        if not valid_types:
+            raise serializers.ValidationError("Resume uploads are not allowed by the site settings.")
         if value.content_type not in valid_types:
-            raise serializers.ValidationError(
-                "File type not supported. Please upload a PDF, DOC, or DOCX file."
-            )
+            names = ", ".join(ext.upper() for ext in RESUME_CONTENT_TYPES if ext in allowed_extensions)
+            raise serializers.ValidationError(f"File type not supported. Please upload a {names} file.")
 
         return value
 
@@ -315,6 +353,14 @@ class StudentProfileSerializer(BaseProfileSerializer):
         read_only_fields = ["id", "email", "role", "created_at", "last_login", "is_active"]
 
     def _get_completeness_info(self, obj: StudentProfile):
+        # Both completeness fields need the same checks; run them once per profile.
+        if not hasattr(self, '_completeness_memo'):
+            self._completeness_memo = {}
+        if obj.pk not in self._completeness_memo:
+            self._completeness_memo[obj.pk] = self._compute_completeness_info(obj)
+        return self._completeness_memo[obj.pk]
+
+    def _compute_completeness_info(self, obj: StudentProfile):
         user = obj.user
         filled_fields_count = 0
         missing_field_keys = []
@@ -346,69 +392,58 @@ class StudentProfileSerializer(BaseProfileSerializer):
         education_data = validated_data.pop("education", None)
         experience_data = validated_data.pop("experience", None)
 
-        instance = self._update_profile_fields(instance, validated_data)
-
-        if education_data is not None:
-            existing_items_qs = instance.education.all()
-            existing_item_ids = set(existing_items_qs.values_list('id', flat=True))
-            payload_item_ids = set()
-
-            for item_payload in education_data:
-                item_id = item_payload.get('id')
-                if item_id:
-                    payload_item_ids.add(item_id)
-                    try:
-                        item_instance = existing_items_qs.get(id=item_id, student=instance)
-                        for attr, value in item_payload.items():
-                            if attr == 'id': continue
-                            setattr(item_instance, attr, value)
-                        item_instance.full_clean()
-                        item_instance.save()
-                    except Education.DoesNotExist:
-
-
-
-
-
-
-
-                        Education.objects.create(student=instance, **item_payload)
-                else:
-                    new_item = Education.objects.create(student=instance, **item_payload)
-                    payload_item_ids.add(new_item.id)
-
-            ids_to_delete = existing_item_ids - payload_item_ids
-            if ids_to_delete:
-                instance.education.filter(id__in=ids_to_delete).delete()
-
-        if experience_data is not None:
-            existing_items_qs = instance.experience.all()
-            existing_item_ids = set(existing_items_qs.values_list('id', flat=True))
-            payload_item_ids = set()
-
-            for item_payload in experience_data:
-                item_id = item_payload.get('id')
-                if item_id:
-                    payload_item_ids.add(item_id)
-                    try:
-                        item_instance = existing_items_qs.get(id=item_id, student=instance)
-                        for attr, value in item_payload.items():
-                            if attr == 'id': continue
-                            setattr(item_instance, attr, value)
-                        item_instance.full_clean()
-                        item_instance.save()
-                    except Experience.DoesNotExist:
-                        Experience.objects.create(student=instance, **item_payload)
-                else:
-                    new_item = Experience.objects.create(student=instance, **item_payload)
-                    payload_item_ids.add(new_item.id)
-            
-            ids_to_delete = existing_item_ids - payload_item_ids
-            if ids_to_delete:
-                instance.experience.filter(id__in=ids_to_delete).delete()
+        with transaction.atomic():
+            instance = self._update_profile_fields(instance, validated_data)
+            if education_data is not None:
+                self._sync_nested(instance, Education, "education", education_data)
+            if experience_data is not None:
+                self._sync_nested(instance, Experience, "experience", experience_data)
 
         return instance
 
+    def _sync_nested(self, instance, model, related_name, items_data):
+        """
+        Makes the student's ``related_name`` rows match ``items_data``: items
+        with the id of an existing row update it, the rest are created, and
+        rows missing from the payload are deleted. The existing rows are read
+        once and each kind of change is written in a single query.
+        """
+        existing = {item.id: item for item in getattr(instance, related_name).all()}
+        to_create, to_update, changed_fields, seen_ids = [], [], set(), set()
+
+        for item_payload in items_data:
+            item_payload = dict(item_payload)
+            item_instance = existing.get(item_payload.pop("id", None))
+            if item_instance is None:
+                # Unknown ids (another student's row, a deleted one, a client's
+            # temporary id) become new rows.
+                new_item = model(student=instance, **item_payload)
+                new_item.clean()
+                to_create.append(new_item)
+                continue
+
+            seen_ids.add(item_instance.id)
+            changed = {attr for attr, value in item_payload.items() if getattr(item_instance, attr) != value}
+            for attr in changed:
+                setattr(item_instance, attr, item_payload[attr])
+            # The row's own id and student are known to be valid; checking them
+            # would cost two queries per row.
+            item_instance.full_clean(exclude=["student"], validate_unique=False)
+            if changed:
+                changed_fields |= changed
+                if item_instance not in to_update:
+                    to_update.append(item_instance)
+
+        ids_to_delete = existing.keys() - seen_ids
+        if ids_to_delete:
+            model.objects.filter(id__in=ids_to_delete).delete()
+        if to_update:
+            model.objects.bulk_update(to_update, sorted(changed_fields))
+        if to_create:
+            model.objects.bulk_create(to_create)
+        # A prefetched list would still hold the rows as they were before the sync.
+        getattr(instance, "_prefetched_objects_cache", {}).pop(related_name, None)
+
 
 class EmployerProfileSerializer(BaseProfileSerializer):
     company_name_display = serializers.CharField(source='company.name', read_only=True, allow_null=True)
@@ -516,12 +551,18 @@ class VerifyTokenSerializer(serializers.Serializer):
         try:
             UntypedToken(tok)
             validated = AccessToken(tok)
-            user_id = validated.get(api_settings.USER_ID_CLAIM)
-            user = User.objects.get(pk=user_id)
-            return {"is_valid": True, "user": UserSerializer(user).data}
-        except (TokenError, InvalidToken, User.DoesNotExist):
+        except (TokenError, InvalidToken):
+            return {"is_valid": False}
+        return {"is_valid": True, "user_id": validated.get(api_settings.USER_ID_CLAIM)}
 
+    async def aresolve_user(self, payload):
+        if not payload.get("is_valid"):
+            return payload
+        try:
+            user = await User.objects.aget(pk=payload["user_id"])
+        except User.DoesNotExist:
             return {"is_valid": False}
+        return {"is_valid": True, "user": UserSerializer(user).data}
 
 
 class RefreshSerializer(serializers.Serializer):
@@ -614,6 +655,17 @@ class PublicProfileSerializer(serializers.ModelSerializer):
             'student_info', 'employer_info', 'campus_info'
         ]
 
+    ROLE_INFO_FIELDS = {'student': 'student_info', 'employer': 'employer_info', 'campus': 'campus_info'}
+
+    def get_fields(self):
+        fields = super().get_fields()
+        # For a single user, drop the other roles' sections up front so their
+        # profile relations are never loaded only to be discarded.
+        if isinstance(self.instance, User):
+            for role, field_name in self.ROLE_INFO_FIELDS.items():
+                if role != self.instance.role:
+                    fields.pop(field_name)
+        return fields
 
     def to_representation(self, instance):
         representation = super().to_representation(instance)
@@ -0,0 +1,79 @@
+import logging
+
+from django.db import connection, transaction
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from companies.models import Company
+from users.cache import profile_cache
+from users.models import (
+    CampusProfile,
+    CustomUser,
+    Education,
+    EmployerProfile,
+    Experience,
+    Resume,
+    ResumeSearchDocument,
+    StudentProfile,
+)
+from users.tasks import extract_resume_text_task
+
+logger = logging.getLogger(__name__)
+
+
+def _bump_on_commit(user_ids):
+    for user_id in set(user_ids):
+        if user_id is not None:
+            transaction.on_commit(lambda user_id=user_id: profile_cache.bump(user_id))
+
+
+@receiver([post_save, post_delete], sender=CustomUser)
+def invalidate_user_profile(sender, instance, **kwargs):
+    _bump_on_commit([instance.id])
+
+
+@receiver([post_save, post_delete], sender=StudentProfile)
+@receiver([post_save, post_delete], sender=EmployerProfile)
+@receiver([post_save, post_delete], sender=CampusProfile)
+def invalidate_role_profile(sender, instance, **kwargs):
+    _bump_on_commit([instance.user_id])
+
+
+@receiver([post_save, post_delete], sender=Education)
+@receiver([post_save, post_delete], sender=Experience)
+@receiver([post_save, post_delete], sender=Resume)
+def invalidate_student_collections(sender, instance, **kwargs):
+    _bump_on_commit(StudentProfile.objects.filter(pk=instance.student_id).values_list('user_id', flat=True))
+
+
+# pre_delete: by post_delete the employers' company has already been set to NULL.
+@receiver([post_save, pre_delete], sender=Company)
+def invalidate_company_employers(sender, instance, **kwargs):
+    _bump_on_commit(EmployerProfile.objects.filter(company=instance).values_list('user_id', flat=True))
+
+
+@receiver(pre_save, sender=Resume)
+def remember_resume_file(sender, instance, **kwargs):
+    instance._previous_file_name = (
+        Resume.objects.filter(pk=instance.pk).values_list('file', flat=True).first() if instance.pk else None
+    )
+
+
+def _queue_text_extraction(resume_id):
+    try:
+        extract_resume_text_task.delay(resume_id)
+    except Exception as e:
+        logger.error("Error queuing extract_resume_text_task for resume %s: %s", resume_id, e)
+
+
+@receiver(post_save, sender=Resume)
+def extract_resume_text(sender, instance, created, **kwargs):
+    # New uploads and replaced files; queued after commit so the worker can see the row.
+    if created or instance.file.name != getattr(instance, '_previous_file_name', None):
+        transaction.on_commit(lambda: _queue_text_extraction(instance.pk))
+
+
+@receiver(post_delete, sender=Resume)
+def delete_resume_search_document(sender, instance, **kwargs):
+    if connection.vendor == 'postgresql':
+        ResumeSearchDocument.objects.filter(resume_id=instance.pk).delete()
@@ -0,0 +1,43 @@
+import logging
+
+from celery import shared_task
+from django.contrib.postgres.search import SearchVector
+from django.db import connection
+from django.db.models import TextField, Value
+from django.utils import timezone
+
+from users.models import Resume, ResumeSearchDocument
+from users.utils import RESUME_SEARCH_CONFIG, extract_resume_text, normalize_resume_text
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=60, acks_late=True)
+def extract_resume_text_task(self, resume_id):
+    """
+    Pulls the text out of an uploaded resume and refreshes its full-text search document.
+    """
+    try:
+        resume = Resume.objects.get(id=resume_id)
+    except Resume.DoesNotExist:
+        logger.info("Resume %s no longer exists; skipping text extraction", resume_id)
+        return
+
+    try:
+        with resume.file.open('rb') as fh:
+            data = fh.read()
+    except Exception as exc:
+        logger.warning("Could not read resume %s from storage: %s", resume_id, exc)
+        raise self.retry(exc=exc)
+
+    text = normalize_resume_text(extract_resume_text(resume.file.name, data))
+    Resume.objects.filter(pk=resume.pk).update(text_content=text, text_extracted_at=timezone.now())
+
+    if connection.vendor == 'postgresql':
+        search_vector = (
+            SearchVector(Value(resume.name or '', output_field=TextField()), weight='A', config=RESUME_SEARCH_CONFIG)
+            + SearchVector(Value(text, output_field=TextField()), weight='B', config=RESUME_SEARCH_CONFIG)
+        )
+        ResumeSearchDocument.objects.update_or_create(resume=resume, defaults={'search_vector': search_vector})
+
+    logger.info("Extracted %d characters from resume %s", len(text), resume_id)
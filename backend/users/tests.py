@@ -0,0 +1,84 @@
+import datetime
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from users import signals
+from users.models import Education, Experience, Resume, StudentProfile
+from users.serializers import StudentProfileSerializer
+
+User = get_user_model()
+
+
+def education(**overrides):
+    return {'university': 'UCL', 'degree': 'BSc', 'field': 'Physics', 'start_date': '2020-09', **overrides}
+
+
+class StudentProfileNestedSyncTests(TestCase):
+    def setUp(self):
+        self.profile = StudentProfile.objects.create(user=User.objects.create_user('student@example.com', 'x', name='Student'))
+        self.kept = Education.objects.create(student=self.profile, **education(start_date=datetime.date(2019, 9, 1)))
+        self.removed = Education.objects.create(student=self.profile, **education(degree='MSc', start_date=datetime.date(2023, 9, 1)))
+        self.other = StudentProfile.objects.create(user=User.objects.create_user('other@example.com', 'x', name='Other'))
+        self.foreign = Education.objects.create(student=self.other, **education(degree='PhD', start_date=datetime.date(2021, 9, 1)))
+
+    def _update(self, data):
+        serializer = StudentProfileSerializer(self.profile, data=data, partial=True)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        return serializer.save()
+
+    def test_education_sync(self):
+        self._update({'education': [
+            education(id=self.kept.id, degree='BA'),
+            education(id=self.foreign.id, degree='Foreign'),
+            education(id=f'new_{1700000000}', degree='Temporary'),
+            education(degree='No id'),
+        ]})
+
+        rows = self.profile.education.order_by('id')
+        self.assertEqual([row.degree for row in rows], ['BA', 'Foreign', 'Temporary', 'No id'])
+        self.assertEqual(rows[0].id, self.kept.id)
+        self.assertNotIn(self.foreign.id, [row.id for row in rows])
+        self.assertFalse(Education.objects.filter(id=self.removed.id).exists())
+        self.foreign.refresh_from_db()
+        self.assertEqual((self.foreign.student_id, self.foreign.degree), (self.other.id, 'PhD'))
+
+    def test_experience_temporary_ids_create_rows(self):
+        self._update({'experience': [
+            {'id': 'exp-1700000000', 'company': 'Acme', 'position': 'Intern', 'start_date': '2022-06'},
+            {'id': 'new_exp_1700000001', 'company': 'Globex', 'position': 'Analyst', 'start_date': '2023-06'},
+        ]})
+
+        self.assertEqual(sorted(Experience.objects.filter(student=self.profile).values_list('company', flat=True)), ['Acme', 'Globex'])
+        response = StudentProfileSerializer(self.profile).data
+        self.assertTrue(all(isinstance(item['id'], int) for item in response['experience']))
+
+
+class ResumeTextExtractionTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('student@example.com', 'x', name='Student')
+        self.profile = StudentProfile.objects.create(user=self.user)
+        patcher = mock.patch.object(signals.extract_resume_text_task, 'delay')
+        self.delay = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_queued_after_upload_and_file_replacement(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            resume = Resume.objects.create(student=self.profile, file='1/cv.pdf')
+        self.delay.assert_called_once_with(resume.id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            resume.name = 'Renamed'
+            resume.save()
+        self.assertEqual(self.delay.call_count, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            resume.file = '1/cv-v2.pdf'
+            resume.save()
+        self.assertEqual(self.delay.call_count, 2)
+
+    def test_student_with_resume_can_be_deleted(self):
+        Resume.objects.create(student=self.profile, file='1/cv.pdf')
+        self.user.delete()
+        self.assertFalse(Resume.objects.exists())
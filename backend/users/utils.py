@@ -0,0 +1,63 @@
+import io
+import logging
+import os
+import re
+import zipfile
+from xml.etree import ElementTree
+
+logger = logging.getLogger(__name__)
+
+RESUME_SEARCH_CONFIG = 'english'
+MAX_RESUME_TEXT_LENGTH = 100_000
+
+_WORD_NAMESPACE = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_CONTROL_CHARS_RE = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]')
+_INLINE_SPACE_RE = re.compile(r'[ \t\u00a0]+')
+_BLANK_LINES_RE = re.compile(r'\n{3,}')
+
+
+def extract_resume_text(filename, data):
+    """
+    Returns the raw text of a PDF or DOCX resume, or an empty string for
+    formats we cannot read (legacy .doc, scanned PDFs without a text layer).
+    """
+    extension = os.path.splitext(filename or '')[1].lower()
+    try:
+        if extension == '.pdf':
+            return _extract_pdf_text(data)
+        if extension == '.docx':
+            return _extract_docx_text(data)
+    except Exception:
+        logger.warning("Could not extract text from resume %s", filename, exc_info=True)
+        return ''
+    return ''
+
+
+def normalize_resume_text(text):
+    text = _CONTROL_CHARS_RE.sub(' ', text or '')
+    text = text.replace('\r\n', '\n').replace('\r', '\n')
+    lines = (_INLINE_SPACE_RE.sub(' ', line).strip() for line in text.split('\n'))
+    text = _BLANK_LINES_RE.sub('\n\n', '\n'.join(lines)).strip()
+    return text[:MAX_RESUME_TEXT_LENGTH]
+
+
+def _extract_pdf_text(data):
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        logger.warning("pypdf is not installed; skipping PDF resume text extraction")
+        return ''
+
+    reader = PdfReader(io.BytesIO(data))
+    return '\n'.join(page.extract_text() or '' for page in reader.pages)
+
+
+def _extract_docx_text(data):
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        document = archive.read('word/document.xml')
+
+    paragraphs = []
+    for paragraph in ElementTree.fromstring(document).iter(f'{_WORD_NAMESPACE}p'):
+        runs = [node.text or '' for node in paragraph.iter(f'{_WORD_NAMESPACE}t')]
+        paragraphs.append(''.join(runs))
+    return '\n'.join(paragraphs)
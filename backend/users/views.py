@@ -1,6 +1,8 @@
 import logging
 from functools import wraps
 
+from adrf.views import APIView as AsyncAPIView
+
 from django.contrib.auth.password_validation import validate_password
 from drf_spectacular.utils import (
     extend_schema, OpenApiParameter, OpenApiTypes,
@@ -20,9 +22,16 @@ from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from rest_framework_simplejwt.exceptions import TokenError
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.settings import api_settings
-from django.db import transaction
+from django.db import connection, transaction
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank
+from django.db.models import F, Prefetch, prefetch_related_objects
+from django.http import HttpResponseNotModified
+from admin_api.cache import system_settings
 from core.utils import ok, fail
-from users.models import CampusProfile, EmployerProfile, StudentProfile, Resume
+from users.cache import profile_cache
+from users.models import CampusProfile, EmployerProfile, StudentProfile, Resume, ResumeSearchDocument
+from users.utils import RESUME_SEARCH_CONFIG
+from applications.models import Application
 from users.serializers import (
     CustomTokenObtainPairSerializer,
     RegisterSerializer,
@@ -38,11 +47,18 @@ from .models import UserSettings, CompanySettings
 from .serializers import UserSettingsSerializer, CompanySettingsSerializer
 from django.contrib.auth.password_validation import validate_password
 from rest_framework.exceptions import ValidationError
-from jobs.serializers import JobSerializer
+from jobs.serializers import JobSerializer, SIMILAR_JOBS_PREFETCH
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
 
+# The public profile only renders the relation that matches the user's role.
+PUBLIC_PROFILE_PREFETCHES = {
+    "student": ("student_profile", "student_profile__education", "student_profile__experience"),
+    "employer": (Prefetch("employer_profile", queryset=EmployerProfile.objects.select_related("company")),),
+    "campus": ("campus_profile",),
+}
+
 
 @extend_schema(
     request=CustomTokenObtainPairSerializer,
@@ -57,6 +73,7 @@ logger = logging.getLogger(__name__)
 class CustomTokenObtainPairView(TokenObtainPairView):
     serializer_class = CustomTokenObtainPairSerializer
     permission_classes = [AllowAny]
+    throttle_scope = 'login'
 
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -76,15 +93,15 @@ class CustomTokenObtainPairView(TokenObtainPairView):
     summary="Verify JWT token",
     description="Validates access token and returns user data if valid."
 )
-class CustomVerifyView(APIView):
+class CustomVerifyView(AsyncAPIView):
     permission_classes = [AllowAny]
     serializer_class = VerifyTokenSerializer
 
-    def post(self, request):
+    async def post(self, request):
         ser = self.serializer_class(data=request.data)
         if not ser.is_valid():
             return fail("Invalid token", code=401)
-        payload = ser.validated_data
+        payload = await ser.aresolve_user(ser.validated_data)
         if not payload.get("is_valid"):
             return ok({"is_valid": False}, message="Token invalid")
         return ok(payload, message="Token valid")
@@ -146,6 +163,13 @@ class CustomRefreshView(APIView):
         return ok({"access": str(new_access)}, message="Token refreshed")
 
 
+# SystemSettings flag that must be on to register each role.
+REGISTRATION_FLAGS = {
+    'student': 'allowStudentRegistration',
+    'employer': 'allowEmployerRegistration',
+}
+
+
 @extend_schema(tags=['users'])
 class RegisterViewSet(viewsets.ViewSet):
     permission_classes = [permissions.IsAuthenticated]
@@ -176,6 +200,15 @@ class RegisterViewSet(viewsets.ViewSet):
                 "message": "You do not have permission to register this type of user"
             }, status=status.HTTP_403_FORBIDDEN)
 
+        # Admins can always create accounts; the site settings gate everyone else.
+        registration_flag = REGISTRATION_FLAGS.get(role_to_create)
+        if creator.role != "admin" and registration_flag and not getattr(system_settings.get(), registration_flag):
+            return Response({
+                "status": "error",
+                "data": {},
+                "message": f"Registration of {role_to_create} accounts is currently disabled"
+            }, status=status.HTTP_403_FORBIDDEN)
+
         serializer = RegisterSerializer(data=request.data)
         if serializer.is_valid():
             user = serializer.save()
@@ -214,6 +247,7 @@ class ProfileViewSet(viewsets.GenericViewSet):
     permission_classes = [IsAuthenticated]
     queryset = User.objects.all()
     lookup_field = 'id'
+    lookup_value_regex = r'\d+'
     parser_classes = [JSONParser, MultiPartParser, FormParser]
     ME_PROFILE_SERIALIZER_COMPONENT_NAME = 'UserProfileMeResponse'
 
@@ -222,22 +256,40 @@ class ProfileViewSet(viewsets.GenericViewSet):
             return [AllowAny()]
         return super().get_permissions()
 
+    def _profile_queryset(self, role):
+        if role == "student":
+            return StudentProfile.objects.prefetch_related(
+                "education",
+                "experience",
+                Prefetch("resumes", queryset=Resume.objects.only("id", "name", "created_at", "student")),
+            )
+        if role == "employer":
+            return EmployerProfile.objects.select_related("company")
+        return CampusProfile.objects.all()
+
     def _get_profile_info(self, user):
+        """
+        The user's role profile with everything its serializer renders, in a
+        fixed number of queries (four for students, one otherwise). The
+        profile is only created when it is missing.
+        """
         if user.role == "student":
-            profile_model = StudentProfile
             profile_serializer_class = StudentProfileSerializer
         elif user.role == "employer":
-            profile_model = EmployerProfile
             profile_serializer_class = EmployerProfileSerializer
         elif user.role == "campus":
-            profile_model = CampusProfile
             profile_serializer_class = CampusProfileSerializer
         elif user.role == "admin":
             return user, UserSerializer
         else:
             return None, None
 
-        profile_instance, _ = profile_model.objects.get_or_create(user=user)
+        queryset = self._profile_queryset(user.role)
+        profile_instance = queryset.filter(user=user).first()
+        if profile_instance is None:
+            profile_instance, _ = queryset.model.objects.get_or_create(user=user)
+        # The authenticated user is already loaded; share it instead of fetching it again.
+        profile_instance.user = user
         return profile_instance, profile_serializer_class
 
     @extend_schema(
@@ -294,14 +346,20 @@ class ProfileViewSet(viewsets.GenericViewSet):
     @action(detail=False, methods=['get', 'patch'], url_path='me')
     def me(self, request):
         user = request.user
+        if request.method == "GET":
+            cached = profile_cache.get_me(request)
+            if cached is not None:
+                return ok(data=cached, message=f"{user.role.capitalize()} profile retrieved successfully")
+
         target_instance, profile_serializer_class = self._get_profile_info(user)
 
         if not profile_serializer_class:
             return fail(message="Could not determine profile type for user.", code=status.HTTP_400_BAD_REQUEST)
 
         if request.method == "GET":
-            serializer = profile_serializer_class(target_instance, context={'request': request})
-            return ok(data=serializer.data, message=f"{user.role.capitalize()} profile retrieved successfully")
+            data = profile_serializer_class(target_instance, context={'request': request}).data
+            profile_cache.set_me(request, data)
+            return ok(data=data, message=f"{user.role.capitalize()} profile retrieved successfully")
 
         elif request.method == "PATCH":
             data_for_serializer = request.data.copy()
@@ -332,11 +390,20 @@ class ProfileViewSet(viewsets.GenericViewSet):
 
             if serializer.is_valid():
                 serializer.save()
-                fresh_serializer = profile_serializer_class(target_instance, context={'request': request})
-                return ok(data=fresh_serializer.data, message=f"{user.role.capitalize()} profile updated successfully")
+                return ok(data=serializer.data, message=f"{user.role.capitalize()} profile updated successfully")
             return fail(message="Validation error", details=serializer.errors, code=status.HTTP_400_BAD_REQUEST)
 
     def retrieve(self, request, id=None):
+        # Only a payload cached for an existing public profile can short-cut the
+        # lookup; unknown ids never get a version or a cache entry.
+        version = profile_cache.peek_version(id)
+        data = profile_cache.get_public(request, id, version) if version is not None else None
+        if data is not None:
+            etag = profile_cache.public_etag(id, version)
+            if etag in request.headers.get('If-None-Match', ''):
+                return profile_cache.decorate_public(HttpResponseNotModified(), etag)
+            return profile_cache.decorate_public(ok(data=data, message="Public profile retrieved successfully"), etag)
+
         try:
             user = User.objects.get(id=id)
         except User.DoesNotExist:
@@ -345,10 +412,17 @@ class ProfileViewSet(viewsets.GenericViewSet):
         if user.role == "admin":
             return fail(message="Admin profiles are not publicly viewable", code=status.HTTP_403_FORBIDDEN)
 
-        if user.role not in ["student", "employer", "campus"]:
+        if user.role not in PUBLIC_PROFILE_PREFETCHES:
             return fail(message=f"Profiles of type '{user.role}' are not publicly viewable", code=status.HTTP_403_FORBIDDEN)
-        serializer = PublicProfileSerializer(user, context={'request': request})
-        return ok(data=serializer.data, message="Public profile retrieved successfully")
+
+        version = profile_cache.version(user.id)
+        etag = profile_cache.public_etag(user.id, version)
+        if etag in request.headers.get('If-None-Match', ''):
+            return profile_cache.decorate_public(HttpResponseNotModified(), etag)
+        prefetch_related_objects([user], *PUBLIC_PROFILE_PREFETCHES[user.role])
+        data = PublicProfileSerializer(user, context={'request': request}).data
+        profile_cache.set_public(request, user.id, version, data)
+        return profile_cache.decorate_public(ok(data=data, message="Public profile retrieved successfully"), etag)
 
     @extend_schema(
         summary="Get current user's saved jobs",
@@ -371,7 +445,7 @@ class ProfileViewSet(viewsets.GenericViewSet):
         except StudentProfile.DoesNotExist:
             return fail(message="Student profile not found.", code=status.HTTP_404_NOT_FOUND)
         
-        saved_jobs_queryset = student_profile.saved_jobs.all()
+        saved_jobs_queryset = student_profile.saved_jobs.prefetch_related(SIMILAR_JOBS_PREFETCH)
         serializer = JobSerializer(saved_jobs_queryset, many=True, context={'request': request})
         return ok(data=serializer.data, message="Saved jobs retrieved successfully")
 
@@ -392,6 +466,7 @@ class ResumeViewSet(viewsets.ModelViewSet):
 
     def perform_create(self, serializer):
         student_profile = self.request.user.student_profile
+        # users.signals queues the text extraction once the upload commits.
         serializer.save(student=student_profile)
 
     def get_permissions(self):
@@ -457,6 +532,95 @@ class ResumeViewSet(viewsets.ModelViewSet):
     def retrieve(self, request, *args, **kwargs):
         return super().retrieve(request, *args, **kwargs)
 
+    @extend_schema(
+        operation_id='search_applicant_resumes',
+        summary="Search applicant resumes",
+        description=(
+            "Full-text search over resumes attached to applications on the employer's jobs. "
+            "Results are ranked by relevance and served from the extracted text index."
+        ),
+        parameters=[
+            OpenApiParameter("q", OpenApiTypes.STR, OpenApiParameter.QUERY, required=True,
+                             description="Search terms (web search syntax: quotes, OR, -exclude)."),
+            OpenApiParameter("limit", OpenApiTypes.INT, OpenApiParameter.QUERY,
+                             description="Maximum number of hits (default 20, max 100)."),
+        ],
+        responses={
+            200: OpenApiTypes.OBJECT,
+            400: {"description": "Missing search query."},
+            403: {"description": "Only employers can search resumes."},
+        }
+    )
+    @action(detail=False, methods=['get'], url_path='search')
+    def search(self, request):
+        user = request.user
+        if not (user.is_staff or user.role == 'employer'):
+            return fail(message="Only employers can search resumes.", code=status.HTTP_403_FORBIDDEN)
+
+        query_text = request.query_params.get('q', '').strip()
+        if not query_text:
+            return fail(message="Missing 'q' query parameter", details={"q": ["This field is required."]})
+
+        try:
+            limit = min(max(int(request.query_params.get('limit', 20)), 1), 100)
+        except ValueError:
+            limit = 20
+
+        if user.is_staff:
+            applications = Application.objects.all()
+        elif user.company_id:
+            applications = Application.objects.filter(job__company_id=user.company_id)
+        else:
+            return ok(data=[], message="Resume search completed")
+
+        resume_ids = applications.filter(resume__isnull=False).values('resume_id')
+
+        if connection.vendor == 'postgresql':
+            query = SearchQuery(query_text, config=RESUME_SEARCH_CONFIG, search_type='websearch')
+            documents = (
+                ResumeSearchDocument.objects
+                .filter(resume_id__in=resume_ids, search_vector=query)
+                .select_related('resume__student__user')
+                .annotate(
+                    rank=SearchRank(F('search_vector'), query),
+                    headline=SearchHeadline(
+                        'resume__text_content', query, config=RESUME_SEARCH_CONFIG,
+                        max_words=35, min_words=15,
+                    ),
+                )
+                .order_by('-rank')[:limit]
+            )
+            hits = [(doc.resume, doc.rank, doc.headline) for doc in documents]
+        else:
+            resumes = (
+                Resume.objects
+                .filter(id__in=resume_ids, text_content__icontains=query_text)
+                .select_related('student__user')
+                .order_by('-created_at')[:limit]
+            )
+            hits = [(resume, None, None) for resume in resumes]
+
+        applications_by_resume = {}
+        for resume_id, application_id, job_id, job_title in applications.filter(
+            resume_id__in=[resume.id for resume, _, _ in hits]
+        ).values_list('resume_id', 'id', 'job_id', 'job__title'):
+            applications_by_resume.setdefault(resume_id, []).append(
+                {'id': application_id, 'job_id': job_id, 'job_title': job_title}
+            )
+
+        data = []
+        for resume, rank, headline in hits:
+            applicant = resume.student.user
+            data.append({
+                'resume_id': resume.id,
+                'resume_name': resume.name,
+                'applicant': {'id': applicant.id, 'name': applicant.name, 'email': applicant.email},
+                'applications': applications_by_resume.get(resume.id, []),
+                'rank': rank,
+                'headline': headline,
+            })
+        return ok(data=data, message="Resume search completed")
+
 
 @extend_schema(tags=['users'])
 class UserSettingsViewSet(viewsets.GenericViewSet):